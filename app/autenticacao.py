@@ -0,0 +1,158 @@
+"""
+Autenticação dos administradores sem consultar usuarios_admin a cada pedido.
+
+No login, o principal (id, função, estado ativo e um carimbo das
+credenciais) é guardado na sessão, que o Flask assina. Em cada pedido, o
+Flask-Login recebe-o da sessão e só precisa de confirmar que o carimbo é
+o atual: cada processo guarda os carimbos em cache durante
+CACHE_PRINCIPAL_TTL segundos, pelo que a tabela é lida no máximo uma vez
+por utilizador e intervalo.
+
+O carimbo muda quando a senha, a função ou o estado ativo mudam. As
+alterações feitas pelo ORM invalidam logo o cache do processo; as feitas
+noutro processo (ex.: atualizar_admin.py) são detetadas ao expirar o TTL.
+Uma sessão com um carimbo antigo deixa de estar autenticada.
+"""
+
+import hashlib
+
+from flask import session
+from flask_login import LoginManager, UserMixin, login_user, logout_user
+from sqlalchemy import event, inspect
+
+try:
+    from app.modelos import db, UsuarioAdmin
+    from app.cache import CacheTTL
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import db, UsuarioAdmin
+    from cache import CacheTTL
+
+
+# Configuração do Flask-Login
+login_manager = LoginManager()
+login_manager.login_view = 'publico.login'
+login_manager.login_message = 'Por favor, faça login para acessar esta página.'
+login_manager.login_message_category = 'warning'
+
+# Chave da sessão com o principal do administrador autenticado
+CHAVE_PRINCIPAL = 'principal'
+
+# Colunas que, ao mudar, terminam as sessões abertas do utilizador
+CAMPOS_CREDENCIAIS = ('password_hash', 'funcao', 'ativo')
+
+# Carimbo das credenciais atuais de cada utilizador (id -> carimbo, ou None se já não existir)
+cache_principais = CacheTTL(tamanho_maximo=256)
+
+
+class Principal(UserMixin):
+    """Administrador autenticado, reconstruído a partir da sessão sem consultar a base de dados."""
+    
+    def __init__(self, id, funcao, ativo):
+        self.id = id
+        self.funcao = funcao
+        self.ativo = ativo
+    
+    @property
+    def is_active(self):
+        return self.ativo
+    
+    @property
+    def is_admin(self):
+        return True
+    
+    def __repr__(self):
+        return f'<Principal {self.id} {self.funcao}>'
+
+
+# Função para resumir as credenciais de um utilizador (nunca guarda o hash da senha na sessão)
+def carimbo_credenciais(usuario):
+    valores = '|'.join(str(getattr(usuario, campo)) for campo in CAMPOS_CREDENCIAIS)
+    return hashlib.sha256(valores.encode('utf-8')).hexdigest()[:16]
+
+
+# Função para obter o carimbo atual de um utilizador, no máximo uma consulta por TTL
+def carimbo_atual(usuario_id):
+    def carregar():
+        usuario = db.session.get(UsuarioAdmin, usuario_id)
+        return carimbo_credenciais(usuario) if usuario is not None else None
+    
+    return cache_principais.obter(usuario_id, carregar)
+
+
+# Função para guardar em cache um carimbo acabado de ler, evitando a consulta no pedido seguinte
+def registar_carimbo(usuario_id, carimbo):
+    # Substitui uma entrada antiga, que pode ser anterior à alteração que originou o carimbo
+    cache_principais.invalidar(usuario_id)
+    cache_principais.obter(usuario_id, lambda: carimbo)
+
+
+# Função para autenticar um administrador e guardar o principal na sessão
+def iniciar_sessao(usuario):
+    """
+    Guarda o principal na sessão e faz o login com o Flask-Login. Devolve
+    False (sem autenticar) se o utilizador estiver inativo.
+    """
+    if not usuario.ativo:
+        return False
+    
+    carimbo = carimbo_credenciais(usuario)
+    session[CHAVE_PRINCIPAL] = {
+        'id': usuario.id,
+        'funcao': usuario.funcao,
+        'ativo': bool(usuario.ativo),
+        'carimbo': carimbo
+    }
+    registar_carimbo(usuario.id, carimbo)
+    return login_user(Principal(usuario.id, usuario.funcao, bool(usuario.ativo)))
+
+
+# Função para terminar a sessão do administrador
+def terminar_sessao():
+    logout_user()
+    session.pop(CHAVE_PRINCIPAL, None)
+
+
+# Carregar o principal da sessão em cada pedido autenticado
+@login_manager.user_loader
+def carregar_principal(user_id):
+    usuario_id = int(user_id)
+    dados = session.get(CHAVE_PRINCIPAL)
+    
+    # Sessões criadas antes do principal existir: ler o utilizador uma vez e guardá-lo
+    if dados is None or dados.get('id') != usuario_id:
+        usuario = db.session.get(UsuarioAdmin, usuario_id)
+        if usuario is None or not usuario.ativo:
+            session.pop(CHAVE_PRINCIPAL, None)
+            return None
+        carimbo = carimbo_credenciais(usuario)
+        dados = {'id': usuario.id, 'funcao': usuario.funcao, 'ativo': bool(usuario.ativo), 'carimbo': carimbo}
+        session[CHAVE_PRINCIPAL] = dados
+        registar_carimbo(usuario_id, carimbo)
+    
+    # Senha, função ou estado alterados desde o login: a sessão deixa de ser válida
+    if carimbo_atual(usuario_id) != dados['carimbo'] or not dados['ativo']:
+        session.pop(CHAVE_PRINCIPAL, None)
+        return None
+    
+    return Principal(dados['id'], dados['funcao'], dados['ativo'])
+
+
+# Invalidar o carimbo em cache quando as credenciais de um utilizador mudam pelo ORM
+@event.listens_for(UsuarioAdmin, 'after_update')
+def credenciais_alteradas(mapper, conexao, usuario):
+    estado = inspect(usuario)
+    if any(estado.attrs[campo].history.has_changes() for campo in CAMPOS_CREDENCIAIS):
+        cache_principais.invalidar(usuario.id)
+
+
+# Invalidar também o carimbo de um utilizador apagado
+@event.listens_for(UsuarioAdmin, 'after_delete')
+def utilizador_apagado(mapper, conexao, usuario):
+    cache_principais.invalidar(usuario.id)
+
+
+# Função para associar a autenticação a uma aplicação (chamada por create_app)
+def init_app(app):
+    cache_principais.ttl_segundos = app.config['CACHE_PRINCIPAL_TTL']
+    login_manager.init_app(app)
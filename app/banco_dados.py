@@ -0,0 +1,153 @@
+"""
+Configuração das ligações à base de dados.
+
+O banco de dados é escolhido pela variável DATABASE_URL (por padrão, o
+ficheiro SQLite barbearia.db). Nos bancos de dados servidor (PostgreSQL), o
+pool de ligações é configurado com as variáveis DB_POOL_SIZE,
+DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_TIMEOUT e DB_POOL_PRE_PING.
+
+No SQLite, cada nova ligação recebe um conjunto de pragmas: o modo WAL
+deixa as leituras prosseguir enquanto um agendamento é gravado (no modo
+padrão, rollback journal, os leitores esperam por cada commit) e o
+busy_timeout faz uma escrita aguardar pela outra em vez de falhar com
+"database is locked". Os valores podem ser alterados por ambiente com
+variáveis SQLITE_<PRAGMA> (ex.: SQLITE_JOURNAL_MODE=DELETE).
+"""
+
+import os
+import re
+
+from sqlalchemy import event
+
+
+# Pragmas aplicados a cada nova ligação SQLite
+PRAGMAS_PADRAO = {
+    # Leitores e escritor em simultâneo; o commit só escreve no ficheiro -wal
+    'journal_mode': 'WAL',
+    # Em WAL, NORMAL não corrompe a base de dados; só os últimos commits podem perder-se numa falha de energia
+    'synchronous': 'NORMAL',
+    # Tempo máximo, em milissegundos, à espera de um lock antes de "database is locked"
+    'busy_timeout': 5000,
+    # Cache de páginas por ligação: valores negativos são KiB (20 MB)
+    'cache_size': -20000,
+    # Leitura do ficheiro por mapeamento de memória, até 128 MB
+    'mmap_size': 134217728,
+    # Tabelas e índices temporários (ORDER BY, GROUP BY) em memória
+    'temp_store': 'MEMORY',
+}
+
+# Opções do pool de ligações nos bancos de dados servidor, e a variável de ambiente de cada uma
+POOL_PADRAO = {
+    # Ligações mantidas abertas por processo (worker)
+    'pool_size': 5,
+    # Ligações extra abertas nos picos, fechadas ao serem devolvidas
+    'max_overflow': 10,
+    # Segundos após os quais uma ligação é renovada, antes de o servidor ou uma firewall a fecharem
+    'pool_recycle': 1800,
+    # Segundos à espera de uma ligação livre antes de falhar
+    'pool_timeout': 30,
+    # Testar a ligação antes de a usar, para descartar ligações que o servidor já fechou
+    'pool_pre_ping': True,
+}
+
+VARIAVEIS_POOL = {
+    'pool_size': 'DB_POOL_SIZE',
+    'max_overflow': 'DB_MAX_OVERFLOW',
+    'pool_recycle': 'DB_POOL_RECYCLE',
+    'pool_timeout': 'DB_POOL_TIMEOUT',
+    'pool_pre_ping': 'DB_POOL_PRE_PING',
+}
+
+# Valores aceites como verdadeiro nas variáveis de ambiente
+VERDADEIRO = ('1', 'true', 'sim', 'yes', 'on')
+
+# Valores aceites num pragma: palavras (WAL, NORMAL, MEMORY) ou números inteiros
+VALOR_PRAGMA = re.compile(r'^(-?\d+|[A-Za-z]+)$')
+
+
+def url_do_ambiente(padrao, ambiente=None):
+    """
+    Devolve o URL do banco de dados: DATABASE_URL, ou `padrao` se não estiver
+    definida. O prefixo postgres:// (usado por alguns serviços de alojamento)
+    é trocado por postgresql://, o único aceite pelo SQLAlchemy.
+    """
+    ambiente = os.environ if ambiente is None else ambiente
+    url = ambiente.get('DATABASE_URL') or padrao
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def opcoes_engine(url, ambiente=None):
+    """
+    Devolve as opções do engine (SQLALCHEMY_ENGINE_OPTIONS) para o URL.
+
+    O SQLite usa o pool padrão do SQLAlchemy, adequado a um ficheiro local;
+    nos outros bancos de dados aplicam-se POOL_PADRAO e as variáveis DB_*.
+    """
+    if url.startswith('sqlite'):
+        return {}
+
+    ambiente = os.environ if ambiente is None else ambiente
+    opcoes = {}
+    for nome, padrao in POOL_PADRAO.items():
+        valor = ambiente.get(VARIAVEIS_POOL[nome])
+        if valor in (None, ''):
+            opcoes[nome] = padrao
+        elif isinstance(padrao, bool):
+            opcoes[nome] = valor.strip().lower() in VERDADEIRO
+        else:
+            try:
+                opcoes[nome] = int(valor)
+            except ValueError:
+                raise ValueError(f'{VARIAVEIS_POOL[nome]} deve ser um número inteiro: {valor!r}')
+    return opcoes
+
+
+def pragmas_do_ambiente(ambiente=None, base=PRAGMAS_PADRAO):
+    """
+    Devolve os pragmas a aplicar, trocando os valores de `base` pelas
+    variáveis SQLITE_<PRAGMA> definidas no ambiente. Uma variável vazia
+    desativa o pragma (fica o valor padrão do SQLite).
+    """
+    ambiente = os.environ if ambiente is None else ambiente
+    pragmas = {}
+    for nome, valor in base.items():
+        valor = ambiente.get(f'SQLITE_{nome.upper()}', valor)
+        if valor in ('', None):
+            continue
+        if not VALOR_PRAGMA.match(str(valor)):
+            raise ValueError(f'Valor inválido para o pragma {nome}: {valor!r}')
+        pragmas[nome] = valor
+    return pragmas
+
+
+def aplicar_pragmas(conexao_dbapi, pragmas):
+    """Executa os pragmas numa ligação sqlite3 acabada de abrir."""
+    cursor = conexao_dbapi.cursor()
+    try:
+        for nome, valor in pragmas.items():
+            cursor.execute(f'PRAGMA {nome} = {valor}')
+    finally:
+        cursor.close()
+
+
+def configurar_sqlite(engine, pragmas):
+    """
+    Regista os pragmas no evento `connect` do engine, para que se apliquem a
+    todas as ligações do pool. Não faz nada noutros bancos de dados.
+    Devolve True se o engine é SQLite.
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+
+    @event.listens_for(engine, 'connect')
+    def ao_ligar(conexao_dbapi, registo_conexao):
+        aplicar_pragmas(conexao_dbapi, pragmas)
+
+    return True
+
+
+def ler_pragmas(conexao, nomes=PRAGMAS_PADRAO):
+    """Devolve os valores atuais dos pragmas numa ligação SQLAlchemy (para diagnóstico)."""
+    return {nome: conexao.exec_driver_sql(f'PRAGMA {nome}').scalar() for nome in nomes}
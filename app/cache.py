@@ -0,0 +1,168 @@
+"""
+Caches em memória do processo: LRU com expiração (TTL) e cópia versionada.
+
+Cada processo (worker) mantém a sua própria cópia, por isso as entradas devem
+ser invalidadas explicitamente após cada alteração e o TTL limita o tempo em
+que um worker pode servir dados desatualizados (na cópia versionada, o
+intervalo entre verificações da versão).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheTTL:
+    """Cache LRU com tempo de vida por entrada e contadores de acertos/falhas."""
+
+    def __init__(self, tamanho_maximo=1024, ttl_segundos=60):
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl_segundos = ttl_segundos
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.invalidacoes = 0
+        # Incrementada a cada invalidação, para descartar carregamentos concorrentes
+        self._geracao = 0
+
+    def obter(self, chave, carregar):
+        """Devolve o valor em cache para a chave, ou chama `carregar()` e guarda o resultado."""
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada[0] > agora:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return entrada[1]
+            self.falhas += 1
+            geracao = self._geracao
+
+        # Carregar fora do lock para não serializar as consultas à base de dados
+        valor = carregar()
+
+        with self._lock:
+            # Uma invalidação durante o carregamento pode tornar o valor obsoleto
+            if geracao != self._geracao:
+                return valor
+            self._entradas[chave] = (agora + self.ttl_segundos, valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.tamanho_maximo:
+                self._entradas.popitem(last=False)
+                self.remocoes += 1
+        return valor
+
+    def invalidar(self, chave):
+        """Remove uma chave do cache."""
+        with self._lock:
+            self._geracao += 1
+            if self._entradas.pop(chave, None) is not None:
+                self.invalidacoes += 1
+
+    def invalidar_se(self, predicado):
+        """Remove todas as chaves para as quais `predicado(chave)` é verdadeiro."""
+        with self._lock:
+            self._geracao += 1
+            chaves = [chave for chave in self._entradas if predicado(chave)]
+            for chave in chaves:
+                del self._entradas[chave]
+            self.invalidacoes += len(chaves)
+
+    def limpar(self):
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._geracao += 1
+            self.invalidacoes += len(self._entradas)
+            self._entradas.clear()
+
+    def estatisticas(self):
+        """Devolve os contadores do cache."""
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                'entradas': len(self._entradas),
+                'tamanho_maximo': self.tamanho_maximo,
+                'ttl_segundos': self.ttl_segundos,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': round(self.acertos / total, 4) if total else 0.0,
+                'remocoes': self.remocoes,
+                'invalidacoes': self.invalidacoes
+            }
+
+
+class CacheVersionado:
+    """
+    Cópia única de um valor raramente alterado, com um número de versão.
+
+    Dentro do intervalo de verificação a cópia é devolvida sem consultar a
+    base de dados. Depois dele, apenas a versão é consultada (uma leitura
+    barata) e o valor só é recarregado se a versão tiver mudado, o que permite
+    a vários workers detetar alterações feitas noutro processo.
+    """
+
+    def __init__(self, intervalo_segundos=5):
+        self.intervalo_segundos = intervalo_segundos
+        self._lock = threading.Lock()
+        self._carregado = False
+        self._valor = None
+        self._versao = None
+        self._verificar_em = 0.0
+        self._geracao = 0
+        self.acertos = 0
+        self.revalidacoes = 0
+        self.carregamentos = 0
+        self.invalidacoes = 0
+
+    def obter(self, obter_versao, carregar):
+        """
+        Devolve o valor em cache. `obter_versao()` devolve a versão atual na
+        base de dados e `carregar()` devolve o par (versão, valor).
+        """
+        agora = time.monotonic()
+        with self._lock:
+            if self._carregado and agora < self._verificar_em:
+                self.acertos += 1
+                return self._valor
+            carregado, valor, versao, geracao = self._carregado, self._valor, self._versao, self._geracao
+
+        # Com uma cópia carregada, basta confirmar que a versão não mudou
+        if carregado and obter_versao() == versao:
+            with self._lock:
+                self.revalidacoes += 1
+                if geracao == self._geracao:
+                    self._verificar_em = agora + self.intervalo_segundos
+            return valor
+
+        versao, valor = carregar()
+        with self._lock:
+            self.carregamentos += 1
+            # Uma invalidação durante o carregamento pode tornar o valor obsoleto
+            if geracao == self._geracao:
+                self._carregado = True
+                self._valor = valor
+                self._versao = versao
+                self._verificar_em = agora + self.intervalo_segundos
+        return valor
+
+    def invalidar(self):
+        """Descarta a cópia, para que o próximo acesso a recarregue."""
+        with self._lock:
+            self._geracao += 1
+            self._carregado = False
+            self._valor = None
+            self.invalidacoes += 1
+
+    def estatisticas(self):
+        """Devolve os contadores do cache."""
+        with self._lock:
+            return {
+                'carregado': self._carregado,
+                'versao': self._versao,
+                'intervalo_segundos': self.intervalo_segundos,
+                'acertos': self.acertos,
+                'revalidacoes': self.revalidacoes,
+                'carregamentos': self.carregamentos,
+                'invalidacoes': self.invalidacoes
+            }
@@ -0,0 +1,104 @@
+"""
+Clientes: validação do telefone e busca por nome, sobrenome, telefone ou
+email (pelo índice FTS5 clientes_busca quando existe, senão com LIKE).
+"""
+
+import re
+
+from sqlalchemy import text, and_, or_
+
+try:
+    from app.modelos import db, Cliente
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import db, Cliente
+
+
+# Indica se a tabela de busca FTS5 de clientes existe (verificado na primeira busca)
+busca_fts_clientes = None
+
+
+# Função para verificar se a busca de clientes pode usar o índice FTS5
+def busca_fts_disponivel():
+    global busca_fts_clientes
+    if busca_fts_clientes is None:
+        busca_fts_clientes = (
+            db.engine.dialect.name == 'sqlite'
+            and db.inspect(db.engine).has_table('clientes_busca')
+        )
+    return busca_fts_clientes
+
+
+# Função para montar a condição de busca de clientes por nome, sobrenome, telefone ou email
+def filtro_busca_clientes(termo):
+    """
+    Devolve a condição SQL que seleciona os clientes cujos campos começam por
+    cada uma das palavras do termo (sem distinguir acentos no SQLite), ou None
+    se o termo não tiver palavras válidas.
+    """
+    palavras = []
+    numero_anterior = False
+    for palavra in termo.split():
+        # Palavras só com números (e pontuação) são procuradas como telefone,
+        # juntando as partes seguidas (ex: "(87) 9912" -> "879912")
+        numero = not re.search(r'[^\W\d_]', palavra)
+        if numero:
+            palavra = re.sub(r'\D', '', palavra)
+            if palavra and numero_anterior:
+                palavras[-1] += palavra
+                continue
+        if re.search(r'\w', palavra):
+            palavras.append(palavra)
+            numero_anterior = numero
+    
+    if not palavras:
+        return None
+    
+    if busca_fts_disponivel():
+        # Cada palavra entre aspas (escapadas) e com * para busca por prefixo
+        consulta = ' '.join('"{}"*'.format(palavra.replace('"', '""')) for palavra in palavras)
+        return Cliente.id.in_(
+            text('SELECT rowid FROM clientes_busca WHERE clientes_busca MATCH :consulta')
+            .bindparams(consulta=consulta)
+            .columns(db.column('rowid', db.Integer))
+        )
+    
+    # Sem FTS5: cada palavra deve estar presente em algum dos campos
+    return and_(*[
+        or_(
+            Cliente.nome.ilike(f'%{palavra}%'),
+            Cliente.sobrenome.ilike(f'%{palavra}%'),
+            Cliente.telefone.ilike(f'%{palavra}%'),
+            Cliente.email.ilike(f'%{palavra}%')
+        )
+        for palavra in palavras
+    ])
+
+
+# Função para validar telefone
+def validar_celular(telefone):
+    # Limpar o número, removendo todos os caracteres não numéricos
+    telefone_limpo = re.sub(r'\D', '', telefone)
+    
+    # Verificar se o número tem 10 ou 11 dígitos
+    if len(telefone_limpo) not in [10, 11]:
+        return False, 'O número de telefone deve ter 10 ou 11 dígitos.'
+    
+    # Se tiver 11 dígitos, verificar se o nono dígito é 9
+    if len(telefone_limpo) == 11 and telefone_limpo[2] != '9':
+        return False, 'Para números de celular com 11 dígitos, o nono dígito deve ser 9.'
+    
+    return True, telefone_limpo
+
+
+# Número padrão e máximo de clientes devolvidos pela busca rápida
+LIMITE_BUSCA_CLIENTES = 10
+LIMITE_MAXIMO_BUSCA_CLIENTES = 50
+
+
+# Função para buscar os primeiros clientes correspondentes a um termo, por ordem de nome
+def buscar_clientes(termo, limite=LIMITE_BUSCA_CLIENTES):
+    filtro = filtro_busca_clientes(termo)
+    if filtro is None:
+        return []
+    return Cliente.query.filter(filtro).order_by(Cliente.nome, Cliente.id).limit(limite).all()
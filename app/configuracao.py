@@ -0,0 +1,76 @@
+"""
+Configuração da barbearia (nome, cores, regras de agendamento...) em cache.
+
+Cada processo guarda uma cópia imutável da linha de configuracoes e só
+volta a lê-la quando a coluna versao muda, verificada no máximo a cada
+CONFIGURACAO_VERIFICAR_SEGUNDOS.
+"""
+
+from flask import g
+
+try:
+    from app.modelos import db, Configuracao, ConfiguracaoAtual
+    from app.cache import CacheVersionado
+    from app.disponibilidade import REGRAS_PADRAO, criar_regras
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import db, Configuracao, ConfiguracaoAtual
+    from cache import CacheVersionado
+    from disponibilidade import REGRAS_PADRAO, criar_regras
+
+
+# Cópia da configuração da barbearia partilhada pelos pedidos deste processo
+cache_configuracao = CacheVersionado()
+
+
+# Função para obter a configuração da barbearia sem consultar a base de dados a cada pedido
+def obter_configuracao():
+    """
+    Devolve a cópia imutável (ConfiguracaoAtual) da configuração, ou None se
+    ainda não existir. É memorizada durante o pedido e partilhada pelo processo.
+    """
+    if 'configuracao' in g:
+        return g.configuracao
+    
+    def obter_versao():
+        return db.session.query(Configuracao.versao).order_by(Configuracao.id).limit(1).scalar()
+    
+    def carregar():
+        config = Configuracao.query.order_by(Configuracao.id).first()
+        if config is None:
+            return None, None
+        return config.versao, ConfiguracaoAtual(*(getattr(config, campo) for campo in ConfiguracaoAtual._fields))
+    
+    g.configuracao = cache_configuracao.obter(obter_versao, carregar)
+    return g.configuracao
+
+
+# Função para gravar alterações da configuração e invalidar as cópias em cache
+def salvar_configuracao(config):
+    config.versao = Configuracao.versao + 1
+    db.session.commit()
+    cache_configuracao.invalidar()
+    g.pop('configuracao', None)
+
+
+
+# Disponibilizar a configuração a todos os templates (como "configuracao", para não ocultar o config do Flask)
+def injetar_configuracao():
+    return {'configuracao': obter_configuracao()}
+
+
+# Função para obter as regras de agendamento (passo, preparação, antecedência e janela)
+def regras_agendamento():
+    config = obter_configuracao()
+    if config is None:
+        return REGRAS_PADRAO
+    return criar_regras(
+        config.intervalo_slot_minutos, config.tempo_preparacao_minutos,
+        config.antecedencia_minima_horas, config.janela_maxima_dias
+    )
+
+
+# Função para associar a configuração em cache a uma aplicação (chamada por create_app)
+def init_app(app):
+    cache_configuracao.intervalo_segundos = app.config['CONFIGURACAO_VERIFICAR_SEGUNDOS']
+    app.context_processor(injetar_configuracao)
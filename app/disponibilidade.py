@@ -0,0 +1,267 @@
+"""
+Motor de disponibilidade de horários.
+
+Converte o expediente de um barbeiro e os agendamentos do dia em intervalos
+ocupados ordenados e mesclados, e calcula os horários livres com uma única
+varredura. Todas as horas são tratadas em minutos desde o início do dia.
+
+As regras de agendamento da configuração (passo, tempo de preparação,
+antecedência mínima e janela máxima) são aplicadas aqui, antes da varredura:
+as datas fora da janela são recusadas sem consultar a base de dados e o
+tempo de preparação alarga os intervalos ocupados uma única vez.
+"""
+
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import time, timedelta
+
+
+# Status de agendamento que ocupam a cadeira do barbeiro
+STATUS_OCUPADOS = ('pendente', 'agendado', 'concluído')
+
+# Passo padrão entre horários, em minutos
+PASSO_PADRAO_MINUTOS = 30
+
+# Minutos num dia, usados para bloquear um dia inteiro
+MINUTOS_POR_DIA = 24 * 60
+
+# Regras de agendamento definidas na configuração da barbearia
+RegrasAgendamento = namedtuple('RegrasAgendamento', ['passo', 'preparacao', 'antecedencia_horas', 'janela_dias'])
+
+# Regras usadas quando a configuração não as define (os padrões do modelo Configuracao)
+REGRAS_PADRAO = RegrasAgendamento(passo=PASSO_PADRAO_MINUTOS, preparacao=0, antecedencia_horas=2, janela_dias=30)
+
+
+def criar_regras(passo=None, preparacao=None, antecedencia_horas=None, janela_dias=None):
+    """Cria as regras de agendamento, trocando valores vazios ou inválidos pelos padrões."""
+    return RegrasAgendamento(
+        passo=passo if passo and passo > 0 else REGRAS_PADRAO.passo,
+        preparacao=max(preparacao or 0, 0),
+        antecedencia_horas=max(antecedencia_horas, 0) if antecedencia_horas is not None else REGRAS_PADRAO.antecedencia_horas,
+        janela_dias=janela_dias if janela_dias and janela_dias > 0 else REGRAS_PADRAO.janela_dias
+    )
+
+
+def hora_para_minutos(hora):
+    """Converte um objeto time em minutos desde o início do dia."""
+    return hora.hour * 60 + hora.minute
+
+
+def minutos_para_hora(minutos):
+    """Converte minutos desde o início do dia num objeto time."""
+    return time(minutos // 60, minutos % 60)
+
+
+def expediente_em_minutos(hora_inicio, hora_fim):
+    """
+    Devolve o expediente (inicio, fim) em minutos, ou None se o dia estiver
+    fechado (horário 00:00-00:00).
+    """
+    inicio = hora_para_minutos(hora_inicio)
+    fim = hora_para_minutos(hora_fim)
+    if inicio == 0 and fim == 0:
+        return None
+    return inicio, fim
+
+
+def montar_semana(horarios, dias_fechados=()):
+    """
+    Monta o modelo semanal de expedientes a partir de linhas
+    (barbeiro_id, dia_semana, hora_inicio, hora_fim).
+
+    Devolve um dicionário barbeiro_id -> tupla com 7 expedientes (inicio, fim)
+    em minutos, indexada pelo dia da semana (0=Segunda). Os dias de folga do
+    barbeiro, os dias sem horário e os dias em que a barbearia está fechada
+    (`dias_fechados`) ficam com None.
+    """
+    semana = {}
+    for barbeiro_id, dia_semana, hora_inicio, hora_fim in horarios:
+        dias = semana.setdefault(barbeiro_id, [None] * 7)
+        if dia_semana not in dias_fechados:
+            dias[dia_semana] = expediente_em_minutos(hora_inicio, hora_fim)
+    return {barbeiro_id: tuple(dias) for barbeiro_id, dias in semana.items()}
+
+
+def mesclar_intervalos(intervalos):
+    """
+    Ordena e mescla intervalos (inicio, fim) em minutos.
+
+    Intervalos sobrepostos ou encostados são unidos, de modo que a lista
+    devolvida é estritamente crescente tanto nos inícios como nos fins.
+    """
+    mesclados = []
+    for inicio, fim in sorted(intervalos):
+        if fim <= inicio:
+            continue
+        if mesclados and inicio <= mesclados[-1][1]:
+            if fim > mesclados[-1][1]:
+                mesclados[-1] = (mesclados[-1][0], fim)
+        else:
+            mesclados.append((inicio, fim))
+    return mesclados
+
+
+def agrupar_intervalos(linhas):
+    """
+    Agrupa linhas (chave, hora_inicio, hora_fim) por chave.
+
+    Devolve um dicionário chave -> intervalos mesclados, permitindo calcular a
+    ocupação de vários dias ou barbeiros a partir de uma única consulta.
+    """
+    por_chave = {}
+    for chave, hora_inicio, hora_fim in linhas:
+        por_chave.setdefault(chave, []).append(
+            (hora_para_minutos(hora_inicio), hora_para_minutos(hora_fim))
+        )
+    return {chave: mesclar_intervalos(intervalos) for chave, intervalos in por_chave.items()}
+
+
+def primeiro_instante(agora, regras):
+    """Devolve o primeiro instante (datetime) em que um cliente pode agendar."""
+    return agora + timedelta(hours=regras.antecedencia_horas)
+
+
+def data_na_janela(data, agora, regras):
+    """Indica se a data está entre a antecedência mínima e a janela máxima de agendamento."""
+    return primeiro_instante(agora, regras).date() <= data <= agora.date() + timedelta(days=regras.janela_dias)
+
+
+def minimo_inicio_na_data(data, agora, regras):
+    """
+    Devolve o primeiro minuto da data em que um cliente pode agendar, ou None
+    se a antecedência mínima não restringir esta data.
+    """
+    primeiro = primeiro_instante(agora, regras)
+    if data != primeiro.date():
+        return None
+    # Arredondar para cima: um horário nunca pode começar antes do primeiro instante
+    segundos_parciais = primeiro.second or primeiro.microsecond
+    return hora_para_minutos(primeiro.time()) + (1 if segundos_parciais else 0)
+
+
+def horario_permitido(data, inicio, agora, regras):
+    """Indica se um cliente pode agendar um horário que começa em `inicio` minutos na data."""
+    if not data_na_janela(data, agora, regras):
+        return False
+    minimo_inicio = minimo_inicio_na_data(data, agora, regras)
+    return minimo_inicio is None or inicio >= minimo_inicio
+
+
+def aplicar_preparacao(ocupados, preparacao):
+    """
+    Alarga cada intervalo ocupado pelo tempo de preparação, antes e depois.
+
+    Um atendimento novo tem de começar `preparacao` minutos depois do fim do
+    anterior e terminar `preparacao` minutos antes do início do seguinte.
+    Alargando os ocupados, a varredura só precisa de comparar o horário
+    candidato, sem verificar a preparação em cada horário.
+    """
+    if not preparacao:
+        return ocupados
+    return mesclar_intervalos((inicio - preparacao, fim + preparacao) for inicio, fim in ocupados)
+
+
+def intervalo_livre(inicio, fim, ocupados):
+    """
+    Indica se o intervalo [inicio, fim) não se sobrepõe a nenhum dos
+    intervalos `ocupados` (mesclados). Como estes não se sobrepõem entre si,
+    basta comparar os dois vizinhos encontrados por pesquisa binária.
+    """
+    indice = bisect_right(ocupados, (inicio, float('inf')))
+    if indice > 0 and ocupados[indice - 1][1] > inicio:
+        return False
+    return indice == len(ocupados) or ocupados[indice][0] >= fim
+
+
+class IndiceExcecoes:
+    """
+    Índice das exceções de horário (folgas, feriados, pausas) por data.
+
+    Para cada âmbito (um barbeiro, ou None para a barbearia inteira) guarda
+    as datas em que o conjunto de exceções ativas muda, ordenadas, e os
+    intervalos bloqueados (já mesclados) entre cada par de datas. A pesquisa
+    de uma data é uma pesquisa binária: O(log exceções).
+    """
+
+    def __init__(self, excecoes):
+        """`excecoes` são linhas (barbeiro_id, data_inicio, data_fim, inicio, fim), com as horas em minutos."""
+        por_ambito = {}
+        for barbeiro_id, data_inicio, data_fim, inicio, fim in excecoes:
+            por_ambito.setdefault(barbeiro_id, []).append((data_inicio, data_fim + timedelta(days=1), inicio, fim))
+
+        self._ambitos = {}
+        for ambito, lista in por_ambito.items():
+            limites = sorted({data for data_inicio, data_fim, _, _ in lista for data in (data_inicio, data_fim)})
+            blocos = [
+                mesclar_intervalos(
+                    (inicio, fim) for data_inicio, data_fim, inicio, fim in lista
+                    if data_inicio <= data < data_fim
+                )
+                for data in limites[:-1]
+            ]
+            self._ambitos[ambito] = (limites, blocos)
+
+    def _intervalos_do_ambito(self, ambito, data):
+        limites, blocos = self._ambitos.get(ambito, ((), ()))
+        indice = bisect_right(limites, data) - 1
+        if 0 <= indice < len(blocos):
+            return blocos[indice]
+        return []
+
+    def intervalos(self, barbeiro_id, data):
+        """Devolve os intervalos bloqueados do barbeiro na data, incluindo os da barbearia."""
+        do_barbeiro = self._intervalos_do_ambito(barbeiro_id, data)
+        da_barbearia = self._intervalos_do_ambito(None, data)
+        if not do_barbeiro or not da_barbearia:
+            return do_barbeiro or da_barbearia
+        return mesclar_intervalos(do_barbeiro + da_barbearia)
+
+
+def calcular_horarios_livres(inicio_expediente, fim_expediente, duracao, ocupados,
+                             passo=PASSO_PADRAO_MINUTOS, minimo_inicio=None, preparacao=0, bloqueados=()):
+    """
+    Devolve a lista de horários livres (inicio, fim) em minutos.
+
+    `ocupados` deve vir de `mesclar_intervalos`. Como os horários candidatos
+    e os intervalos ocupados estão ambos ordenados, basta um ponteiro que
+    avança sobre os ocupados: O(horários + agendamentos). Os horários
+    começam no início do expediente, de `passo` em `passo` minutos.
+    `bloqueados` são as exceções de horário, que não levam preparação.
+    """
+    livres = []
+    indice = 0
+    ocupados = aplicar_preparacao(ocupados, preparacao)
+    if bloqueados:
+        ocupados = mesclar_intervalos(list(ocupados) + list(bloqueados))
+    total = len(ocupados)
+
+    # Saltar diretamente para o primeiro horário da grelha que respeita o mínimo
+    primeiro = inicio_expediente
+    if minimo_inicio is not None and minimo_inicio > inicio_expediente:
+        primeiro += -(-(minimo_inicio - inicio_expediente) // passo) * passo
+
+    for inicio in range(primeiro, fim_expediente - duracao + 1, passo):
+        fim = inicio + duracao
+
+        # Descartar os intervalos ocupados que terminam antes deste horário
+        while indice < total and ocupados[indice][1] <= inicio:
+            indice += 1
+
+        # Há conflito se o próximo intervalo ocupado começa antes do fim do horário
+        if indice < total and ocupados[indice][0] < fim:
+            continue
+
+        livres.append((inicio, fim))
+
+    return livres
+
+
+def formatar_horarios(horarios):
+    """Converte horários (inicio, fim) em minutos no formato usado pela API."""
+    return [
+        {
+            'hora_inicio': minutos_para_hora(inicio).strftime('%H:%M'),
+            'hora_fim': minutos_para_hora(fim).strftime('%H:%M')
+        }
+        for inicio, fim in horarios
+    ]
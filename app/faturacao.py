@@ -0,0 +1,149 @@
+"""
+Faturação diária: totais dos agendamentos concluídos por dia, barbeiro,
+serviço e método de pagamento, mantidos na mesma transação que altera cada
+agendamento para que os relatórios não percorram todo o histórico.
+"""
+
+from sqlalchemy import func
+
+try:
+    from app.modelos import db, Agendamento, FaturacaoDiaria, Servico, METODOS_PAGAMENTO
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import db, Agendamento, FaturacaoDiaria, Servico, METODOS_PAGAMENTO
+
+
+# Função para converter o método de pagamento recebido no código normalizado
+def normalizar_metodo_pagamento(metodo):
+    """
+    Devolve o código de METODOS_PAGAMENTO correspondente ao método indicado,
+    aceitando tanto o código como a descrição (ex: "Cartão de Débito").
+    Devolve None se o método não for reconhecido.
+    """
+    metodo = (metodo or '').strip().lower()
+    if not metodo:
+        return None
+    if metodo in METODOS_PAGAMENTO:
+        return metodo
+    
+    if 'dinheiro' in metodo:
+        return 'dinheiro'
+    if 'debito' in metodo or 'débito' in metodo:
+        return 'debito'
+    if 'credito' in metodo or 'crédito' in metodo:
+        return 'credito'
+    if 'pix' in metodo:
+        return 'pix'
+    return None
+
+
+# Função para somar (sinal=1) ou subtrair (sinal=-1) um agendamento concluído da faturação diária
+def registrar_faturacao(agendamento, sinal=1):
+    """
+    Atualiza a linha de faturacao_diaria do agendamento, se estiver concluído.
+    
+    Deve ser chamada com sinal=-1 antes de alterar um agendamento e com sinal=1
+    depois, dentro da mesma transação, para que a tabela acompanhe a alteração.
+    """
+    if agendamento.status != 'concluído':
+        return
+    
+    # Valor do atendimento: o valor pago quando registado, senão o preço de tabela
+    valor = agendamento.valor_pago
+    if valor is None:
+        valor = agendamento.servico.preco
+    
+    ajustar_faturacao(
+        (agendamento.data, agendamento.barbeiro_id, agendamento.servico_id, agendamento.metodo_pagamento),
+        sinal, sinal * valor
+    )
+
+
+# Função para somar uma quantidade e um valor a uma linha da faturação diária
+def ajustar_faturacao(chave, quantidade, valor):
+    """
+    `chave` é o tuplo (data, barbeiro_id, servico_id, metodo_pagamento).
+    Usa o INSERT ... ON CONFLICT DO UPDATE de ajustar_faturacao_lote, para que
+    dois pedidos que criam a mesma linha ao mesmo tempo somem os dois valores.
+    """
+    ajustar_faturacao_lote({chave: (quantidade, valor)})
+
+
+# Função para aplicar de uma vez várias variações à faturação diária
+def ajustar_faturacao_lote(variacoes):
+    """
+    `variacoes` é um dicionário chave -> (quantidade, valor), com as chaves de
+    ajustar_faturacao. No SQLite e no PostgreSQL todas as linhas seguem num
+    único INSERT ... ON CONFLICT DO UPDATE, atómico mesmo quando a linha
+    ainda não existe; nos outros bancos, uma a uma (UPDATE e, se nenhuma
+    linha foi alterada, INSERT).
+    """
+    linhas = [
+        {
+            'data': data,
+            'barbeiro_id': barbeiro_id,
+            'servico_id': servico_id,
+            'metodo_pagamento': metodo_pagamento or '',
+            'quantidade': quantidade,
+            'valor_total': valor
+        }
+        for (data, barbeiro_id, servico_id, metodo_pagamento), (quantidade, valor) in variacoes.items()
+        if quantidade or valor
+    ]
+    if not linhas:
+        return
+
+    dialeto = db.session.get_bind().dialect.name
+    if dialeto == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialeto == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        for linha in linhas:
+            chave = {campo: linha[campo] for campo in ('data', 'barbeiro_id', 'servico_id', 'metodo_pagamento')}
+            atualizadas = FaturacaoDiaria.query.filter_by(**chave).update({
+                FaturacaoDiaria.quantidade: FaturacaoDiaria.quantidade + linha['quantidade'],
+                FaturacaoDiaria.valor_total: FaturacaoDiaria.valor_total + linha['valor_total']
+            }, synchronize_session=False)
+            if not atualizadas:
+                db.session.add(FaturacaoDiaria(**linha))
+        return
+
+    instrucao = insert(FaturacaoDiaria)
+    instrucao = instrucao.on_conflict_do_update(
+        index_elements=['data', 'barbeiro_id', 'servico_id', 'metodo_pagamento'],
+        set_={
+            'quantidade': FaturacaoDiaria.quantidade + instrucao.excluded.quantidade,
+            'valor_total': FaturacaoDiaria.valor_total + instrucao.excluded.valor_total
+        }
+    )
+    db.session.execute(instrucao, linhas)
+
+
+# Função para reconstruir a faturação diária a partir do histórico de agendamentos
+def reconstruir_faturacao():
+    """Recalcula toda a tabela faturacao_diaria. Devolve o número de linhas criadas."""
+    metodo = func.coalesce(Agendamento.metodo_pagamento, '')
+    consulta = (
+        db.select(
+            Agendamento.data,
+            Agendamento.barbeiro_id,
+            Agendamento.servico_id,
+            metodo,
+            func.count(Agendamento.id),
+            func.sum(func.coalesce(Agendamento.valor_pago, Servico.preco))
+        )
+        .join(Servico, Agendamento.servico_id == Servico.id)
+        .where(Agendamento.status == 'concluído')
+        .group_by(Agendamento.data, Agendamento.barbeiro_id, Agendamento.servico_id, metodo)
+    )
+    
+    tabela = FaturacaoDiaria.__table__
+    db.session.execute(tabela.delete())
+    db.session.execute(tabela.insert().from_select(
+        ['data', 'barbeiro_id', 'servico_id', 'metodo_pagamento', 'quantidade', 'valor_total'],
+        consulta
+    ))
+    db.session.commit()
+    
+    return db.session.query(func.count()).select_from(FaturacaoDiaria).scalar()
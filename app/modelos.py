@@ -0,0 +1,244 @@
+"""
+Modelos de dados da barbearia.
+
+Este módulo não cria a aplicação nem define rotas, para que os scripts que
+só precisam dos modelos o possam importar sem carregar os blueprints. A
+extensão `db` é associada a cada aplicação em create_app (app/app.py).
+"""
+
+from collections import namedtuple
+from datetime import datetime
+
+from flask_login import UserMixin
+from flask_sqlalchemy import SQLAlchemy
+
+
+# Extensão do SQLAlchemy, associada à aplicação em create_app
+db = SQLAlchemy()
+
+
+# Definição dos modelos
+
+class Servico(db.Model):
+    __tablename__ = 'servicos'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), nullable=False)
+    descricao = db.Column(db.Text)
+    preco = db.Column(db.Float, nullable=False)
+    duracao_minutos = db.Column(db.Integer, nullable=False)
+    ativo = db.Column(db.Boolean, default=True)
+    imagem_url = db.Column(db.String(255), nullable=True)
+    
+    # Relacionamento com agendamentos
+    agendamentos = db.relationship('Agendamento', backref='servico', lazy=True)
+    
+    def __repr__(self):
+        return f'<Servico {self.nome}>'
+
+
+class Barbeiro(db.Model):
+    __tablename__ = 'barbeiros'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), nullable=False)
+    sobrenome = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    telefone = db.Column(db.String(20))
+    especialidade = db.Column(db.String(100))
+    data_contratacao = db.Column(db.Date, default=datetime.utcnow)
+    ativo = db.Column(db.Boolean, default=True)
+    foto_url = db.Column(db.String(255), nullable=True)
+    
+    # Relacionamentos
+    agendamentos = db.relationship('Agendamento', backref='barbeiro', lazy=True)
+    horarios = db.relationship('HorarioFuncionamento', backref='barbeiro', lazy=True)
+    
+    def __repr__(self):
+        return f'<Barbeiro {self.nome} {self.sobrenome}>'
+
+
+class Cliente(db.Model):
+    __tablename__ = 'clientes'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), nullable=False, index=True)  # Ordenação e paginação da lista de clientes
+    sobrenome = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    telefone = db.Column(db.String(20), index=True)  # Usado para identificar o cliente ao agendar
+    data_cadastro = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relacionamento com agendamentos
+    agendamentos = db.relationship('Agendamento', backref='cliente', lazy=True)
+    
+    def __repr__(self):
+        return f'<Cliente {self.nome} {self.sobrenome}>'
+
+
+class HorarioFuncionamento(db.Model):
+    __tablename__ = 'horarios_funcionamento'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    barbeiro_id = db.Column(db.Integer, db.ForeignKey('barbeiros.id'), nullable=False)
+    dia_semana = db.Column(db.Integer, nullable=False)  # 0=Segunda, 1=Terça, ..., 6=Domingo
+    hora_inicio = db.Column(db.Time, nullable=False)
+    hora_fim = db.Column(db.Time, nullable=False)
+    
+    def __repr__(self):
+        dias = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
+        return f'<Horário {dias[self.dia_semana]} {self.hora_inicio}-{self.hora_fim}>'
+
+
+# Nomes dos dias da semana, pela ordem de dia_semana (0=Segunda, ..., 6=Domingo)
+NOMES_DIAS_SEMANA = ['Segunda-feira', 'Terça-feira', 'Quarta-feira', 'Quinta-feira', 'Sexta-feira', 'Sábado', 'Domingo']
+
+
+class DiaSemana(db.Model):
+    __tablename__ = 'dias_semana'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(20), nullable=False)  # Segunda-feira, Terça-feira, etc.
+    hora_abertura = db.Column(db.Time, nullable=False)
+    hora_fechamento = db.Column(db.Time, nullable=False)
+    ativo = db.Column(db.Boolean, default=True)  # Se o dia está aberto ou fechado
+    
+    def __repr__(self):
+        status = "Aberto" if self.ativo else "Fechado"
+        return f'<{self.nome}: {self.hora_abertura}-{self.hora_fechamento}, {status}>'
+
+
+class ExcecaoHorario(db.Model):
+    """Bloqueio do horário normal: feriado, férias, folga ou pausa (ex.: almoço)."""
+    __tablename__ = 'excecoes_horario'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # Barbeiro afetado; vazio quando a exceção vale para toda a barbearia
+    barbeiro_id = db.Column(db.Integer, db.ForeignKey('barbeiros.id'), nullable=True, index=True)
+    data_inicio = db.Column(db.Date, nullable=False)
+    data_fim = db.Column(db.Date, nullable=False, index=True)  # Carregamento das exceções ainda em vigor
+    # Sem horas, a exceção bloqueia os dias inteiros
+    hora_inicio = db.Column(db.Time, nullable=True)
+    hora_fim = db.Column(db.Time, nullable=True)
+    motivo = db.Column(db.String(100), nullable=True)
+    
+    barbeiro = db.relationship('Barbeiro', backref=db.backref('excecoes', lazy=True, cascade='all, delete-orphan'))
+    
+    def __repr__(self):
+        ambito = f'barbeiro {self.barbeiro_id}' if self.barbeiro_id else 'barbearia'
+        return f'<ExcecaoHorario {self.data_inicio}-{self.data_fim} ({ambito})>'
+
+
+class UsuarioAdmin(UserMixin, db.Model):
+    __tablename__ = 'usuarios_admin'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), nullable=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    username = db.Column(db.String(100), nullable=False)
+    password_hash = db.Column(db.String(128), nullable=False)
+    funcao = db.Column(db.String(20), nullable=False)
+    ativo = db.Column(db.Boolean, default=True)
+    data_cadastro = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @property
+    def is_admin(self):
+        return True
+    
+    def __repr__(self):
+        return f'<UsuarioAdmin {self.nome}>'
+
+
+# Métodos de pagamento aceites: código normalizado -> descrição
+METODOS_PAGAMENTO = {
+    'dinheiro': 'Dinheiro',
+    'debito': 'Cartão de Débito',
+    'credito': 'Cartão de Crédito',
+    'pix': 'PIX',
+    'outro': 'Outro'
+}
+
+
+class Agendamento(db.Model):
+    __tablename__ = 'agendamentos'
+    __table_args__ = (
+        # Ocupação de um barbeiro numa data (motor de disponibilidade e verificação de conflitos)
+        db.Index('ix_agendamentos_barbeiro_data_status', 'barbeiro_id', 'data', 'status'),
+        # Consultas por período (agenda, dashboard e relatórios financeiros)
+        db.Index('ix_agendamentos_data_status', 'data', 'status'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cliente_id = db.Column(db.Integer, db.ForeignKey('clientes.id'), nullable=False, index=True)
+    barbeiro_id = db.Column(db.Integer, db.ForeignKey('barbeiros.id'), nullable=False)
+    servico_id = db.Column(db.Integer, db.ForeignKey('servicos.id'), nullable=False, index=True)
+    data = db.Column(db.Date, nullable=False)
+    hora_inicio = db.Column(db.Time, nullable=False)
+    hora_fim = db.Column(db.Time, nullable=False)
+    status = db.Column(db.String(20), default='pendente')  # pendente, agendado, concluído, cancelado
+    observacoes = db.Column(db.Text)
+    data_agendamento = db.Column(db.DateTime, default=datetime.utcnow)
+    valor_pago = db.Column(db.Float, nullable=True)
+    metodo_pagamento = db.Column(
+        db.Enum(*METODOS_PAGAMENTO, name='metodo_pagamento', native_enum=False, length=20),
+        nullable=True
+    )  # dinheiro, debito, credito, pix, outro
+    # Incrementada a cada alteração; o UPDATE só se aplica se a versão lida não mudou
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
+    __mapper_args__ = {'version_id_col': versao}
+    
+    def __repr__(self):
+        return f'<Agendamento {self.id} - {self.data} {self.hora_inicio}>'
+
+
+class FaturacaoDiaria(db.Model):
+    # Totais dos agendamentos concluídos por dia, barbeiro, serviço e método de pagamento,
+    # mantidos incrementalmente para que os relatórios não percorram todo o histórico
+    __tablename__ = 'faturacao_diaria'
+    
+    data = db.Column(db.Date, primary_key=True)
+    barbeiro_id = db.Column(db.Integer, db.ForeignKey('barbeiros.id'), primary_key=True)
+    servico_id = db.Column(db.Integer, db.ForeignKey('servicos.id'), primary_key=True)
+    metodo_pagamento = db.Column(db.String(50), primary_key=True, default='')  # código de METODOS_PAGAMENTO, '' quando não registado
+    quantidade = db.Column(db.Integer, default=0, nullable=False)
+    valor_total = db.Column(db.Float, default=0.0, nullable=False)
+    
+    def __repr__(self):
+        return f'<FaturacaoDiaria {self.data} - barbeiro {self.barbeiro_id} - servico {self.servico_id}>'
+
+
+class Configuracao(db.Model):
+    __tablename__ = 'configuracoes'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    nome_barbearia = db.Column(db.String(100), default="Barbearia App", nullable=False)
+    logo_url = db.Column(db.String(255), nullable=True)
+    cor_primaria = db.Column(db.String(7), default="#3498db", nullable=False)
+    cor_secundaria = db.Column(db.String(7), default="#2c3e50", nullable=True)
+    favicon_url = db.Column(db.String(255), nullable=True)
+    telefone = db.Column(db.String(20), nullable=True)
+    endereco = db.Column(db.Text, nullable=True)
+    link_instagram = db.Column(db.String(255), nullable=True)
+    link_facebook = db.Column(db.String(255), nullable=True)
+    exibir_redes_sociais = db.Column(db.Boolean, default=False, nullable=False)
+    # Tempo mínimo em horas que um cliente precisa dar de antecedência para agendar
+    antecedencia_minima_horas = db.Column(db.Integer, default=2, nullable=True)
+    # Número máximo de dias no futuro que um cliente pode fazer um agendamento
+    janela_maxima_dias = db.Column(db.Integer, default=30, nullable=True)
+    # O 'passo' do calendário, em minutos
+    intervalo_slot_minutos = db.Column(db.Integer, default=30, nullable=True)
+    # Tempo extra a adicionar após cada agendamento
+    tempo_preparacao_minutos = db.Column(db.Integer, default=0, nullable=True)
+    # Credenciais da Twilio para integração com WhatsApp
+    twilio_account_sid = db.Column(db.String(255), nullable=True)
+    twilio_auth_token = db.Column(db.String(255), nullable=True)
+    twilio_whatsapp_number = db.Column(db.String(20), nullable=True)
+    # Incrementada a cada alteração, para os processos detetarem cópias desatualizadas
+    versao = db.Column(db.Integer, default=1, nullable=False)
+    
+    def __repr__(self):
+        return f'<Configuracao {self.id} - {self.nome_barbearia}>'
+
+
+# Cópia imutável da configuração, com os mesmos atributos do modelo
+ConfiguracaoAtual = namedtuple('ConfiguracaoAtual', [coluna.name for coluna in Configuracao.__table__.columns])
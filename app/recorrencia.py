@@ -0,0 +1,85 @@
+"""
+Expansão de séries de agendamentos recorrentes.
+
+Segue um subconjunto das regras RRULE (RFC 5545): frequência diária,
+semanal ou mensal (FREQ), intervalo entre repetições (INTERVAL), dias da
+semana nas séries semanais (BYDAY), número de ocorrências (COUNT) e data
+limite (UNTIL). Nas séries mensais, os meses sem o dia pedido (ex.: 31)
+são saltados, como no RRULE.
+"""
+
+import calendar
+from datetime import date, timedelta
+from itertools import count
+
+
+# Frequências aceites, equivalentes a FREQ=DAILY, WEEKLY e MONTHLY
+FREQUENCIAS = ('diaria', 'semanal', 'mensal')
+
+# Número máximo de ocorrências numa série (um ano de agendamentos semanais)
+MAXIMO_OCORRENCIAS = 52
+
+
+def _datas_candidatas(data_inicio, frequencia, intervalo, dias_semana):
+    """Gera, por ordem e sem fim, as datas da série a partir de data_inicio."""
+    if frequencia == 'diaria':
+        for indice in count():
+            yield data_inicio + timedelta(days=indice * intervalo)
+
+    elif frequencia == 'semanal':
+        dias = sorted(set(dias_semana)) if dias_semana else [data_inicio.weekday()]
+        segunda = data_inicio - timedelta(days=data_inicio.weekday())
+        while True:
+            for dia in dias:
+                data = segunda + timedelta(days=dia)
+                if data >= data_inicio:
+                    yield data
+            segunda += timedelta(weeks=intervalo)
+
+    else:
+        ano, mes = data_inicio.year, data_inicio.month
+        while True:
+            if data_inicio.day <= calendar.monthrange(ano, mes)[1]:
+                yield date(ano, mes, data_inicio.day)
+            mes += intervalo
+            ano += (mes - 1) // 12
+            mes = (mes - 1) % 12 + 1
+
+
+def expandir_recorrencia(data_inicio, frequencia, intervalo=1, ocorrencias=None, data_fim=None,
+                         dias_semana=None, maximo=MAXIMO_OCORRENCIAS):
+    """
+    Devolve a lista ordenada das datas de uma série recorrente.
+
+    A série termina após `ocorrencias` datas ou na `data_fim` (o que vier
+    primeiro). Lança ValueError, com uma mensagem para o utilizador, se a
+    regra for inválida ou produzir mais de `maximo` ocorrências.
+    """
+    if frequencia not in FREQUENCIAS:
+        raise ValueError('Frequência inválida. Use diaria, semanal ou mensal.')
+    if intervalo < 1:
+        raise ValueError('O intervalo entre repetições deve ser pelo menos 1.')
+    if ocorrencias is None and data_fim is None:
+        raise ValueError('Indique o número de ocorrências ou a data de fim da série.')
+    if ocorrencias is not None and not 1 <= ocorrencias <= maximo:
+        raise ValueError(f'A série deve ter entre 1 e {maximo} ocorrências.')
+    if data_fim is not None and data_fim < data_inicio:
+        raise ValueError('A data de fim não pode ser anterior à data de início.')
+    if dias_semana and frequencia != 'semanal':
+        raise ValueError('Os dias da semana só se aplicam a séries semanais.')
+    if dias_semana and any(not 0 <= dia <= 6 for dia in dias_semana):
+        raise ValueError('Dias da semana inválidos (0=Segunda, ..., 6=Domingo).')
+
+    limite = ocorrencias if ocorrencias is not None else maximo + 1
+    datas = []
+    for data in _datas_candidatas(data_inicio, frequencia, intervalo, dias_semana):
+        if data_fim is not None and data > data_fim:
+            break
+        datas.append(data)
+        if len(datas) == limite:
+            break
+
+    if len(datas) > maximo:
+        raise ValueError(f'A série não pode ter mais de {maximo} ocorrências.')
+
+    return datas
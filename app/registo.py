@@ -0,0 +1,204 @@
+"""
+Registo (logging) estruturado da aplicação.
+
+Cada módulo usa `logging.getLogger(__name__)` e passa os dados do evento em
+`extra=campos(...)`. Os registos são escritos numa linha JSON por evento
+(ou em texto, com LOG_FORMATO=texto), com níveis por módulo.
+
+A escrita não bloqueia os pedidos: o QueueHandler só coloca o registo numa
+fila e uma thread do QueueListener formata-o e escreve-o. Os eventos de
+DEBUG, os mais frequentes, são amostrados: só 1 em cada LOG_AMOSTRAGEM de
+cada tipo é escrito, com o campo "amostragem" a indicar a taxa.
+
+A configuração vem das variáveis de ambiente LOG_NIVEL (nível padrão),
+LOG_NIVEIS (ex.: "app.rotas.api=DEBUG,sqlalchemy.engine=INFO"),
+LOG_AMOSTRAGEM e LOG_FORMATO.
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+
+# Nível padrão dos registos
+NIVEL_PADRAO = 'INFO'
+
+# Por padrão, escreve-se 1 em cada 100 eventos de DEBUG de cada tipo
+AMOSTRAGEM_PADRAO = 100
+
+# Formatos de saída aceites
+FORMATOS = ('json', 'texto')
+
+# Formato das linhas em texto
+FORMATO_TEXTO = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Handlers e listener instalados por configurar_registo, para poder reconfigurar
+_instalado = {'handler': None, 'ouvinte': None, 'niveis': {}}
+
+
+# Função para passar os dados de um evento: logger.debug('...', extra=campos(total=3))
+def campos(**valores):
+    return {'campos': valores}
+
+
+class FormatadorJSON(logging.Formatter):
+    """Formata cada registo numa linha JSON, com os campos do evento no topo."""
+    
+    def format(self, registo):
+        dados = {
+            'momento': datetime.fromtimestamp(registo.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': registo.levelname,
+            'modulo': registo.name,
+            'mensagem': registo.getMessage()
+        }
+        dados.update(getattr(registo, 'campos', None) or {})
+        if getattr(registo, 'amostragem', 1) > 1:
+            dados['amostragem'] = registo.amostragem
+        if registo.exc_info and not registo.exc_text:
+            registo.exc_text = self.formatException(registo.exc_info)
+        if registo.exc_text:
+            dados['excecao'] = registo.exc_text
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class FormatadorTexto(logging.Formatter):
+    """Formato de texto, com os campos do evento acrescentados como chave=valor."""
+    
+    def format(self, registo):
+        linha = super().format(registo)
+        valores = getattr(registo, 'campos', None)
+        if valores:
+            linha += ' ' + ' '.join(f'{chave}={valor}' for chave, valor in valores.items())
+        return linha
+
+
+class FiltroAmostragem(logging.Filter):
+    """
+    Deixa passar 1 em cada `taxa` registos de nível até `nivel_maximo`, contados
+    por tipo de evento (módulo e mensagem). Os níveis acima passam sempre.
+    """
+    
+    def __init__(self, taxa, nivel_maximo=logging.DEBUG):
+        super().__init__()
+        self.taxa = max(int(taxa), 1)
+        self.nivel_maximo = nivel_maximo
+        self._contadores = {}
+    
+    def filter(self, registo):
+        if registo.levelno > self.nivel_maximo or self.taxa == 1:
+            return True
+        chave = (registo.name, registo.msg)
+        contador = self._contadores.get(chave)
+        if contador is None:
+            contador = self._contadores.setdefault(chave, itertools.count())
+        # next() num itertools.count é atómico, pelo que não é preciso um lock
+        if next(contador) % self.taxa:
+            return False
+        registo.amostragem = self.taxa
+        return True
+
+
+class FilaRegisto(logging.handlers.QueueHandler):
+    """
+    QueueHandler que mantém a mensagem e a exceção separadas, para que o
+    formatador do listener as escreva em campos distintos.
+    """
+    
+    def prepare(self, registo):
+        registo = logging.makeLogRecord(registo.__dict__)
+        registo.msg = registo.getMessage()
+        registo.args = None
+        if registo.exc_info:
+            registo.exc_text = logging.Formatter().formatException(registo.exc_info)
+            registo.exc_info = None
+        return registo
+
+
+# Função para ler os níveis por módulo de "modulo=NIVEL,modulo=NIVEL"
+def niveis_do_ambiente(ambiente=None):
+    ambiente = os.environ if ambiente is None else ambiente
+    niveis = {}
+    for par in (ambiente.get('LOG_NIVEIS') or '').split(','):
+        if not par.strip():
+            continue
+        modulo, _, nivel = par.partition('=')
+        if not modulo.strip() or not nivel.strip():
+            raise ValueError(f'LOG_NIVEIS deve ter o formato modulo=NIVEL: {par!r}')
+        niveis[modulo.strip()] = nivel.strip().upper()
+    return niveis
+
+
+# Função para criar o formatador do formato pedido
+def criar_formatador(formato):
+    if formato not in FORMATOS:
+        raise ValueError(f'Formato de registo inválido: {formato!r} (use {" ou ".join(FORMATOS)})')
+    return FormatadorJSON() if formato == 'json' else FormatadorTexto(FORMATO_TEXTO)
+
+
+# Função para parar o listener e retirar os handlers instalados
+def parar_registo():
+    raiz = logging.getLogger()
+    if _instalado['ouvinte'] is not None:
+        _instalado['ouvinte'].stop()
+        _instalado['ouvinte'] = None
+    if _instalado['handler'] is not None:
+        raiz.removeHandler(_instalado['handler'])
+        _instalado['handler'] = None
+    for modulo in _instalado['niveis']:
+        logging.getLogger(modulo).setLevel(logging.NOTSET)
+    _instalado['niveis'] = {}
+
+
+# Função para (re)configurar o registo do processo
+def configurar_registo(nivel=NIVEL_PADRAO, niveis=None, amostragem=AMOSTRAGEM_PADRAO, formato='json',
+                       saida=None, fila=True):
+    """
+    Instala no logger raiz um handler com o formato e a amostragem pedidos.
+    Com `fila`, o handler é um QueueHandler e a escrita em `saida` (por
+    padrão, stderr) é feita pela thread de um QueueListener; sem `fila`, a
+    escrita é síncrona, no próprio pedido. Chamadas seguintes substituem a
+    configuração anterior.
+    """
+    parar_registo()
+    
+    escritor = logging.StreamHandler(saida if saida is not None else sys.stderr)
+    escritor.setFormatter(criar_formatador(formato))
+    
+    if fila:
+        fila_registos = queue.SimpleQueue()
+        handler = FilaRegisto(fila_registos)
+        _instalado['ouvinte'] = logging.handlers.QueueListener(fila_registos, escritor)
+        _instalado['ouvinte'].start()
+    else:
+        handler = escritor
+    handler.addFilter(FiltroAmostragem(amostragem))
+    
+    raiz = logging.getLogger()
+    raiz.addHandler(handler)
+    raiz.setLevel(nivel)
+    _instalado['handler'] = handler
+    
+    _instalado['niveis'] = dict(niveis or {})
+    for modulo, nivel_modulo in _instalado['niveis'].items():
+        logging.getLogger(modulo).setLevel(nivel_modulo)
+    return handler
+
+
+# Escrever os registos que ainda estão na fila quando o processo termina
+atexit.register(parar_registo)
+
+
+# Função para configurar o registo de uma aplicação (chamada por create_app)
+def init_app(app):
+    configurar_registo(
+        nivel=app.config['LOG_NIVEL'],
+        niveis=app.config['LOG_NIVEIS'],
+        amostragem=app.config['LOG_AMOSTRAGEM'],
+        formato=app.config['LOG_FORMATO']
+    )
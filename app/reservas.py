@@ -0,0 +1,375 @@
+"""
+Ocupação dos barbeiros e reserva de horários.
+
+Reúne o modelo semanal de expedientes, as exceções de horário e os
+intervalos ocupados (em cache por processo, invalidados a cada alteração),
+a verificação de conflitos feita dentro de reserva_exclusiva e as respostas
+de conflito e de versão desatualizada partilhadas pelas rotas.
+"""
+
+from contextlib import contextmanager, ExitStack
+from datetime import datetime, time
+import threading
+
+from flask import jsonify
+from sqlalchemy import text
+
+try:
+    from app.modelos import (db, Agendamento, Barbeiro, DiaSemana, ExcecaoHorario, HorarioFuncionamento,
+                             NOMES_DIAS_SEMANA)
+    from app.disponibilidade import (STATUS_OCUPADOS, hora_para_minutos, minutos_para_hora, montar_semana,
+                                     IndiceExcecoes, MINUTOS_POR_DIA, mesclar_intervalos, intervalo_livre,
+                                     agrupar_intervalos, calcular_horarios_livres, formatar_horarios,
+                                     minimo_inicio_na_data)
+    from app.cache import CacheTTL
+    from app.configuracao import regras_agendamento
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import (db, Agendamento, Barbeiro, DiaSemana, ExcecaoHorario, HorarioFuncionamento,
+                         NOMES_DIAS_SEMANA)
+    from disponibilidade import (STATUS_OCUPADOS, hora_para_minutos, minutos_para_hora, montar_semana,
+                                 IndiceExcecoes, MINUTOS_POR_DIA, mesclar_intervalos, intervalo_livre,
+                                 agrupar_intervalos, calcular_horarios_livres, formatar_horarios,
+                                 minimo_inicio_na_data)
+    from cache import CacheTTL
+    from configuracao import regras_agendamento
+
+
+# Cache de intervalos ocupados, invalidado sempre que um agendamento é alterado
+cache_ocupacao = CacheTTL()
+
+# Modelo semanal de expedientes dos barbeiros ativos e índice das exceções de horário
+cache_horarios = CacheTTL(tamanho_maximo=2)
+
+
+# Função para aplicar aos caches os tamanhos e tempos de vida da aplicação (chamada por create_app)
+def init_app(app):
+    cache_ocupacao.tamanho_maximo = app.config['CACHE_OCUPACAO_TAMANHO']
+    cache_ocupacao.ttl_segundos = app.config['CACHE_OCUPACAO_TTL']
+    cache_horarios.ttl_segundos = app.config['CACHE_HORARIOS_TTL']
+
+
+# Função com o estado atual de um agendamento, para o cliente atualizar a sua cópia
+def estado_agendamento(agendamento):
+    return {
+        'id': agendamento.id,
+        'versao': agendamento.versao,
+        'status': agendamento.status,
+        'barbeiro_id': agendamento.barbeiro_id,
+        'data': agendamento.data.strftime('%Y-%m-%d'),
+        'hora_inicio': agendamento.hora_inicio.strftime('%H:%M'),
+        'hora_fim': agendamento.hora_fim.strftime('%H:%M'),
+        'valor_pago': agendamento.valor_pago,
+        'metodo_pagamento': agendamento.metodo_pagamento
+    }
+
+
+# Função para comparar a versão enviada pelo cliente com a versão gravada
+def versao_confere(agendamento, versao):
+    """Sem versão enviada não há verificação prévia; o UPDATE continua a comparar a versão lida."""
+    return versao in (None, '') or str(agendamento.versao) == str(versao)
+
+
+# Função para a resposta 409 quando um agendamento foi alterado por outro pedido
+def resposta_versao_desatualizada(*ids):
+    """Desfaz a transação e devolve o estado atual dos agendamentos, lido de novo da base de dados."""
+    db.session.rollback()
+    agendamentos = Agendamento.query.filter(Agendamento.id.in_(ids)).order_by(Agendamento.id).all()
+    return jsonify({
+        'status': 'error',
+        'message': 'O agendamento foi alterado por outro utilizador. Reveja os dados atualizados e tente novamente.',
+        'agendamentos': [estado_agendamento(agendamento) for agendamento in agendamentos]
+    }), 409
+
+
+# Horário padrão de um barbeiro novo: 9h às 18h de segunda a sexta, 9h às 13h ao sábado, fechado ao domingo
+HORARIOS_PADRAO = [(time(9, 0), time(18, 0))] * 5 + [(time(9, 0), time(13, 0)), (time(0, 0), time(0, 0))]
+
+
+# Função para criar os horários padrão de um barbeiro
+def criar_horarios_padrao(barbeiro_id, dias_existentes=()):
+    """Adiciona à sessão os dias da semana que faltam ao barbeiro, com o horário padrão."""
+    db.session.add_all([
+        HorarioFuncionamento(barbeiro_id=barbeiro_id, dia_semana=dia, hora_inicio=hora_inicio, hora_fim=hora_fim)
+        for dia, (hora_inicio, hora_fim) in enumerate(HORARIOS_PADRAO)
+        if dia not in dias_existentes
+    ])
+
+
+# Função para obter o modelo semanal de expedientes dos barbeiros ativos
+def obter_semana_barbeiros():
+    """
+    Devolve o dicionário barbeiro_id -> 7 expedientes (inicio, fim) em
+    minutos, ou None nos dias fechados. É carregado numa única leitura e
+    mantido em memória, já com os dias em que a barbearia está fechada.
+    """
+    def carregar():
+        dias_fechados = {
+            NOMES_DIAS_SEMANA.index(nome)
+            for nome, in db.session.query(DiaSemana.nome).filter(DiaSemana.ativo == False)
+            if nome in NOMES_DIAS_SEMANA
+        }
+        return montar_semana(
+            db.session.query(
+                HorarioFuncionamento.barbeiro_id, HorarioFuncionamento.dia_semana,
+                HorarioFuncionamento.hora_inicio, HorarioFuncionamento.hora_fim
+            ).join(Barbeiro).filter(Barbeiro.ativo == True),
+            dias_fechados
+        )
+    
+    return cache_horarios.obter('semana', carregar)
+
+
+# Função para obter o expediente de um barbeiro numa data
+def expediente_barbeiro(barbeiro_id, data):
+    """Devolve o expediente (inicio, fim) em minutos, ou None se o barbeiro não atender na data."""
+    semana = obter_semana_barbeiros().get(barbeiro_id)
+    return semana[data.weekday()] if semana else None
+
+
+# Função para obter o índice das exceções de horário ainda em vigor
+def obter_indice_excecoes():
+    def carregar():
+        return IndiceExcecoes(
+            (
+                barbeiro_id, data_inicio, data_fim,
+                hora_para_minutos(hora_inicio) if hora_inicio else 0,
+                hora_para_minutos(hora_fim) if hora_fim else MINUTOS_POR_DIA
+            )
+            for barbeiro_id, data_inicio, data_fim, hora_inicio, hora_fim in db.session.query(
+                ExcecaoHorario.barbeiro_id, ExcecaoHorario.data_inicio, ExcecaoHorario.data_fim,
+                ExcecaoHorario.hora_inicio, ExcecaoHorario.hora_fim
+            ).filter(ExcecaoHorario.data_fim >= datetime.now().date())
+        )
+    
+    return cache_horarios.obter('excecoes', carregar)
+
+
+# Função para obter os intervalos bloqueados por exceções para um barbeiro numa data
+def excecoes_barbeiro(barbeiro_id, data):
+    """Devolve os intervalos (em minutos) bloqueados por folgas, feriados ou pausas."""
+    return obter_indice_excecoes().intervalos(barbeiro_id, data)
+
+
+# Função para descartar o modelo semanal e as exceções após alterar horários ou barbeiros
+def invalidar_horarios():
+    cache_horarios.limpar()
+
+
+# Função para obter os intervalos ocupados de um barbeiro numa data
+def buscar_intervalos_ocupados(barbeiro_id, data, excluir_agendamento_id=None):
+    """Devolve os intervalos ocupados (em minutos), ordenados e mesclados."""
+    def carregar():
+        # Selecionar apenas as colunas de horário, sem carregar objetos completos
+        linhas = tuple(
+            (agendamento_id, hora_para_minutos(hora_inicio), hora_para_minutos(hora_fim))
+            for agendamento_id, hora_inicio, hora_fim in db.session.query(
+                Agendamento.id, Agendamento.hora_inicio, Agendamento.hora_fim
+            ).filter(
+                Agendamento.barbeiro_id == barbeiro_id,
+                Agendamento.data == data,
+                Agendamento.status.in_(STATUS_OCUPADOS)
+            )
+        )
+        return linhas, mesclar_intervalos((inicio, fim) for _, inicio, fim in linhas)
+    
+    linhas, ocupados = cache_ocupacao.obter((barbeiro_id, data), carregar)
+    
+    if excluir_agendamento_id is not None:
+        return mesclar_intervalos(
+            (inicio, fim) for agendamento_id, inicio, fim in linhas
+            if agendamento_id != excluir_agendamento_id
+        )
+    
+    return ocupados
+
+
+# Função para invalidar o cache de ocupação após alterar agendamentos
+def invalidar_ocupacao(*agendamentos):
+    """Remove do cache a ocupação (barbeiro, data) de cada agendamento indicado."""
+    for barbeiro_id, data in agendamentos:
+        cache_ocupacao.invalidar((barbeiro_id, data))
+
+
+# Função para invalidar o cache de ocupação de um barbeiro (ou de todos)
+def invalidar_ocupacao_barbeiro(barbeiro_id=None):
+    """Remove do cache a ocupação de todas as datas do barbeiro, ou de todos os barbeiros."""
+    if barbeiro_id is None:
+        cache_ocupacao.limpar()
+    else:
+        cache_ocupacao.invalidar_se(lambda chave: chave[0] == barbeiro_id)
+
+
+# Locks para serializar, dentro do processo, as reservas de um mesmo barbeiro e data
+LOCKS_RESERVA = [threading.Lock() for _ in range(64)]
+
+
+# Contexto para verificar conflitos e gravar um agendamento de forma atómica
+@contextmanager
+def reserva_exclusiva(barbeiro_id, *datas):
+    """
+    Serializa a verificação de conflitos e a gravação de agendamentos.
+
+    Dentro do processo, um lock por (barbeiro, data) evita corridas entre
+    threads. No SQLite, BEGIN IMMEDIATE obtém o lock de escrita antes da
+    verificação, pelo que as reservas de outros processos aguardam o commit.
+    No PostgreSQL, um advisory lock por (barbeiro, data), libertado no fim
+    da transação, faz o mesmo entre processos e servidores, sem bloquear as
+    reservas de outros barbeiros. A transação é sempre terminada à saída do
+    bloco.
+
+    Com várias datas (séries recorrentes), os locks são obtidos por ordem
+    do índice, para que duas reservas nunca esperem uma pela outra.
+    """
+    indices = sorted({hash((int(barbeiro_id), data)) % len(LOCKS_RESERVA) for data in datas})
+    with ExitStack() as locks:
+        for indice in indices:
+            locks.enter_context(LOCKS_RESERVA[indice])
+        try:
+            dialeto = db.engine.dialect.name
+            if dialeto == 'sqlite':
+                db.session.execute(text('BEGIN IMMEDIATE'))
+            elif dialeto == 'postgresql':
+                for chave in sorted({(int(barbeiro_id) << 32) | data.toordinal() for data in datas}):
+                    db.session.execute(text('SELECT pg_advisory_xact_lock(:chave)'), {'chave': chave})
+            yield
+        finally:
+            # Sem efeito após um commit; caso contrário liberta o lock de escrita
+            db.session.rollback()
+
+
+# Código de erro do PostgreSQL quando uma restrição EXCLUDE recusa uma linha
+CODIGO_VIOLACAO_EXCLUSAO = '23P01'
+
+
+# Função para reconhecer um agendamento recusado pela restrição de sobreposição do PostgreSQL
+def violacao_sobreposicao(erro):
+    """
+    A restrição agendamentos_sem_sobreposicao só existe no PostgreSQL e é a
+    última defesa contra reservas sobrepostas; com reserva_exclusiva e
+    existe_conflito não deve ser acionada.
+    """
+    return getattr(erro.orig, 'pgcode', None) == CODIGO_VIOLACAO_EXCLUSAO
+
+
+# Função para verificar se um intervalo conflita com agendamentos existentes
+def existe_conflito(barbeiro_id, data, hora_inicio, hora_fim, excluir_agendamento_id=None):
+    """
+    Indica se o intervalo se sobrepõe a uma exceção de horário ou a algum
+    agendamento ativo do barbeiro na data, contando o tempo de preparação
+    antes e depois de cada atendimento.
+    """
+    # As exceções (folgas, feriados, pausas) estão em memória: verificar antes da consulta
+    if not intervalo_livre(hora_para_minutos(hora_inicio), hora_para_minutos(hora_fim),
+                           excecoes_barbeiro(barbeiro_id, data)):
+        return True
+    
+    preparacao = regras_agendamento().preparacao
+    if preparacao:
+        hora_inicio = minutos_para_hora(max(hora_para_minutos(hora_inicio) - preparacao, 0))
+        hora_fim = minutos_para_hora(min(hora_para_minutos(hora_fim) + preparacao, 23 * 60 + 59))
+    
+    query = Agendamento.query.filter(
+        Agendamento.barbeiro_id == barbeiro_id,
+        Agendamento.data == data,
+        Agendamento.status.in_(STATUS_OCUPADOS),
+        Agendamento.hora_inicio < hora_fim,
+        Agendamento.hora_fim > hora_inicio
+    )
+    
+    if excluir_agendamento_id is not None:
+        query = query.filter(Agendamento.id != excluir_agendamento_id)
+    
+    return db.session.query(query.exists()).scalar()
+
+
+# Função para sugerir horários livres próximos de um horário pedido
+def sugerir_horarios_alternativos(barbeiro_id, data, duracao, hora_inicio, limite=3, excluir_agendamento_id=None,
+                                  publico=False):
+    """
+    Devolve até `limite` horários livres, os mais próximos do horário pedido.
+    Com `publico`, respeita também a antecedência mínima exigida aos clientes.
+    """
+    expediente = expediente_barbeiro(barbeiro_id, data)
+    if not expediente:
+        return []
+    
+    # Garantir que a sugestão usa a ocupação atual e não a guardada em cache
+    invalidar_ocupacao((barbeiro_id, data))
+    ocupados = buscar_intervalos_ocupados(barbeiro_id, data, excluir_agendamento_id=excluir_agendamento_id)
+    
+    regras = regras_agendamento()
+    agora = datetime.now()
+    if publico:
+        minimo_inicio = minimo_inicio_na_data(data, agora, regras)
+    else:
+        minimo_inicio = hora_para_minutos(agora.time()) + 1 if data == agora.date() else None
+    livres = calcular_horarios_livres(
+        expediente[0], expediente[1], duracao, ocupados,
+        passo=regras.passo, minimo_inicio=minimo_inicio, preparacao=regras.preparacao,
+        bloqueados=excecoes_barbeiro(barbeiro_id, data)
+    )
+    
+    pedido = hora_para_minutos(hora_inicio)
+    proximos = sorted(livres, key=lambda horario: (abs(horario[0] - pedido), horario[0]))[:limite]
+    return formatar_horarios(sorted(proximos))
+
+
+# Função para montar a resposta de conflito com horários alternativos
+def resposta_conflito(barbeiro_id, data, duracao, hora_inicio, excluir_agendamento_id=None, publico=False):
+    return jsonify({
+        'status': 'error',
+        'message': 'Este horário já não está disponível.',
+        'horarios_alternativos': sugerir_horarios_alternativos(
+            barbeiro_id, data, duracao, hora_inicio, excluir_agendamento_id=excluir_agendamento_id,
+            publico=publico
+        )
+    }), 409
+
+
+# Função para calcular a disponibilidade de todos os barbeiros ativos numa data
+def calcular_horarios_equipe(data, servico, regras, minimo_inicio=None):
+    """
+    Devolve os horários livres da equipe, cada um com a lista de barbeiros
+    disponíveis (os menos ocupados no dia primeiro).
+    """
+    # Expediente de todos os barbeiros ativos neste dia da semana, a partir do modelo em memória
+    dia_semana = data.weekday()
+    expedientes = {
+        barbeiro_id: semana[dia_semana]
+        for barbeiro_id, semana in obter_semana_barbeiros().items()
+        if semana[dia_semana]
+    }
+    
+    if not expedientes:
+        return []
+    
+    # Agendamentos de toda a equipe nesta data, agrupados por barbeiro
+    ocupados_por_barbeiro = agrupar_intervalos(
+        db.session.query(Agendamento.barbeiro_id, Agendamento.hora_inicio, Agendamento.hora_fim).filter(
+            Agendamento.barbeiro_id.in_(list(expedientes)),
+            Agendamento.data == data,
+            Agendamento.status.in_(STATUS_OCUPADOS)
+        )
+    )
+    
+    # Ordenar os barbeiros pelo tempo já ocupado, para distribuir os atendimentos
+    def minutos_ocupados(barbeiro_id):
+        return sum(fim - inicio for inicio, fim in ocupados_por_barbeiro.get(barbeiro_id, []))
+    
+    horarios = {}
+    for barbeiro_id in sorted(expedientes, key=lambda b: (minutos_ocupados(b), b)):
+        inicio_expediente, fim_expediente = expedientes[barbeiro_id]
+        for horario in calcular_horarios_livres(
+            inicio_expediente, fim_expediente, servico.duracao_minutos,
+            ocupados_por_barbeiro.get(barbeiro_id, []),
+            passo=regras.passo, minimo_inicio=minimo_inicio, preparacao=regras.preparacao,
+            bloqueados=excecoes_barbeiro(barbeiro_id, data)
+        ):
+            horarios.setdefault(horario, []).append(barbeiro_id)
+    
+    horarios_ordenados = sorted(horarios)
+    return [
+        dict(formatado, barbeiros=horarios[horario])
+        for horario, formatado in zip(horarios_ordenados, formatar_horarios(horarios_ordenados))
+    ]
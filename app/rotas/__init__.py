@@ -0,0 +1,31 @@
+"""
+Blueprints da aplicação, registados por create_app (app/app.py):
+
+- publico: página de agendamento, login e /agendar;
+- admin: painel, agenda, cadastros, horários e alterações de agendamentos;
+- api: horários disponíveis, busca de clientes e estatísticas dos caches;
+- relatorios: relatório financeiro e exportações CSV.
+
+Cada módulo só é importado quando o seu blueprint é registado.
+"""
+
+from datetime import datetime
+
+
+# Função para gerar o cursor de paginação (data_hora_id) de um agendamento
+def cursor_agendamento(agendamento):
+    return f"{agendamento.data.strftime('%Y-%m-%d')}_{agendamento.hora_inicio.strftime('%H:%M')}_{agendamento.id}"
+
+
+# Função para ler um cursor de paginação gerado por cursor_agendamento
+def ler_cursor_agendamento(cursor):
+    """Devolve (data, hora, id) do cursor, ou None se for inválido."""
+    try:
+        data, hora, agendamento_id = cursor.split('_')
+        return (
+            datetime.strptime(data, '%Y-%m-%d').date(),
+            datetime.strptime(hora, '%H:%M').time(),
+            int(agendamento_id)
+        )
+    except (AttributeError, ValueError):
+        return None
@@ -0,0 +1,2004 @@
+"""
+Rotas do painel administrativo: dashboard, agenda, serviços, configurações,
+barbeiros, clientes, horários e exceções, e as alterações de agendamentos
+(troca, confirmação, cancelamento, reagendamento, conclusão, lote e séries).
+"""
+
+from datetime import datetime, time, timedelta
+import os
+
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy import func, and_, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, contains_eager
+from sqlalchemy.orm.exc import StaleDataError
+from werkzeug.utils import secure_filename
+
+try:
+    from app.modelos import (db, Agendamento, Barbeiro, Cliente, Configuracao, DiaSemana, ExcecaoHorario,
+                             FaturacaoDiaria, HorarioFuncionamento, Servico, NOMES_DIAS_SEMANA)
+    from app.disponibilidade import (STATUS_OCUPADOS, hora_para_minutos, minutos_para_hora, expediente_em_minutos,
+                                     MINUTOS_POR_DIA, intervalo_livre, agrupar_intervalos, aplicar_preparacao)
+    from app.recorrencia import expandir_recorrencia
+    from app.configuracao import obter_configuracao, salvar_configuracao, regras_agendamento
+    from app.faturacao import normalizar_metodo_pagamento, registrar_faturacao, ajustar_faturacao_lote
+    from app.reservas import (criar_horarios_padrao, expediente_barbeiro, excecoes_barbeiro, invalidar_horarios,
+                              invalidar_ocupacao, invalidar_ocupacao_barbeiro, reserva_exclusiva,
+                              violacao_sobreposicao, existe_conflito, sugerir_horarios_alternativos,
+                              resposta_conflito, versao_confere, resposta_versao_desatualizada)
+    from app.clientes import filtro_busca_clientes, validar_celular
+    from app.rotas import cursor_agendamento, ler_cursor_agendamento
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import (db, Agendamento, Barbeiro, Cliente, Configuracao, DiaSemana, ExcecaoHorario,
+                         FaturacaoDiaria, HorarioFuncionamento, Servico, NOMES_DIAS_SEMANA)
+    from disponibilidade import (STATUS_OCUPADOS, hora_para_minutos, minutos_para_hora, expediente_em_minutos,
+                                 MINUTOS_POR_DIA, intervalo_livre, agrupar_intervalos, aplicar_preparacao)
+    from recorrencia import expandir_recorrencia
+    from configuracao import obter_configuracao, salvar_configuracao, regras_agendamento
+    from faturacao import normalizar_metodo_pagamento, registrar_faturacao, ajustar_faturacao_lote
+    from reservas import (criar_horarios_padrao, expediente_barbeiro, excecoes_barbeiro, invalidar_horarios,
+                          invalidar_ocupacao, invalidar_ocupacao_barbeiro, reserva_exclusiva,
+                          violacao_sobreposicao, existe_conflito, sugerir_horarios_alternativos,
+                          resposta_conflito, versao_confere, resposta_versao_desatualizada)
+    from clientes import filtro_busca_clientes, validar_celular
+    from rotas import cursor_agendamento, ler_cursor_agendamento
+
+
+# Blueprint do painel administrativo (as rotas mantêm os caminhos /admin/..., /agenda e /agendamento/...)
+bp = Blueprint('admin', __name__)
+
+
+# Criar a pasta de uploads quando o blueprint é registado, e não ao importar a aplicação
+@bp.record_once
+def criar_pasta_uploads(estado):
+    os.makedirs(estado.app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+
+# Períodos disponíveis nos gráficos do dashboard, em dias
+PERIODOS_DASHBOARD = (7, 30, 90)
+
+
+# Rota de dashboard
+@bp.route('/admin/dashboard')
+@login_required
+def admin_dashboard():
+    # Período dos gráficos, em dias (7, 30 ou 90)
+    dias = request.args.get('dias', 7, type=int)
+    if dias not in PERIODOS_DASHBOARD:
+        dias = 7
+    
+    import locale
+    
+    # Configurar locale para formato de data em português
+    try:
+        locale.setlocale(locale.LC_TIME, 'pt_PT.UTF-8')
+    except:
+        try:
+            locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
+        except:
+            pass  # Se não conseguir definir o locale, usa o padrão
+    
+    # Data atual e data de início do período (incluindo hoje)
+    hoje = datetime.now().date()
+    data_inicio = hoje - timedelta(days=dias - 1)
+    
+    # Faturação por dia do período, lida da tabela de faturação diária
+    faturacao_por_dia = dict(
+        db.session.query(FaturacaoDiaria.data, func.sum(FaturacaoDiaria.valor_total))
+        .filter(
+            FaturacaoDiaria.data >= data_inicio,
+            FaturacaoDiaria.data <= hoje
+        )
+        .group_by(FaturacaoDiaria.data)
+        .all()
+    )
+    
+    # Listas com as datas (ex: "Seg, 01/09") e os valores de faturação, incluindo dias sem vendas
+    datas_faturacao = []
+    valores_faturacao = []
+    for i in range(dias):
+        data = data_inicio + timedelta(days=i)
+        datas_faturacao.append(data.strftime('%a, %d/%m'))
+        valores_faturacao.append(round(faturacao_por_dia.get(data) or 0, 2))
+    
+    # Popularidade dos serviços ativos no período, numa única consulta agrupada
+    popularidade = (
+        db.session.query(Servico.nome, func.count(Agendamento.id))
+        .join(Agendamento, Agendamento.servico_id == Servico.id)
+        .filter(
+            Servico.ativo == True,
+            Agendamento.data >= data_inicio,
+            Agendamento.data <= hoje
+        )
+        .group_by(Servico.id, Servico.nome)
+        .order_by(Servico.id)
+        .all()
+    )
+    nomes_servicos = [nome for nome, _ in popularidade]
+    contagens_servicos = [contagem for _, contagem in popularidade]
+    
+    # Estatísticas adicionais para o dashboard
+    agendamentos_hoje = db.session.query(func.count(Agendamento.id)).filter(Agendamento.data == hoje).scalar()
+    total_clientes = db.session.query(func.count(Cliente.id)).scalar()
+    
+    # Calcular faturação total (todos os agendamentos concluídos)
+    faturacao_total = db.session.query(func.sum(FaturacaoDiaria.valor_total)).scalar() or 0
+    
+    # Renderizar o template com os dados calculados
+    return render_template(
+        'admin_dashboard.html',
+        dias=dias,
+        periodos=PERIODOS_DASHBOARD,
+        datas_faturacao=datas_faturacao,
+        valores_faturacao=valores_faturacao,
+        nomes_servicos=nomes_servicos,
+        contagens_servicos=contagens_servicos,
+        agendamentos_hoje=agendamentos_hoje,
+        total_clientes=total_clientes,
+        faturacao_total=round(faturacao_total, 2)
+    )
+
+
+# Dias antes e depois de hoje mostrados por padrão na agenda
+JANELA_AGENDA_DIAS = 7
+# Número de agendamentos por página na agenda
+REGISTROS_POR_PAGINA_AGENDA = 100
+
+
+# Rota da agenda
+@bp.route('/agenda')
+@login_required
+def agenda():
+    # Obter parâmetros de filtro
+    nome_cliente = request.args.get('nome_cliente', '')
+    
+    # Janela de datas: por padrão, de uma semana antes a uma semana depois de hoje
+    hoje = datetime.now().date()
+    try:
+        data_inicio = datetime.strptime(request.args['data_inicio'], '%Y-%m-%d').date() \
+            if request.args.get('data_inicio') else hoje - timedelta(days=JANELA_AGENDA_DIAS)
+        data_fim = datetime.strptime(request.args['data_fim'], '%Y-%m-%d').date() \
+            if request.args.get('data_fim') else hoje + timedelta(days=JANELA_AGENDA_DIAS)
+    except ValueError:
+        flash('Formato de data inválido. Use o formato YYYY-MM-DD.', 'danger')
+        return redirect(url_for('admin.agenda'))
+    
+    # Iniciar a consulta base, carregando cliente, barbeiro e serviço na mesma consulta
+    query = Agendamento.query.join(Cliente, Agendamento.cliente_id == Cliente.id).options(
+        contains_eager(Agendamento.cliente),
+        joinedload(Agendamento.barbeiro),
+        joinedload(Agendamento.servico)
+    ).filter(
+        Agendamento.data >= data_inicio,
+        Agendamento.data <= data_fim
+    )
+    
+    # Aplicar filtro de nome de cliente se fornecido
+    filtro_cliente = filtro_busca_clientes(nome_cliente) if nome_cliente else None
+    if filtro_cliente is not None:
+        query = query.filter(filtro_cliente)
+    
+    # Continuar a partir do último agendamento da página anterior
+    apos = request.args.get('apos')
+    cursor = ler_cursor_agendamento(apos) if apos else None
+    if cursor:
+        cursor_data, cursor_hora, cursor_id = cursor
+        query = query.filter(or_(
+            Agendamento.data > cursor_data,
+            and_(Agendamento.data == cursor_data, or_(
+                Agendamento.hora_inicio > cursor_hora,
+                and_(Agendamento.hora_inicio == cursor_hora, Agendamento.id > cursor_id)
+            ))
+        ))
+    
+    # Ordenados por data e hora, para o template agrupar os agendamentos de cada dia em sequência
+    agendamentos = query.order_by(
+        Agendamento.data, Agendamento.hora_inicio, Agendamento.id
+    ).limit(REGISTROS_POR_PAGINA_AGENDA + 1).all()
+    
+    # O registro extra indica se existe uma próxima página
+    proximo_cursor = None
+    if len(agendamentos) > REGISTROS_POR_PAGINA_AGENDA:
+        agendamentos = agendamentos[:REGISTROS_POR_PAGINA_AGENDA]
+        proximo_cursor = cursor_agendamento(agendamentos[-1])
+    
+    # Renderizar o template com os agendamentos da página e os filtros aplicados
+    return render_template(
+        'agenda.html',
+        agendamentos=agendamentos,
+        nome_cliente=nome_cliente,
+        data_inicio=data_inicio.strftime('%Y-%m-%d'),
+        data_fim=data_fim.strftime('%Y-%m-%d'),
+        proximo_cursor=proximo_cursor,
+        primeira_pagina=cursor is None
+    )
+
+
+# Rotas para gerenciamento de serviços
+@bp.route('/admin/servicos')
+@login_required
+def admin_servicos():
+    # Buscar todos os serviços
+    servicos = Servico.query.all()
+    
+    return render_template('admin_servicos.html', servicos=servicos)
+
+
+@bp.route('/admin/servicos/adicionar', methods=['POST'])
+@login_required
+def admin_servicos_adicionar():
+    # Obter dados do formulário
+    nome = request.form.get('nome')
+    descricao = request.form.get('descricao')
+    preco = request.form.get('preco')
+    duracao_minutos = request.form.get('duracao_minutos')
+    
+    # Validar dados
+    if not nome or not preco or not duracao_minutos:
+        flash('Por favor, preencha todos os campos obrigatórios.', 'danger')
+        return redirect(url_for('admin.admin_servicos'))
+    
+    try:
+        # Converter para os tipos corretos
+        preco = float(preco)
+        duracao_minutos = int(duracao_minutos)
+        
+        # Processar o upload da imagem
+        imagem_url = None
+        imagem_file = request.files.get('imagem')
+        if imagem_file and imagem_file.filename:
+            try:
+                # Garantir que o nome do arquivo seja seguro
+                filename = secure_filename(imagem_file.filename)
+                # Criar um nome único para o arquivo
+                unique_filename = f"servico_{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
+                # Criar diretório para imagens de serviços se não existir
+                servicos_upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'servicos')
+                os.makedirs(servicos_upload_path, exist_ok=True)
+                # Definir o caminho para salvar o arquivo
+                filepath = os.path.join(servicos_upload_path, unique_filename)
+                # Salvar o arquivo
+                imagem_file.save(filepath)
+                # Atualizar a URL da imagem (caminho relativo para uso com url_for)
+                imagem_url = f"uploads/servicos/{unique_filename}"
+            except Exception as e:
+                flash(f'Erro ao fazer upload da imagem: {str(e)}', 'danger')
+        
+        # Criar novo serviço
+        novo_servico = Servico(
+            nome=nome,
+            descricao=descricao,
+            preco=preco,
+            duracao_minutos=duracao_minutos,
+            ativo=True,
+            imagem_url=imagem_url
+        )
+        
+        # Adicionar ao banco de dados
+        db.session.add(novo_servico)
+        db.session.commit()
+        
+        flash(f'Serviço "{nome}" adicionado com sucesso!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Erro ao adicionar serviço: {str(e)}', 'danger')
+    
+    return redirect(url_for('admin.admin_servicos'))
+
+
+@bp.route('/admin/servicos/editar/<int:id>', methods=['GET', 'POST'])
+@login_required
+def admin_servicos_editar(id):
+    # Buscar o serviço pelo ID
+    servico = Servico.query.get_or_404(id)
+    
+    if request.method == 'POST':
+        # Obter dados do formulário
+        nome = request.form.get('nome')
+        descricao = request.form.get('descricao')
+        preco = request.form.get('preco')
+        duracao_minutos = request.form.get('duracao_minutos')
+        ativo = 'ativo' in request.form
+        
+        # Validar dados
+        if not nome or not preco or not duracao_minutos:
+            flash('Por favor, preencha todos os campos obrigatórios.', 'danger')
+            return render_template('admin_servicos_editar.html', servico=servico)
+        
+        try:
+            # Processar o upload da imagem
+            imagem_file = request.files.get('imagem')
+            if imagem_file and imagem_file.filename:
+                try:
+                    # Garantir que o nome do arquivo seja seguro
+                    filename = secure_filename(imagem_file.filename)
+                    # Criar um nome único para o arquivo
+                    unique_filename = f"servico_{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
+                    # Criar diretório para imagens de serviços se não existir
+                    servicos_upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'servicos')
+                    os.makedirs(servicos_upload_path, exist_ok=True)
+                    # Definir o caminho para salvar o arquivo
+                    filepath = os.path.join(servicos_upload_path, unique_filename)
+                    # Salvar o arquivo
+                    imagem_file.save(filepath)
+                    # Atualizar a URL da imagem (caminho relativo para uso com url_for)
+                    servico.imagem_url = f"uploads/servicos/{unique_filename}"
+                except Exception as e:
+                    flash(f'Erro ao fazer upload da imagem: {str(e)}', 'danger')
+            
+            # Atualizar serviço
+            servico.nome = nome
+            servico.descricao = descricao
+            servico.preco = float(preco)
+            servico.duracao_minutos = int(duracao_minutos)
+            servico.ativo = ativo
+            
+            # Salvar alterações
+            db.session.commit()
+            
+            flash(f'Serviço "{nome}" atualizado com sucesso!', 'success')
+            return redirect(url_for('admin.admin_servicos'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao atualizar serviço: {str(e)}', 'danger')
+    
+    # Renderizar formulário de edição
+    return render_template('admin_servicos_editar.html', servico=servico)
+
+
+@bp.route('/admin/servicos/apagar/<int:id>', methods=['POST'])
+@login_required
+def admin_servicos_apagar(id):
+    # Buscar o serviço pelo ID
+    servico = Servico.query.get_or_404(id)
+    
+    try:
+        # Verificar se o serviço está sendo usado em algum agendamento
+        agendamentos = Agendamento.query.filter_by(servico_id=id).count()
+        
+        if agendamentos > 0:
+            # Se estiver sendo usado, apenas marcar como inativo
+            servico.ativo = False
+            db.session.commit()
+            flash(f'O serviço "{servico.nome}" foi desativado pois possui agendamentos associados.', 'warning')
+        else:
+            # Se não estiver sendo usado, remover do banco de dados
+            nome_servico = servico.nome
+            db.session.delete(servico)
+            db.session.commit()
+            flash(f'Serviço "{nome_servico}" removido com sucesso!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Erro ao remover serviço: {str(e)}', 'danger')
+    
+    return redirect(url_for('admin.admin_servicos'))
+
+
+# Rotas para gerenciar barbeiros
+# Redirecionar a rota antiga para a nova
+@bp.route('/admin/configuracoes')
+def admin_configuracoes():
+    return redirect(url_for('admin.admin_config_gerais'))
+
+@bp.route('/admin/configuracoes/gerais', methods=['GET', 'POST'])
+@login_required
+def admin_config_gerais():
+    # Buscar a configuração atual (a cópia em cache basta para mostrar o formulário)
+    config = obter_configuracao()
+    
+    if request.method == 'POST':
+        # Para alterar, é preciso o registro da base de dados
+        config = Configuracao.query.order_by(Configuracao.id).first()
+        
+        # Obter dados do formulário
+        nome_barbearia = request.form.get('nome_barbearia')
+        cor_primaria = request.form.get('cor_primaria')
+        
+        # Verificar se foi enviado um novo logo
+        logo_file = request.files.get('logo')
+        logo_url = config.logo_url  # Manter o logo atual por padrão
+        
+        if logo_file and logo_file.filename:
+            # Processar o upload do logo
+            try:
+                # Garantir que o nome do arquivo seja seguro
+                filename = secure_filename(logo_file.filename)
+                # Criar um nome único para o arquivo
+                unique_filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
+                # Definir o caminho para salvar o arquivo
+                filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
+                # Salvar o arquivo
+                logo_file.save(filepath)
+                # Atualizar a URL do logo
+                logo_url = f"/static/uploads/{unique_filename}"
+            except Exception as e:
+                flash(f'Erro ao fazer upload do logo: {str(e)}', 'danger')
+        
+        # Verificar se foi enviado um novo favicon
+        favicon_file = request.files.get('favicon')
+        favicon_url = config.favicon_url  # Manter o favicon atual por padrão
+        
+        if favicon_file and favicon_file.filename:
+            # Processar o upload do favicon
+            try:
+                # Garantir que o nome do arquivo seja seguro
+                filename = secure_filename(favicon_file.filename)
+                # Criar um nome único para o arquivo
+                unique_filename = f"favicon_{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
+                # Definir o caminho para salvar o arquivo
+                filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
+                # Salvar o arquivo
+                favicon_file.save(filepath)
+                # Atualizar a URL do favicon
+                favicon_url = f"/static/uploads/{unique_filename}"
+            except Exception as e:
+                flash(f'Erro ao fazer upload do favicon: {str(e)}', 'danger')
+        
+        try:
+            # Atualizar configuração
+            config.nome_barbearia = nome_barbearia
+            config.cor_primaria = cor_primaria
+            if logo_url:
+                config.logo_url = logo_url
+            if favicon_url:
+                config.favicon_url = favicon_url
+            
+            # Atualizar informações de contato
+            config.telefone = request.form.get('telefone')
+            config.endereco = request.form.get('endereco')
+            config.link_instagram = request.form.get('link_instagram')
+            config.link_facebook = request.form.get('link_facebook')
+            config.exibir_redes_sociais = 'exibir_redes_sociais' in request.form
+            
+            # Salvar alterações
+            salvar_configuracao(config)
+            
+            flash('Configurações atualizadas com sucesso!', 'success')
+            return redirect(url_for('admin.admin_config_gerais'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao atualizar configurações: {str(e)}', 'danger')
+    
+    return render_template('admin_config_gerais.html', configuracao=config)
+
+@bp.route('/admin/configuracoes/visual', methods=['GET', 'POST'])
+@login_required
+def admin_config_visual():
+    # Buscar a configuração atual (a cópia em cache basta para mostrar o formulário)
+    config = obter_configuracao()
+    
+    if request.method == 'POST':
+        # Para alterar, é preciso o registro da base de dados
+        config = Configuracao.query.order_by(Configuracao.id).first()
+        
+        try:
+            # Obter dados do formulário
+            cor_secundaria = request.form.get('cor_secundaria')
+            
+            # Atualizar configuração
+            config.cor_secundaria = cor_secundaria
+            
+            # Processar o upload do favicon
+            favicon_file = request.files.get('favicon')
+            if favicon_file and favicon_file.filename:
+                # Verificar se o arquivo é uma imagem válida
+                if favicon_file.filename.split('.')[-1].lower() in ['ico', 'png', 'jpg', 'jpeg']:
+                    # Gerar um nome de arquivo único
+                    filename = secure_filename(favicon_file.filename)
+                    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+                    favicon_filename = f"favicon_{timestamp}_{filename}"
+                    
+                    # Salvar o arquivo
+                    favicon_path = os.path.join('uploads', 'favicon', favicon_filename)
+                    full_path = os.path.join(current_app.static_folder, 'uploads', 'favicon')
+                    
+                    # Criar o diretório se não existir
+                    os.makedirs(full_path, exist_ok=True)
+                    
+                    # Salvar o arquivo
+                    favicon_file.save(os.path.join(current_app.static_folder, favicon_path))
+                    
+                    # Atualizar o caminho no banco de dados
+                    config.favicon_url = favicon_path
+                else:
+                    flash('Formato de arquivo inválido para o favicon. Use .ico, .png, .jpg ou .jpeg.', 'warning')
+            
+            # Salvar alterações
+            salvar_configuracao(config)
+            
+            flash('Configurações visuais atualizadas com sucesso!', 'success')
+            return redirect(url_for('admin.admin_config_visual'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao atualizar configurações visuais: {str(e)}', 'danger')
+    
+    return render_template('admin_config_visual.html', configuracao=config)
+
+@bp.route('/admin/configuracoes/avancadas', methods=['GET', 'POST'])
+@login_required
+def admin_config_avancadas():
+    # Buscar a configuração atual (a cópia em cache basta para mostrar o formulário)
+    config = obter_configuracao()
+    
+    if request.method == 'POST':
+        # Para alterar, é preciso o registro da base de dados
+        config = Configuracao.query.order_by(Configuracao.id).first()
+        
+        try:
+            # Obter dados do formulário
+            antecedencia_minima_horas = request.form.get('antecedencia_minima_horas', type=int)
+            janela_maxima_dias = request.form.get('janela_maxima_dias', type=int)
+            intervalo_slot_minutos = request.form.get('intervalo_slot_minutos', type=int)
+            tempo_preparacao_minutos = request.form.get('tempo_preparacao_minutos', type=int)
+            
+            # Atualizar configuração
+            config.antecedencia_minima_horas = antecedencia_minima_horas
+            config.janela_maxima_dias = janela_maxima_dias
+            config.intervalo_slot_minutos = intervalo_slot_minutos
+            config.tempo_preparacao_minutos = tempo_preparacao_minutos
+            
+            # Salvar alterações
+            salvar_configuracao(config)
+            
+            flash('Regras de agendamento atualizadas com sucesso!', 'success')
+            return redirect(url_for('admin.admin_config_avancadas'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao atualizar regras de agendamento: {str(e)}', 'danger')
+    
+    return render_template('admin_config_avancadas.html', configuracao=config)
+
+
+@bp.route('/admin/configuracoes/integracoes', methods=['GET', 'POST'])
+@login_required
+def admin_config_integracoes():
+    # Buscar a configuração atual (a cópia em cache basta para mostrar o formulário)
+    config = obter_configuracao()
+    
+    if request.method == 'POST':
+        # Para alterar, é preciso o registro da base de dados
+        config = Configuracao.query.order_by(Configuracao.id).first()
+        
+        try:
+            # Obter dados do formulário
+            twilio_account_sid = request.form.get('twilio_account_sid')
+            twilio_auth_token = request.form.get('twilio_auth_token')
+            twilio_whatsapp_number = request.form.get('twilio_whatsapp_number')
+            
+            # Atualizar configuração
+            config.twilio_account_sid = twilio_account_sid
+            config.twilio_auth_token = twilio_auth_token
+            config.twilio_whatsapp_number = twilio_whatsapp_number
+            
+            # Salvar alterações
+            salvar_configuracao(config)
+            
+            flash('Credenciais da Twilio atualizadas com sucesso!', 'success')
+            return redirect(url_for('admin.admin_config_integracoes'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao atualizar credenciais da Twilio: {str(e)}', 'danger')
+    
+    return render_template('admin_config_integracoes.html', configuracao=config)
+
+
+@bp.route('/admin/barbeiros')
+@login_required
+def admin_barbeiros():
+    # Buscar todos os barbeiros
+    barbeiros = Barbeiro.query.all()
+    
+    return render_template('admin_barbeiros.html', barbeiros=barbeiros)
+
+
+@bp.route('/admin/barbeiros/adicionar', methods=['POST'])
+@login_required
+def admin_barbeiros_adicionar():
+    # Obter dados do formulário
+    nome = request.form.get('nome')
+    especialidade = request.form.get('especialidade')
+    foto = request.files.get('foto')
+    
+    # Validar dados
+    if not nome:
+        flash('Por favor, preencha o nome do barbeiro.', 'danger')
+        return redirect(url_for('admin.admin_barbeiros'))
+    
+    try:
+        # Criar novo barbeiro
+        novo_barbeiro = Barbeiro(
+            nome=nome,
+            sobrenome='',  # Campo obrigatório no modelo, mas não no formulário
+            email=f'{nome.lower().replace(" ", "")}@barbearia.com',  # Email temporário
+            telefone='',
+            especialidade=especialidade,
+            ativo=True
+        )
+        
+        # Processar upload de foto, se fornecida
+        if foto and foto.filename:
+            # Verificar se é uma imagem válida
+            if foto.filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
+                # Criar nome de arquivo seguro
+                filename = secure_filename(foto.filename)
+                # Adicionar timestamp para evitar conflitos de nomes
+                filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
+                # Definir caminho para salvar
+                filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], 'barbeiros', filename)
+                # Salvar arquivo
+                foto.save(filepath)
+                # Atualizar caminho relativo no banco de dados
+                novo_barbeiro.foto_url = f"uploads/barbeiros/{filename}"
+            else:
+                flash('Formato de arquivo não permitido. Use JPG, PNG ou GIF.', 'warning')
+        
+        # Adicionar ao banco de dados, já com o horário padrão da semana
+        db.session.add(novo_barbeiro)
+        db.session.flush()
+        criar_horarios_padrao(novo_barbeiro.id)
+        db.session.commit()
+        invalidar_horarios()
+        
+        flash(f'Barbeiro "{nome}" adicionado com sucesso!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Erro ao adicionar barbeiro: {str(e)}', 'danger')
+    
+    return redirect(url_for('admin.admin_barbeiros'))
+
+
+@bp.route('/admin/barbeiros/editar/<int:id>', methods=['GET', 'POST'])
+@login_required
+def admin_barbeiros_editar(id):
+    # Buscar o barbeiro pelo ID
+    barbeiro = Barbeiro.query.get_or_404(id)
+    
+    if request.method == 'POST':
+        # Obter dados do formulário
+        nome = request.form.get('nome')
+        especialidade = request.form.get('especialidade')
+        ativo = 'ativo' in request.form
+        foto = request.files.get('foto')
+        
+        # Validar dados
+        if not nome:
+            flash('Por favor, preencha o nome do barbeiro.', 'danger')
+            return render_template('admin_barbeiros_editar.html', barbeiro=barbeiro)
+        
+        try:
+            # Atualizar barbeiro
+            barbeiro.nome = nome
+            barbeiro.especialidade = especialidade
+            barbeiro.ativo = ativo
+            
+            # Processar upload de foto, se fornecida
+            if foto and foto.filename:
+                # Verificar se é uma imagem válida
+                if foto.filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
+                    # Criar nome de arquivo seguro
+                    filename = secure_filename(foto.filename)
+                    # Adicionar timestamp para evitar conflitos de nomes
+                    filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
+                    # Definir caminho para salvar
+                    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], 'barbeiros', filename)
+                    # Salvar arquivo
+                    foto.save(filepath)
+                    # Atualizar caminho relativo no banco de dados
+                    barbeiro.foto_url = f"uploads/barbeiros/{filename}"
+                else:
+                    flash('Formato de arquivo não permitido. Use JPG, PNG ou GIF.', 'warning')
+            
+            # Salvar alterações (o estado ativo altera o modelo semanal de horários)
+            db.session.commit()
+            invalidar_horarios()
+            
+            flash(f'Barbeiro "{nome}" atualizado com sucesso!', 'success')
+            return redirect(url_for('admin.admin_barbeiros'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao atualizar barbeiro: {str(e)}', 'danger')
+    
+    # Renderizar formulário de edição
+    return render_template('admin_barbeiros_editar.html', barbeiro=barbeiro)
+
+
+@bp.route('/admin/barbeiros/apagar/<int:id>', methods=['POST'])
+@login_required
+def admin_barbeiros_apagar(id):
+    # Buscar o barbeiro pelo ID
+    barbeiro = Barbeiro.query.get_or_404(id)
+    
+    try:
+        # Verificar se o barbeiro está sendo usado em algum agendamento
+        agendamentos = Agendamento.query.filter_by(barbeiro_id=id).count()
+        
+        if agendamentos > 0:
+            # Se estiver sendo usado, apenas marcar como inativo
+            barbeiro.ativo = False
+            db.session.commit()
+            invalidar_horarios()
+            flash(f'O barbeiro "{barbeiro.nome}" foi desativado pois possui agendamentos associados.', 'warning')
+        else:
+            # Se não estiver sendo usado, remover do banco de dados
+            nome_barbeiro = barbeiro.nome
+            HorarioFuncionamento.query.filter_by(barbeiro_id=id).delete()
+            db.session.delete(barbeiro)
+            db.session.commit()
+            invalidar_horarios()
+            flash(f'Barbeiro "{nome_barbeiro}" removido com sucesso!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Erro ao remover barbeiro: {str(e)}', 'danger')
+    
+    return redirect(url_for('admin.admin_barbeiros'))
+
+
+# Número de clientes por página na lista de clientes
+REGISTROS_POR_PAGINA_CLIENTES = 50
+
+
+# Rotas para gerenciar clientes
+@bp.route('/admin/clientes')
+@login_required
+def admin_clientes():
+    # Obter parâmetro de busca, se existir
+    busca = request.args.get('busca', '')
+    
+    # Iniciar a consulta base
+    query = Cliente.query
+    
+    # Filtrar pelo índice de busca, se houver busca
+    filtro = filtro_busca_clientes(busca) if busca else None
+    if filtro is not None:
+        query = query.filter(filtro)
+    
+    # Continuar a partir do último cliente da página anterior (ordem por nome e id)
+    apos = request.args.get('apos', type=int)
+    ultimo = db.session.get(Cliente, apos) if apos else None
+    if ultimo:
+        query = query.filter(or_(
+            Cliente.nome > ultimo.nome,
+            and_(Cliente.nome == ultimo.nome, Cliente.id > ultimo.id)
+        ))
+    
+    clientes = query.order_by(Cliente.nome, Cliente.id).limit(REGISTROS_POR_PAGINA_CLIENTES + 1).all()
+    
+    # O registro extra indica se existe uma próxima página
+    proximo_cursor = None
+    if len(clientes) > REGISTROS_POR_PAGINA_CLIENTES:
+        clientes = clientes[:REGISTROS_POR_PAGINA_CLIENTES]
+        proximo_cursor = clientes[-1].id
+    
+    # Adicionar funções de URL para verificação de segurança no template
+    url_for_security = {
+        'admin_clientes_editar': True,
+        'admin_clientes_apagar': True
+    }
+    
+    return render_template(
+        'admin_clientes.html',
+        clientes=clientes,
+        url_for_security=url_for_security,
+        busca=busca,
+        proximo_cursor=proximo_cursor,
+        primeira_pagina=ultimo is None
+    )
+
+@bp.route('/admin/clientes/adicionar', methods=['POST'])
+@login_required
+def admin_clientes_adicionar():
+    # Obter dados do formulário
+    nome = request.form.get('nome')
+    telefone = request.form.get('telefone')
+    
+    # Validar dados
+    if not nome or not telefone:
+        flash('Por favor, preencha todos os campos obrigatórios.', 'danger')
+        return redirect(url_for('admin.admin_clientes'))
+    
+    # Validar o telefone usando a função existente
+    telefone_valido, mensagem_ou_telefone = validar_celular(telefone)
+    if not telefone_valido:
+        flash(f'Telefone inválido: {mensagem_ou_telefone}', 'danger')
+        return redirect(url_for('admin.admin_clientes'))
+    
+    # Verificar se já existe um cliente com este telefone
+    cliente_existente = Cliente.query.filter_by(telefone=mensagem_ou_telefone).first()
+    if cliente_existente:
+        flash(f'Já existe um cliente cadastrado com este telefone: {cliente_existente.nome} {cliente_existente.sobrenome}', 'warning')
+        return redirect(url_for('admin.admin_clientes'))
+    
+    try:
+        # Separar o nome completo em nome e sobrenome
+        partes_nome = nome.split(' ', 1)
+        primeiro_nome = partes_nome[0]
+        sobrenome = partes_nome[1] if len(partes_nome) > 1 else ''
+        
+        # Criar novo cliente
+        novo_cliente = Cliente(
+            nome=primeiro_nome,
+            sobrenome=sobrenome,
+            email=f'{primeiro_nome.lower()}{sobrenome.lower() if sobrenome else ''}@exemplo.com',  # Email padrão
+            telefone=mensagem_ou_telefone
+        )
+        
+        # Salvar no banco de dados
+        db.session.add(novo_cliente)
+        db.session.commit()
+        
+        flash(f'Cliente {nome} adicionado com sucesso!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Erro ao adicionar cliente: {str(e)}', 'danger')
+    
+    return redirect(url_for('admin.admin_clientes'))
+
+
+# Rotas para gerenciar horários de funcionamento
+@bp.route('/admin/horarios')
+@login_required
+def admin_horarios():
+    # Buscar todos os dias da semana
+    dias = DiaSemana.query.all()
+    
+    # Se não existirem dias cadastrados, criar os 7 dias da semana
+    if not dias:
+        for i, nome in enumerate(NOMES_DIAS_SEMANA):
+            # Horário padrão: 9h às 18h para dias de semana, 9h às 13h para sábado, fechado para domingo
+            if i < 5:  # Segunda a Sexta
+                hora_abertura = datetime.strptime('09:00', '%H:%M').time()
+                hora_fechamento = datetime.strptime('18:00', '%H:%M').time()
+                ativo = True
+            elif i == 5:  # Sábado
+                hora_abertura = datetime.strptime('09:00', '%H:%M').time()
+                hora_fechamento = datetime.strptime('13:00', '%H:%M').time()
+                ativo = True
+            else:  # Domingo
+                hora_abertura = datetime.strptime('00:00', '%H:%M').time()
+                hora_fechamento = datetime.strptime('00:00', '%H:%M').time()
+                ativo = False
+            
+            dia = DiaSemana(nome=nome, hora_abertura=hora_abertura, hora_fechamento=hora_fechamento, ativo=ativo)
+            db.session.add(dia)
+        
+        db.session.commit()
+        invalidar_horarios()
+        dias = DiaSemana.query.all()
+    
+    return render_template('admin_horarios.html', dias=dias)
+
+
+@bp.route('/admin/horarios/editar/<int:id>', methods=['GET', 'POST'])
+@login_required
+def admin_horarios_editar(id):
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        flash('Acesso restrito a administradores.', 'danger')
+        return redirect(url_for('publico.index'))
+    
+    # Buscar o dia pelo ID
+    dia = DiaSemana.query.get_or_404(id)
+    
+    # Se for GET, renderizar o template de edição
+    if request.method == 'GET':
+        return render_template('admin_horarios_editar.html', dia=dia)
+    
+    # Obter os novos horários do formulário
+    hora_abertura = request.form.get('hora_abertura')
+    hora_fechamento = request.form.get('hora_fechamento')
+    
+    try:
+        # Atualizar apenas o campo que foi enviado
+        if hora_abertura:
+            dia.hora_abertura = datetime.strptime(hora_abertura, '%H:%M').time()
+            flash(f'Hora de abertura de {dia.nome} atualizada com sucesso!', 'success')
+        
+        if hora_fechamento:
+            dia.hora_fechamento = datetime.strptime(hora_fechamento, '%H:%M').time()
+            flash(f'Hora de fechamento de {dia.nome} atualizada com sucesso!', 'success')
+        
+        db.session.commit()
+    except ValueError:
+        flash('Formato de horário inválido. Use o formato HH:MM.', 'danger')
+    
+    return redirect(url_for('admin.admin_horarios'))
+
+
+@bp.route('/admin/horarios/alternar-status/<int:id>', methods=['POST'])
+@login_required
+def admin_horarios_alternar_status(id):
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        flash('Acesso restrito a administradores.', 'danger')
+        return redirect(url_for('publico.index'))
+    
+    # Buscar o dia pelo ID
+    dia = DiaSemana.query.get_or_404(id)
+    
+    # Alternar o status
+    dia.ativo = not dia.ativo
+    
+    db.session.commit()
+    invalidar_horarios()
+    
+    status = "aberto" if dia.ativo else "fechado"
+    flash(f'{dia.nome} agora está {status}.', 'success')
+    
+    return redirect(url_for('admin.admin_horarios'))
+
+
+# Rotas para gerenciar horários individuais dos barbeiros
+@bp.route('/admin/horarios_equipe')
+@login_required
+def admin_horarios_equipe():
+    # Buscar todos os barbeiros
+    barbeiros = Barbeiro.query.order_by(Barbeiro.nome).all()
+    
+    return render_template('admin_barbeiros_horarios.html', barbeiros=barbeiros)
+
+
+@bp.route('/admin/horarios/editar_barbeiro/<int:barbeiro_id>', methods=['GET', 'POST'])
+@login_required
+def admin_horarios_editar_barbeiro(barbeiro_id):
+    # Buscar o barbeiro pelo ID
+    barbeiro = Barbeiro.query.get_or_404(barbeiro_id)
+    
+    # Buscar os horários do barbeiro para cada dia da semana
+    horarios = HorarioFuncionamento.query.filter_by(barbeiro_id=barbeiro_id).order_by(HorarioFuncionamento.dia_semana).all()
+    
+    # Barbeiros antigos podem não ter os 7 dias da semana: criar os que faltam
+    if len(horarios) < 7:
+        criar_horarios_padrao(barbeiro_id, [h.dia_semana for h in horarios])
+        db.session.commit()
+        invalidar_horarios()
+        horarios = HorarioFuncionamento.query.filter_by(barbeiro_id=barbeiro_id).order_by(HorarioFuncionamento.dia_semana).all()
+    
+    # Se for POST, processar a atualização de horário
+    if request.method == 'POST':
+        dia_semana = int(request.form.get('dia_semana'))
+        acao = request.form.get('acao')
+        
+        # Buscar o horário específico para o dia da semana
+        horario = HorarioFuncionamento.query.filter_by(barbeiro_id=barbeiro_id, dia_semana=dia_semana).first()
+        
+        if not horario:
+            flash('Horário não encontrado.', 'danger')
+            return redirect(url_for('admin.admin_horarios_editar_barbeiro', barbeiro_id=barbeiro_id))
+        
+        try:
+            if acao == 'hora_inicio':
+                # Atualizar hora de início
+                hora_inicio = request.form.get('hora_inicio')
+                horario.hora_inicio = datetime.strptime(hora_inicio, '%H:%M').time()
+                flash(f'Hora de abertura atualizada com sucesso!', 'success')
+            
+            elif acao == 'hora_fim':
+                # Atualizar hora de fim
+                hora_fim = request.form.get('hora_fim')
+                horario.hora_fim = datetime.strptime(hora_fim, '%H:%M').time()
+                flash(f'Hora de fechamento atualizada com sucesso!', 'success')
+            
+            elif acao == 'alternar_status':
+                # Verificar se está fechado (00:00 - 00:00)
+                fechado = expediente_em_minutos(horario.hora_inicio, horario.hora_fim) is None
+                
+                if fechado:
+                    # Se estiver fechado, abrir com horário padrão
+                    if horario.dia_semana < 5:  # Segunda a Sexta
+                        horario.hora_inicio = datetime.strptime('09:00', '%H:%M').time()
+                        horario.hora_fim = datetime.strptime('18:00', '%H:%M').time()
+                    elif horario.dia_semana == 5:  # Sábado
+                        horario.hora_inicio = datetime.strptime('09:00', '%H:%M').time()
+                        horario.hora_fim = datetime.strptime('13:00', '%H:%M').time()
+                    
+                    flash('Dia aberto com horário padrão.', 'success')
+                else:
+                    # Se estiver aberto, fechar (00:00 - 00:00)
+                    horario.hora_inicio = datetime.strptime('00:00', '%H:%M').time()
+                    horario.hora_fim = datetime.strptime('00:00', '%H:%M').time()
+                    flash('Dia fechado com sucesso.', 'success')
+            
+            db.session.commit()
+            invalidar_ocupacao_barbeiro(barbeiro_id)
+            invalidar_horarios()
+        except ValueError:
+            flash('Formato de horário inválido. Use o formato HH:MM.', 'danger')
+        
+        return redirect(url_for('admin.admin_horarios_editar_barbeiro', barbeiro_id=barbeiro_id))
+    
+    # Renderizar o template com os horários do barbeiro
+    return render_template('admin_horario_individual.html', barbeiro=barbeiro, horarios=horarios)
+
+
+# Rotas para gerenciar exceções de horário (feriados, férias, folgas e pausas)
+@bp.route('/admin/horarios/excecoes')
+@login_required
+def admin_excecoes():
+    # Apenas as exceções ainda em vigor; as passadas já não afetam a agenda
+    hoje = datetime.now().date()
+    excecoes = ExcecaoHorario.query.options(joinedload(ExcecaoHorario.barbeiro)).filter(
+        ExcecaoHorario.data_fim >= hoje
+    ).order_by(ExcecaoHorario.data_inicio, ExcecaoHorario.id).all()
+    
+    barbeiros = Barbeiro.query.filter_by(ativo=True).order_by(Barbeiro.nome).all()
+    
+    return render_template('admin_excecoes.html', excecoes=excecoes, barbeiros=barbeiros, hoje=hoje)
+
+
+@bp.route('/admin/horarios/excecoes/adicionar', methods=['POST'])
+@login_required
+def admin_excecoes_adicionar():
+    # Obter dados do formulário
+    barbeiro_id = request.form.get('barbeiro_id', type=int)  # Vazio: toda a barbearia
+    data_inicio_str = request.form.get('data_inicio')
+    data_fim_str = request.form.get('data_fim') or data_inicio_str
+    hora_inicio_str = request.form.get('hora_inicio')
+    hora_fim_str = request.form.get('hora_fim')
+    motivo = request.form.get('motivo', '').strip()
+    
+    # Validar dados
+    if not data_inicio_str:
+        flash('Por favor, indique a data de início.', 'danger')
+        return redirect(url_for('admin.admin_excecoes'))
+    
+    if bool(hora_inicio_str) != bool(hora_fim_str):
+        flash('Indique as duas horas para bloquear parte do dia, ou nenhuma para bloquear o dia inteiro.', 'danger')
+        return redirect(url_for('admin.admin_excecoes'))
+    
+    try:
+        data_inicio = datetime.strptime(data_inicio_str, '%Y-%m-%d').date()
+        data_fim = datetime.strptime(data_fim_str, '%Y-%m-%d').date()
+        hora_inicio = datetime.strptime(hora_inicio_str, '%H:%M').time() if hora_inicio_str else None
+        hora_fim = datetime.strptime(hora_fim_str, '%H:%M').time() if hora_fim_str else None
+    except ValueError:
+        flash('Formato de data ou hora inválido.', 'danger')
+        return redirect(url_for('admin.admin_excecoes'))
+    
+    if data_fim < data_inicio:
+        flash('A data de fim não pode ser anterior à data de início.', 'danger')
+        return redirect(url_for('admin.admin_excecoes'))
+    
+    if hora_inicio and hora_fim <= hora_inicio:
+        flash('A hora de fim deve ser posterior à hora de início.', 'danger')
+        return redirect(url_for('admin.admin_excecoes'))
+    
+    if barbeiro_id and not Barbeiro.query.get(barbeiro_id):
+        flash('Barbeiro não encontrado.', 'danger')
+        return redirect(url_for('admin.admin_excecoes'))
+    
+    excecao = ExcecaoHorario(
+        barbeiro_id=barbeiro_id or None,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        hora_inicio=hora_inicio,
+        hora_fim=hora_fim,
+        motivo=motivo or None
+    )
+    db.session.add(excecao)
+    db.session.commit()
+    invalidar_horarios()
+    
+    flash('Exceção de horário adicionada com sucesso!', 'success')
+    
+    # Avisar sobre agendamentos já marcados no período bloqueado, que não são alterados
+    query = Agendamento.query.filter(
+        Agendamento.data >= data_inicio,
+        Agendamento.data <= data_fim,
+        Agendamento.status.in_(STATUS_OCUPADOS)
+    )
+    if barbeiro_id:
+        query = query.filter(Agendamento.barbeiro_id == barbeiro_id)
+    if hora_inicio:
+        query = query.filter(Agendamento.hora_inicio < hora_fim, Agendamento.hora_fim > hora_inicio)
+    afetados = query.count()
+    if afetados:
+        flash(f'Atenção: existem {afetados} agendamento(s) marcados neste período. Reagende-os ou cancele-os na agenda.', 'warning')
+    
+    return redirect(url_for('admin.admin_excecoes'))
+
+
+@bp.route('/admin/horarios/excecoes/apagar/<int:id>', methods=['POST'])
+@login_required
+def admin_excecoes_apagar(id):
+    excecao = ExcecaoHorario.query.get_or_404(id)
+    db.session.delete(excecao)
+    db.session.commit()
+    invalidar_horarios()
+    
+    flash('Exceção de horário removida com sucesso!', 'success')
+    return redirect(url_for('admin.admin_excecoes'))
+
+
+@bp.route('/admin/cliente/<int:id>')
+@login_required
+def admin_cliente_detalhe(id):
+    # Buscar o cliente pelo ID
+    cliente = Cliente.query.get_or_404(id)
+    
+    # Buscar agendamentos do cliente
+    agendamentos = Agendamento.query.filter_by(cliente_id=id).order_by(Agendamento.data.desc(), Agendamento.hora_inicio).all()
+    
+    # Adicionar funções de URL para verificação de segurança no template
+    url_for_security = {
+        'admin_clientes_editar': True
+    }
+    
+    return render_template('admin_cliente_detalhe.html', cliente=cliente, agendamentos=agendamentos, url_for_security=url_for_security)
+
+
+@bp.route('/admin/clientes/editar/<int:id>', methods=['GET', 'POST'])
+@login_required
+def admin_clientes_editar(id):
+    # Buscar o cliente pelo ID
+    cliente = Cliente.query.get_or_404(id)
+    
+    if request.method == 'POST':
+        # Obter dados do formulário
+        nome = request.form.get('nome')
+        sobrenome = request.form.get('sobrenome')
+        email = request.form.get('email')
+        telefone = request.form.get('telefone')
+        
+        # Validar dados
+        if not nome or not sobrenome or not email:
+            flash('Por favor, preencha todos os campos obrigatórios.', 'danger')
+            return render_template('admin_clientes_editar.html', cliente=cliente)
+        
+        try:
+            # Verificar se o email já está em uso por outro cliente
+            cliente_existente = Cliente.query.filter(Cliente.email == email, Cliente.id != id).first()
+            if cliente_existente:
+                flash('Este email já está em uso por outro cliente.', 'danger')
+                return render_template('admin_clientes_editar.html', cliente=cliente)
+            
+            # Atualizar cliente
+            cliente.nome = nome
+            cliente.sobrenome = sobrenome
+            cliente.email = email
+            cliente.telefone = telefone
+            
+            # Salvar alterações
+            db.session.commit()
+            
+            flash(f'Cliente "{nome} {sobrenome}" atualizado com sucesso!', 'success')
+            return redirect(url_for('admin.admin_cliente_detalhe', id=cliente.id))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao atualizar cliente: {str(e)}', 'danger')
+    
+    # Renderizar formulário de edição
+    return render_template('admin_clientes_editar.html', cliente=cliente)
+
+
+@bp.route('/admin/clientes/apagar/<int:id>', methods=['POST'])
+@login_required
+def admin_clientes_apagar(id):
+    # Buscar o cliente pelo ID
+    cliente = Cliente.query.get_or_404(id)
+    
+    try:
+        # Verificar se o cliente está sendo usado em algum agendamento
+        agendamentos = Agendamento.query.filter_by(cliente_id=id).count()
+        
+        if agendamentos > 0:
+            flash(f'O cliente "{cliente.nome} {cliente.sobrenome}" não pode ser removido pois possui agendamentos associados.', 'warning')
+        else:
+            # Se não estiver sendo usado, remover do banco de dados
+            nome_cliente = f"{cliente.nome} {cliente.sobrenome}"
+            db.session.delete(cliente)
+            db.session.commit()
+            flash(f'Cliente "{nome_cliente}" removido com sucesso!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Erro ao remover cliente: {str(e)}', 'danger')
+    
+    return redirect(url_for('admin.admin_clientes'))
+
+
+# Rota para trocar horários entre agendamentos
+@bp.route('/admin/agendamento/trocar', methods=['POST'])
+@login_required
+def admin_agendamento_trocar():
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    # Obter os IDs dos agendamentos do corpo da requisição JSON
+    data = request.get_json()
+    
+    if not data or 'agendamento1_id' not in data or 'agendamento2_id' not in data:
+        return jsonify({'status': 'error', 'message': 'Dados incompletos. IDs dos agendamentos são necessários.'}), 400
+    
+    agendamento1_id = data['agendamento1_id']
+    agendamento2_id = data['agendamento2_id']
+    
+    # Buscar os agendamentos no banco de dados
+    agendamento1 = Agendamento.query.get(agendamento1_id)
+    agendamento2 = Agendamento.query.get(agendamento2_id)
+    
+    # Verificar se ambos os agendamentos foram encontrados
+    if not agendamento1 or not agendamento2:
+        return jsonify({'status': 'error', 'message': 'Um ou ambos os agendamentos não foram encontrados.'}), 404
+    
+    # Verificar se ambos os agendamentos estão com status 'agendado'
+    if agendamento1.status != 'agendado' or agendamento2.status != 'agendado':
+        return jsonify({'status': 'error', 'message': 'Apenas agendamentos com status "agendado" podem ser trocados.'}), 400
+    
+    # Recusar a troca se algum dos horários mudou desde que o cliente os leu
+    if not versao_confere(agendamento1, data.get('versao1')) or not versao_confere(agendamento2, data.get('versao2')):
+        return resposta_versao_desatualizada(agendamento1.id, agendamento2.id)
+    
+    try:
+        # Trocar os horários entre os agendamentos
+        # Salvar os valores temporariamente
+        temp_data = agendamento1.data
+        temp_hora_inicio = agendamento1.hora_inicio
+        temp_hora_fim = agendamento1.hora_fim
+        
+        # Atualizar agendamento1 com os valores do agendamento2
+        agendamento1.data = agendamento2.data
+        agendamento1.hora_inicio = agendamento2.hora_inicio
+        agendamento1.hora_fim = agendamento2.hora_fim
+        
+        # Atualizar agendamento2 com os valores temporários (originalmente do agendamento1)
+        agendamento2.data = temp_data
+        agendamento2.hora_inicio = temp_hora_inicio
+        agendamento2.hora_fim = temp_hora_fim
+        
+        # Salvar as alterações no banco de dados
+        db.session.commit()
+        invalidar_ocupacao(
+            (agendamento1.barbeiro_id, agendamento1.data),
+            (agendamento1.barbeiro_id, agendamento2.data),
+            (agendamento2.barbeiro_id, agendamento1.data),
+            (agendamento2.barbeiro_id, agendamento2.data)
+        )
+        
+        return jsonify({
+            'status': 'success', 
+            'message': 'Horários trocados com sucesso!',
+            'agendamento1': {
+                'id': agendamento1.id,
+                'cliente': f"{agendamento1.cliente.nome} {agendamento1.cliente.sobrenome}",
+                'data': agendamento1.data.strftime('%d/%m/%Y'),
+                'hora_inicio': agendamento1.hora_inicio.strftime('%H:%M'),
+                'hora_fim': agendamento1.hora_fim.strftime('%H:%M'),
+                'versao': agendamento1.versao
+            },
+            'agendamento2': {
+                'id': agendamento2.id,
+                'cliente': f"{agendamento2.cliente.nome} {agendamento2.cliente.sobrenome}",
+                'data': agendamento2.data.strftime('%d/%m/%Y'),
+                'hora_inicio': agendamento2.hora_inicio.strftime('%H:%M'),
+                'hora_fim': agendamento2.hora_fim.strftime('%H:%M'),
+                'versao': agendamento2.versao
+            }
+        })
+    except StaleDataError:
+        return resposta_versao_desatualizada(agendamento1_id, agendamento2_id)
+    except IntegrityError as e:
+        db.session.rollback()
+        if violacao_sobreposicao(e):
+            return jsonify({
+                'status': 'error',
+                'message': 'A troca sobrepõe um dos agendamentos a outro agendamento do mesmo barbeiro.'
+            }), 409
+        return jsonify({'status': 'error', 'message': f'Erro ao trocar horários: {str(e)}'}), 500
+    except Exception as e:
+        # Em caso de erro, desfazer as alterações
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao trocar horários: {str(e)}'}), 500
+
+
+# Rotas para confirmar e cancelar agendamentos via AJAX
+@bp.route('/agendamento/confirmar/<int:id>', methods=['POST'])
+@login_required
+def agendamento_confirmar(id):
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    # Buscar o agendamento pelo ID
+    agendamento = Agendamento.query.get_or_404(id)
+    
+    # Recusar a alteração se o agendamento mudou desde que o cliente o leu
+    dados = request.get_json(silent=True) or {}
+    if not versao_confere(agendamento, dados.get('versao')):
+        return resposta_versao_desatualizada(agendamento.id)
+    
+    barbeiro_id = agendamento.barbeiro_id
+    data_agendamento = agendamento.data
+    hora_inicio = agendamento.hora_inicio
+    duracao = agendamento.servico.duracao_minutos
+    
+    try:
+        # Um agendamento cancelado volta a ocupar o horário: verificar conflitos e gravar de forma atómica
+        with reserva_exclusiva(barbeiro_id, data_agendamento):
+            conflito = existe_conflito(
+                barbeiro_id, data_agendamento, hora_inicio, agendamento.hora_fim,
+                excluir_agendamento_id=agendamento.id
+            )
+            
+            if not conflito:
+                # Retirar o agendamento da faturação diária, caso estivesse concluído
+                registrar_faturacao(agendamento, -1)
+                
+                # Atualizar o status do agendamento para 'agendado'
+                agendamento.status = 'agendado'
+                db.session.commit()
+        
+        if conflito:
+            return resposta_conflito(barbeiro_id, data_agendamento, duracao, hora_inicio, excluir_agendamento_id=id)
+        
+        invalidar_ocupacao((barbeiro_id, data_agendamento))
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Agendamento confirmado com sucesso!',
+            'agendamento_id': agendamento.id,
+            'novo_status': 'agendado',
+            'versao': agendamento.versao
+        })
+    except StaleDataError:
+        return resposta_versao_desatualizada(id)
+    except IntegrityError as e:
+        db.session.rollback()
+        if violacao_sobreposicao(e):
+            return resposta_conflito(barbeiro_id, data_agendamento, duracao, hora_inicio, excluir_agendamento_id=id)
+        return jsonify({'status': 'error', 'message': f'Erro ao confirmar agendamento: {str(e)}'}), 500
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao confirmar agendamento: {str(e)}'}), 500
+
+
+@bp.route('/agendamento/cancelar/<int:id>', methods=['POST'])
+@login_required
+def agendamento_cancelar(id):
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    # Buscar o agendamento pelo ID
+    agendamento = Agendamento.query.get_or_404(id)
+    
+    # Recusar a alteração se o agendamento mudou desde que o cliente o leu
+    dados = request.get_json(silent=True) or {}
+    if not versao_confere(agendamento, dados.get('versao')):
+        return resposta_versao_desatualizada(agendamento.id)
+    
+    try:
+        # Retirar o agendamento da faturação diária, caso estivesse concluído
+        registrar_faturacao(agendamento, -1)
+        
+        # Atualizar o status do agendamento para 'cancelado'
+        agendamento.status = 'cancelado'
+        chave_ocupacao = (agendamento.barbeiro_id, agendamento.data)
+        db.session.commit()
+        invalidar_ocupacao(chave_ocupacao)
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Agendamento cancelado com sucesso!',
+            'agendamento_id': agendamento.id,
+            'novo_status': 'cancelado',
+            'versao': agendamento.versao
+        })
+    except StaleDataError:
+        return resposta_versao_desatualizada(id)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao cancelar agendamento: {str(e)}'}), 500
+
+
+# Rota para reagendar um agendamento
+@bp.route('/agendamento/reagendar/<int:id>', methods=['POST'])
+@login_required
+def agendamento_reagendar(id):
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    # Buscar o agendamento pelo ID
+    agendamento = Agendamento.query.get_or_404(id)
+    
+    # Obter dados do formulário JSON
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'status': 'error', 'message': 'Dados não fornecidos.'}), 400
+    
+    # Validar dados obrigatórios
+    required_fields = ['data', 'hora_inicio']
+    for field in required_fields:
+        if field not in data:
+            return jsonify({'status': 'error', 'message': f'Campo obrigatório não fornecido: {field}'}), 400
+    
+    try:
+        # Converter a data e hora
+        data_agendamento = datetime.strptime(data['data'], '%Y-%m-%d').date()
+        hora_inicio = datetime.strptime(data['hora_inicio'], '%H:%M').time()
+        
+        # Calcular hora de fim baseado na duração do serviço
+        servico = agendamento.servico
+        hora_fim_minutos = hora_inicio.hour * 60 + hora_inicio.minute + servico.duracao_minutos
+        hora_fim = time(hora_fim_minutos // 60, hora_fim_minutos % 60)
+        
+        # Recusar a alteração se o agendamento mudou desde que o cliente o leu
+        if not versao_confere(agendamento, data.get('versao')):
+            return resposta_versao_desatualizada(agendamento.id)
+        
+        # Verificar conflitos e atualizar o agendamento de forma atómica
+        barbeiro_id = agendamento.barbeiro_id
+        data_anterior = agendamento.data
+        with reserva_exclusiva(barbeiro_id, data_agendamento):
+            conflito = existe_conflito(
+                barbeiro_id, data_agendamento, hora_inicio, hora_fim,
+                excluir_agendamento_id=agendamento.id
+            )
+            
+            if not conflito:
+                # Atualizar o agendamento (e a faturação diária, se já estiver concluído)
+                registrar_faturacao(agendamento, -1)
+                agendamento.data = data_agendamento
+                agendamento.hora_inicio = hora_inicio
+                agendamento.hora_fim = hora_fim
+                registrar_faturacao(agendamento, 1)
+                
+                db.session.commit()
+        
+        if conflito:
+            return resposta_conflito(
+                barbeiro_id, data_agendamento, servico.duracao_minutos, hora_inicio,
+                excluir_agendamento_id=id
+            )
+        
+        invalidar_ocupacao((barbeiro_id, data_anterior), (barbeiro_id, data_agendamento))
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Agendamento reagendado com sucesso!',
+            'agendamento_id': agendamento.id,
+            'nova_data': data_agendamento.strftime('%d/%m/%Y'),
+            'novo_horario': hora_inicio.strftime('%H:%M'),
+            'versao': agendamento.versao
+        })
+    except StaleDataError:
+        return resposta_versao_desatualizada(id)
+    except IntegrityError as e:
+        db.session.rollback()
+        if violacao_sobreposicao(e):
+            return resposta_conflito(
+                barbeiro_id, data_agendamento, servico.duracao_minutos, hora_inicio,
+                excluir_agendamento_id=id
+            )
+        return jsonify({'status': 'error', 'message': f'Erro ao reagendar agendamento: {str(e)}'}), 500
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': f'Erro de formato: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao reagendar agendamento: {str(e)}'}), 500
+
+
+# Rota para concluir serviço
+@bp.route('/admin/agendamento/concluir/<int:agendamento_id>', methods=['POST'])
+@login_required
+def admin_agendamento_concluir(agendamento_id):
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    # Buscar o agendamento pelo ID
+    agendamento = Agendamento.query.get_or_404(agendamento_id)
+    
+    try:
+        # Obter dados financeiros do formulário
+        dados = request.get_json()
+        valor_pago = dados.get('valor_pago')
+        metodo_pagamento = dados.get('metodo_pagamento')
+        
+        # Validar os dados recebidos
+        if not valor_pago or not metodo_pagamento:
+            return jsonify({
+                'status': 'error', 
+                'message': 'Valor pago e método de pagamento são obrigatórios.'
+            }), 400
+        
+        metodo_pagamento = normalizar_metodo_pagamento(metodo_pagamento)
+        if metodo_pagamento is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Método de pagamento inválido.'
+            }), 400
+        
+        # Recusar a alteração se o agendamento mudou desde que o cliente o leu
+        if not versao_confere(agendamento, dados.get('versao')):
+            return resposta_versao_desatualizada(agendamento.id)
+        
+        # Atualizar o agendamento com os dados financeiros, substituindo uma venda já registada
+        registrar_faturacao(agendamento, -1)
+        agendamento.status = 'concluído'
+        agendamento.valor_pago = float(valor_pago)
+        agendamento.metodo_pagamento = metodo_pagamento
+        registrar_faturacao(agendamento, 1)
+        chave_ocupacao = (agendamento.barbeiro_id, agendamento.data)
+        db.session.commit()
+        invalidar_ocupacao(chave_ocupacao)
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Venda registrada e serviço concluído com sucesso!',
+            'agendamento_id': agendamento.id,
+            'novo_status': 'concluído',
+            'valor_pago': agendamento.valor_pago,
+            'metodo_pagamento': agendamento.metodo_pagamento,
+            'versao': agendamento.versao
+        })
+    except StaleDataError:
+        return resposta_versao_desatualizada(agendamento_id)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao registrar venda: {str(e)}'}), 500
+
+
+# Ações em lote da agenda: status final e status de origem permitidos
+TRANSICOES_LOTE = {
+    'confirmar': ('agendado', ('pendente', 'agendado')),
+    'concluir': ('concluído', ('pendente', 'agendado', 'concluído')),
+    'cancelar': ('cancelado', ('pendente', 'agendado'))
+}
+
+# Número máximo de agendamentos alterados num único pedido
+LIMITE_LOTE_AGENDAMENTOS = 200
+
+
+# Rota para confirmar, concluir ou cancelar vários agendamentos de uma vez
+@bp.route('/admin/agendamento/lote', methods=['POST'])
+@login_required
+def admin_agendamento_lote():
+    """
+    Aplica a mesma ação a uma lista de agendamentos com um único UPDATE e um
+    único commit. Ao concluir, exige o método de pagamento e aceita
+    opcionalmente o valor pago (sem valor, cada agendamento fica com o preço
+    do serviço).
+    `versoes` (opcional) mapeia cada ID para a versão lida pelo cliente.
+    Devolve o resultado de cada ID.
+    """
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    dados = request.get_json()
+    if not dados:
+        return jsonify({'status': 'error', 'message': 'Dados não fornecidos.'}), 400
+    
+    acao = dados.get('acao')
+    if acao not in TRANSICOES_LOTE:
+        return jsonify({'status': 'error', 'message': 'Ação inválida. Use confirmar, concluir ou cancelar.'}), 400
+    novo_status, status_permitidos = TRANSICOES_LOTE[acao]
+    
+    try:
+        ids = list(dict.fromkeys(int(agendamento_id) for agendamento_id in dados.get('ids') or []))
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'Lista de IDs inválida.'}), 400
+    
+    if not ids:
+        return jsonify({'status': 'error', 'message': 'Nenhum agendamento selecionado.'}), 400
+    if len(ids) > LIMITE_LOTE_AGENDAMENTOS:
+        return jsonify({'status': 'error', 'message': f'Selecione no máximo {LIMITE_LOTE_AGENDAMENTOS} agendamentos.'}), 400
+    
+    versoes = dados.get('versoes') or {}
+    if not isinstance(versoes, dict):
+        return jsonify({'status': 'error', 'message': 'Lista de versões inválida.'}), 400
+    
+    # Dados de pagamento aplicados a todos os agendamentos concluídos: o método é obrigatório,
+    # como em admin_agendamento_concluir, para que a venda entre no total do financeiro
+    metodo_pagamento = None
+    valor_pago = None
+    if acao == 'concluir':
+        if not dados.get('metodo_pagamento'):
+            return jsonify({'status': 'error', 'message': 'O método de pagamento é obrigatório.'}), 400
+        metodo_pagamento = normalizar_metodo_pagamento(dados['metodo_pagamento'])
+        if metodo_pagamento is None:
+            return jsonify({'status': 'error', 'message': 'Método de pagamento inválido.'}), 400
+        if dados.get('valor_pago') not in (None, ''):
+            try:
+                valor_pago = float(dados['valor_pago'])
+            except (TypeError, ValueError):
+                return jsonify({'status': 'error', 'message': 'Valor pago inválido.'}), 400
+    
+    try:
+        # Estado atual de todos os agendamentos numa única consulta
+        atuais = {
+            linha.id: linha for linha in db.session.query(
+                Agendamento.id, Agendamento.status, Agendamento.data, Agendamento.barbeiro_id,
+                Agendamento.servico_id, Agendamento.valor_pago, Agendamento.metodo_pagamento,
+                Agendamento.versao, Servico.preco
+            ).join(Servico, Agendamento.servico_id == Servico.id).filter(Agendamento.id.in_(ids))
+        }
+        
+        resultados = []
+        alterados = []
+        for agendamento_id in ids:
+            atual = atuais.get(agendamento_id)
+            if atual is None:
+                resultados.append({'id': agendamento_id, 'status': 'error', 'message': 'Agendamento não encontrado.'})
+            elif atual.status not in status_permitidos:
+                resultados.append({
+                    'id': agendamento_id, 'status': 'error',
+                    'message': f'Não é possível {acao} um agendamento com status "{atual.status}".'
+                })
+            elif not versao_confere(atual, versoes.get(str(agendamento_id))):
+                resultados.append({
+                    'id': agendamento_id, 'status': 'error',
+                    'message': 'O agendamento foi alterado por outro utilizador.',
+                    'agendamento': {'versao': atual.versao, 'status': atual.status}
+                })
+            else:
+                alterados.append(atual)
+                resultados.append({
+                    'id': agendamento_id, 'status': 'success',
+                    'novo_status': novo_status, 'versao': atual.versao + 1
+                })
+        
+        if alterados:
+            # Variação da faturação diária, somada por linha antes de tocar na tabela
+            variacoes = {}
+            
+            def somar(chave, quantidade, valor):
+                total = variacoes.setdefault(chave, [0, 0.0])
+                total[0] += quantidade
+                total[1] += valor
+            
+            for atual in alterados:
+                if atual.status == 'concluído':
+                    valor = atual.valor_pago if atual.valor_pago is not None else atual.preco
+                    somar((atual.data, atual.barbeiro_id, atual.servico_id, atual.metodo_pagamento or ''), -1, -valor)
+                if novo_status == 'concluído':
+                    valor = valor_pago if valor_pago is not None else atual.valor_pago
+                    if valor is None:
+                        valor = atual.preco
+                    somar((atual.data, atual.barbeiro_id, atual.servico_id, metodo_pagamento), 1, valor)
+            
+            ajustar_faturacao_lote(variacoes)
+            
+            # Um único UPDATE ... WHERE (id, versao) IN para todos os agendamentos: se algum
+            # foi alterado desde a consulta acima, atualiza menos linhas e a transação é desfeita
+            valores = {Agendamento.status: novo_status, Agendamento.versao: Agendamento.versao + 1}
+            if metodo_pagamento is not None:
+                valores[Agendamento.metodo_pagamento] = metodo_pagamento
+            if valor_pago is not None:
+                valores[Agendamento.valor_pago] = valor_pago
+            atualizados = Agendamento.query.filter(
+                tuple_(Agendamento.id, Agendamento.versao).in_([(atual.id, atual.versao) for atual in alterados])
+            ).update(valores, synchronize_session=False)
+            if atualizados != len(alterados):
+                return resposta_versao_desatualizada(*[atual.id for atual in alterados])
+            
+            db.session.commit()
+            invalidar_ocupacao(*{(atual.barbeiro_id, atual.data) for atual in alterados})
+        
+        return jsonify({
+            'status': 'success' if alterados else 'error',
+            'message': f'{len(alterados)} de {len(ids)} agendamentos atualizados.',
+            'resultados': resultados
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao atualizar agendamentos: {str(e)}'}), 500
+
+
+# Rota para página de agendamento manual (admin)
+@bp.route('/admin/agendar', methods=['GET', 'POST'])
+@login_required
+def admin_agendar():
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        flash('Acesso restrito a administradores.', 'warning')
+        return redirect(url_for('publico.login'))
+    
+    if request.method == 'POST':
+        # Obter dados do formulário
+        cliente_id = request.form.get('cliente_id')
+        servico_id = request.form.get('servico_id')
+        barbeiro_id = request.form.get('barbeiro_id')
+        data_str = request.form.get('data')
+        hora_inicio_str = request.form.get('hora_inicio')
+        
+        # Validar dados obrigatórios
+        if not all([cliente_id, servico_id, barbeiro_id, data_str, hora_inicio_str]):
+            flash('Por favor, preencha todos os campos obrigatórios.', 'warning')
+            return redirect(url_for('admin.admin_agendar'))
+        
+        try:
+            # Buscar cliente, serviço e barbeiro
+            cliente = Cliente.query.get(cliente_id)
+            servico = Servico.query.get(servico_id)
+            barbeiro = Barbeiro.query.get(barbeiro_id)
+            
+            if not cliente or not servico or not barbeiro:
+                flash('Cliente, serviço ou barbeiro não encontrado.', 'danger')
+                return redirect(url_for('admin.admin_agendar'))
+            
+            # Converter a data e hora
+            data_agendamento = datetime.strptime(data_str, '%Y-%m-%d').date()
+            hora_inicio = datetime.strptime(hora_inicio_str, '%H:%M').time()
+            
+            # Calcular hora de fim baseado na duração do serviço
+            hora_fim_minutos = hora_inicio.hour * 60 + hora_inicio.minute + servico.duracao_minutos
+            hora_fim = time(hora_fim_minutos // 60, hora_fim_minutos % 60)
+            
+            # Verificar conflitos e gravar o agendamento de forma atómica
+            with reserva_exclusiva(barbeiro.id, data_agendamento):
+                conflito = existe_conflito(barbeiro.id, data_agendamento, hora_inicio, hora_fim)
+                
+                if not conflito:
+                    # Criar o novo agendamento
+                    novo_agendamento = Agendamento(
+                        cliente_id=cliente.id,
+                        servico_id=servico.id,
+                        barbeiro_id=barbeiro.id,
+                        data=data_agendamento,
+                        hora_inicio=hora_inicio,
+                        hora_fim=hora_fim,
+                        status='agendado'  # Já confirmar o agendamento
+                    )
+                    
+                    db.session.add(novo_agendamento)
+                    db.session.commit()
+            
+            if conflito:
+                alternativos = sugerir_horarios_alternativos(barbeiro.id, data_agendamento, servico.duracao_minutos, hora_inicio)
+                mensagem = 'Este horário já está ocupado.'
+                if alternativos:
+                    mensagem += ' Horários próximos disponíveis: ' + ', '.join(h['hora_inicio'] for h in alternativos) + '.'
+                flash(mensagem, 'danger')
+                return redirect(url_for('admin.admin_agendar'))
+            
+            invalidar_ocupacao((barbeiro.id, data_agendamento))
+            
+            flash('Agendamento criado com sucesso!', 'success')
+            return redirect(url_for('admin.agenda'))
+        
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao criar agendamento: {str(e)}', 'danger')
+            return redirect(url_for('admin.admin_agendar'))
+    
+    # Método GET - Renderizar o formulário
+    # Buscar todos os serviços ativos
+    servicos = Servico.query.filter_by(ativo=True).all()
+    
+    # Buscar todos os barbeiros ativos
+    barbeiros = Barbeiro.query.filter_by(ativo=True).all()
+    
+    # Os clientes são procurados à medida que o operador escreve (/api/clientes/buscar)
+    return render_template('admin_agendamento.html', servicos=servicos, barbeiros=barbeiros)
+
+
+# Rota para criar agendamento (admin)
+@bp.route('/admin/agendamento/criar', methods=['POST'])
+@login_required
+def admin_agendamento_criar():
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    # Obter dados do formulário JSON
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'status': 'error', 'message': 'Dados não fornecidos.'}), 400
+    
+    # Validar dados obrigatórios
+    required_fields = ['cliente_id', 'servico_id', 'barbeiro_id', 'data', 'hora_inicio']
+    for field in required_fields:
+        if field not in data:
+            return jsonify({'status': 'error', 'message': f'Campo obrigatório não fornecido: {field}'}), 400
+    
+    try:
+        # Buscar cliente, serviço e barbeiro
+        cliente = Cliente.query.get(data['cliente_id'])
+        servico = Servico.query.get(data['servico_id'])
+        barbeiro = Barbeiro.query.get(data['barbeiro_id'])
+        
+        if not cliente or not servico or not barbeiro:
+            return jsonify({'status': 'error', 'message': 'Cliente, serviço ou barbeiro não encontrado.'}), 404
+        
+        # Converter a data e hora
+        data_agendamento = datetime.strptime(data['data'], '%Y-%m-%d').date()
+        hora_inicio = datetime.strptime(data['hora_inicio'], '%H:%M').time()
+        
+        # Calcular hora de fim baseado na duração do serviço
+        hora_fim_minutos = hora_inicio.hour * 60 + hora_inicio.minute + servico.duracao_minutos
+        hora_fim = time(hora_fim_minutos // 60, hora_fim_minutos % 60)
+        
+        # Verificar conflitos e gravar o agendamento de forma atómica
+        with reserva_exclusiva(barbeiro.id, data_agendamento):
+            conflito = existe_conflito(barbeiro.id, data_agendamento, hora_inicio, hora_fim)
+            
+            if not conflito:
+                # Criar o novo agendamento
+                novo_agendamento = Agendamento(
+                    cliente_id=cliente.id,
+                    servico_id=servico.id,
+                    barbeiro_id=barbeiro.id,
+                    data=data_agendamento,
+                    hora_inicio=hora_inicio,
+                    hora_fim=hora_fim,
+                    status='agendado'  # Já confirmar o agendamento
+                )
+                
+                db.session.add(novo_agendamento)
+                db.session.commit()
+        
+        if conflito:
+            return resposta_conflito(barbeiro.id, data_agendamento, servico.duracao_minutos, hora_inicio)
+        
+        invalidar_ocupacao((barbeiro.id, data_agendamento))
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Agendamento criado com sucesso!',
+            'agendamento_id': novo_agendamento.id
+        })
+    
+    except IntegrityError as e:
+        db.session.rollback()
+        if violacao_sobreposicao(e):
+            return resposta_conflito(barbeiro.id, data_agendamento, servico.duracao_minutos, hora_inicio)
+        return jsonify({'status': 'error', 'message': f'Erro ao criar agendamento: {str(e)}'}), 500
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao criar agendamento: {str(e)}'}), 500
+
+
+# Rota para criar uma série de agendamentos recorrentes (admin)
+@bp.route('/admin/agendamento/recorrente', methods=['POST'])
+@login_required
+def admin_agendamento_recorrente():
+    """
+    Cria de uma só vez os agendamentos de uma série (ex.: sexta sim, sexta
+    não às 10:00). As ocorrências em conflito são indicadas na resposta e as
+    restantes são gravadas numa única transação.
+    """
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    # Obter dados do formulário JSON
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'status': 'error', 'message': 'Dados não fornecidos.'}), 400
+    
+    # Validar dados obrigatórios
+    required_fields = ['cliente_id', 'servico_id', 'barbeiro_id', 'data', 'hora_inicio', 'frequencia']
+    for field in required_fields:
+        if field not in data:
+            return jsonify({'status': 'error', 'message': f'Campo obrigatório não fornecido: {field}'}), 400
+    
+    try:
+        # Expandir a regra de recorrência nas datas da série
+        try:
+            hora_inicio = datetime.strptime(data['hora_inicio'], '%H:%M').time()
+            datas = expandir_recorrencia(
+                datetime.strptime(data['data'], '%Y-%m-%d').date(),
+                data['frequencia'],
+                intervalo=int(data.get('intervalo', 1)),
+                ocorrencias=int(data['ocorrencias']) if data.get('ocorrencias') else None,
+                data_fim=datetime.strptime(data['data_fim'], '%Y-%m-%d').date() if data.get('data_fim') else None,
+                dias_semana=[int(dia) for dia in data.get('dias_semana') or []]
+            )
+        except (TypeError, ValueError) as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        
+        # Buscar cliente, serviço e barbeiro uma única vez para toda a série
+        cliente = Cliente.query.get(data['cliente_id'])
+        servico = Servico.query.get(data['servico_id'])
+        barbeiro = Barbeiro.query.get(data['barbeiro_id'])
+        
+        if not cliente or not servico or not barbeiro:
+            return jsonify({'status': 'error', 'message': 'Cliente, serviço ou barbeiro não encontrado.'}), 404
+        
+        inicio = hora_para_minutos(hora_inicio)
+        fim = inicio + servico.duracao_minutos
+        if fim > MINUTOS_POR_DIA:
+            return jsonify({'status': 'error', 'message': 'O serviço terminaria depois da meia-noite.'}), 400
+        hora_fim = minutos_para_hora(fim)
+        
+        # Expediente e exceções estão em memória: descartar já as datas em que o barbeiro não atende
+        conflitos = []
+        candidatas = []
+        for data_agendamento in datas:
+            expediente = expediente_barbeiro(barbeiro.id, data_agendamento)
+            if not expediente:
+                motivo = 'O barbeiro não atende neste dia.'
+            elif inicio < expediente[0] or fim > expediente[1]:
+                motivo = 'Fora do horário de trabalho do barbeiro.'
+            elif not intervalo_livre(inicio, fim, excecoes_barbeiro(barbeiro.id, data_agendamento)):
+                motivo = 'Horário bloqueado por uma folga, feriado ou pausa.'
+            else:
+                candidatas.append(data_agendamento)
+                continue
+            conflitos.append({'data': data_agendamento.strftime('%Y-%m-%d'), 'motivo': motivo})
+        
+        novos = []
+        if candidatas:
+            preparacao = regras_agendamento().preparacao
+            
+            with reserva_exclusiva(barbeiro.id, *candidatas):
+                # Uma única consulta para os agendamentos de todas as datas da série
+                ocupados_por_data = agrupar_intervalos(
+                    db.session.query(Agendamento.data, Agendamento.hora_inicio, Agendamento.hora_fim).filter(
+                        Agendamento.barbeiro_id == barbeiro.id,
+                        Agendamento.data.in_(candidatas),
+                        Agendamento.status.in_(STATUS_OCUPADOS)
+                    )
+                )
+                
+                for data_agendamento in candidatas:
+                    ocupados = aplicar_preparacao(ocupados_por_data.get(data_agendamento, []), preparacao)
+                    if not intervalo_livre(inicio, fim, ocupados):
+                        conflitos.append({
+                            'data': data_agendamento.strftime('%Y-%m-%d'),
+                            'motivo': 'Conflito com um agendamento existente.'
+                        })
+                        continue
+                    
+                    novos.append(Agendamento(
+                        cliente_id=cliente.id,
+                        servico_id=servico.id,
+                        barbeiro_id=barbeiro.id,
+                        data=data_agendamento,
+                        hora_inicio=hora_inicio,
+                        hora_fim=hora_fim,
+                        status='agendado'  # Já confirmar o agendamento
+                    ))
+                
+                if novos:
+                    db.session.bulk_save_objects(novos)
+                    db.session.commit()
+        
+        invalidar_ocupacao(*((barbeiro.id, agendamento.data) for agendamento in novos))
+        
+        conflitos.sort(key=lambda conflito: conflito['data'])
+        resposta = {
+            'status': 'success' if novos else 'error',
+            'message': f'{len(novos)} de {len(datas)} agendamentos criados.',
+            'criados': [
+                {
+                    'data': agendamento.data.strftime('%Y-%m-%d'),
+                    'hora_inicio': hora_inicio.strftime('%H:%M'),
+                    'hora_fim': hora_fim.strftime('%H:%M')
+                }
+                for agendamento in novos
+            ],
+            'conflitos': conflitos
+        }
+        return jsonify(resposta), 200 if novos else 409
+    
+    except IntegrityError as e:
+        db.session.rollback()
+        if violacao_sobreposicao(e):
+            # Outro pedido gravou entretanto um agendamento sobreposto: a transação da série foi desfeita
+            ocupadas = [
+                agendamento.data for agendamento in novos
+                if existe_conflito(barbeiro.id, agendamento.data, hora_inicio, hora_fim)
+            ] or [agendamento.data for agendamento in novos]
+            conflitos.extend(
+                {'data': data_agendamento.strftime('%Y-%m-%d'), 'motivo': 'Conflito com um agendamento existente.'}
+                for data_agendamento in ocupadas
+            )
+            conflitos.sort(key=lambda conflito: conflito['data'])
+            return jsonify({
+                'status': 'error',
+                'message': f'0 de {len(datas)} agendamentos criados.',
+                'criados': [],
+                'conflitos': conflitos
+            }), 409
+        return jsonify({'status': 'error', 'message': f'Erro ao criar agendamentos recorrentes: {str(e)}'}), 500
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao criar agendamentos recorrentes: {str(e)}'}), 500
@@ -0,0 +1,384 @@
+"""Rotas da API JSON: horários disponíveis, busca de clientes e estatísticas dos caches."""
+
+from datetime import datetime, timedelta
+import logging
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+
+try:
+    from app.modelos import db, Agendamento, Barbeiro, Servico
+    from app.disponibilidade import (STATUS_OCUPADOS, agrupar_intervalos, calcular_horarios_livres, formatar_horarios,
+                                     primeiro_instante, data_na_janela, minimo_inicio_na_data)
+    from app.configuracao import cache_configuracao, regras_agendamento
+    from app.reservas import (cache_ocupacao, cache_horarios, obter_semana_barbeiros, expediente_barbeiro,
+                              excecoes_barbeiro, buscar_intervalos_ocupados, calcular_horarios_equipe)
+    from app.clientes import buscar_clientes, LIMITE_BUSCA_CLIENTES, LIMITE_MAXIMO_BUSCA_CLIENTES
+    from app.autenticacao import cache_principais
+    from app.registo import campos
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import db, Agendamento, Barbeiro, Servico
+    from disponibilidade import (STATUS_OCUPADOS, agrupar_intervalos, calcular_horarios_livres, formatar_horarios,
+                                 primeiro_instante, data_na_janela, minimo_inicio_na_data)
+    from configuracao import cache_configuracao, regras_agendamento
+    from reservas import (cache_ocupacao, cache_horarios, obter_semana_barbeiros, expediente_barbeiro,
+                          excecoes_barbeiro, buscar_intervalos_ocupados, calcular_horarios_equipe)
+    from clientes import buscar_clientes, LIMITE_BUSCA_CLIENTES, LIMITE_MAXIMO_BUSCA_CLIENTES
+    from autenticacao import cache_principais
+    from registo import campos
+
+
+# Blueprint da API (as rotas já incluem o prefixo /api)
+bp = Blueprint('api', __name__)
+
+logger = logging.getLogger(__name__)
+
+
+# API para obter horários disponíveis
+@bp.route('/api/horarios-disponiveis', methods=['GET'])
+def api_horarios_disponiveis():
+    # Obter parâmetros da requisição
+    data_str = request.args.get('data')
+    barbeiro_id = request.args.get('barbeiro_id')
+    servico_id = request.args.get('servico_id')
+    
+    # Validar parâmetros
+    if not data_str or not barbeiro_id or not servico_id:
+        logger.info('Horários pedidos com parâmetros incompletos',
+                    extra=campos(data=data_str, servico_id=servico_id, barbeiro_id=barbeiro_id))
+        return jsonify({
+            'status': 'error',
+            'message': 'Parâmetros incompletos. Data, barbeiro_id e servico_id são obrigatórios.'
+        }), 400
+    
+    try:
+        # Converter a data de string para objeto date
+        data = datetime.strptime(data_str, '%Y-%m-%d').date()
+        servico_id = int(servico_id)
+        
+        # Recusar datas fora da janela de agendamento antes de consultar a base de dados
+        regras = regras_agendamento()
+        agora = datetime.now()
+        if not data_na_janela(data, agora, regras):
+            logger.debug('Data fora da janela de agendamento', extra=campos(data=data))
+            return jsonify({'status': 'error', 'message': 'Data fora do período permitido para agendamentos.'}), 400
+        
+        # Buscar o serviço para saber a duração
+        servico = Servico.query.get(servico_id)
+        if not servico:
+            logger.info('Serviço não encontrado', extra=campos(servico_id=servico_id))
+            return jsonify({'status': 'error', 'message': 'Serviço não encontrado.'}), 404
+        
+        # Na data em que termina a antecedência mínima, ignorar os horários anteriores
+        minimo_inicio = minimo_inicio_na_data(data, agora, regras)
+        
+        # Modo "qualquer barbeiro": disponibilidade de toda a equipe numa só passagem
+        if barbeiro_id == 'qualquer':
+            horarios_disponiveis = calcular_horarios_equipe(data, servico, regras, minimo_inicio=minimo_inicio)
+            logger.debug('Horários disponíveis calculados', extra=campos(
+                data=data, servico_id=servico_id, barbeiro_id='qualquer', minimo_inicio=minimo_inicio,
+                total=len(horarios_disponiveis)
+            ))
+            return jsonify({
+                'status': 'success',
+                'horarios_disponiveis': horarios_disponiveis
+            })
+        
+        barbeiro_id = int(barbeiro_id)
+        
+        # Buscar o barbeiro
+        barbeiro = Barbeiro.query.get(barbeiro_id)
+        if not barbeiro:
+            logger.info('Barbeiro não encontrado', extra=campos(barbeiro_id=barbeiro_id))
+            return jsonify({'status': 'error', 'message': 'Barbeiro não encontrado.'}), 404
+        
+        # Expediente do barbeiro neste dia, a partir do modelo semanal em memória
+        expediente = expediente_barbeiro(barbeiro_id, data)
+        
+        # Sem expediente: o barbeiro ou a barbearia não atendem neste dia
+        if not expediente:
+            logger.debug('Barbeiro sem expediente na data', extra=campos(barbeiro_id=barbeiro_id, data=data))
+            return jsonify({
+                'status': 'success',
+                'horarios_disponiveis': []
+            })
+        
+        # Intervalos ocupados do barbeiro nesta data (exceto cancelados)
+        ocupados = buscar_intervalos_ocupados(barbeiro_id, data)
+        
+        inicio_minutos, fim_minutos = expediente
+        duracao_servico = servico.duracao_minutos
+        
+        horarios_disponiveis = formatar_horarios(calcular_horarios_livres(
+            inicio_minutos, fim_minutos, duracao_servico, ocupados,
+            passo=regras.passo, minimo_inicio=minimo_inicio, preparacao=regras.preparacao,
+            bloqueados=excecoes_barbeiro(barbeiro_id, data)
+        ))
+        logger.debug('Horários disponíveis calculados', extra=campos(
+            data=data, servico_id=servico_id, barbeiro_id=barbeiro_id, minimo_inicio=minimo_inicio,
+            expediente=[inicio_minutos, fim_minutos], duracao=duracao_servico, ocupados=len(ocupados),
+            total=len(horarios_disponiveis)
+        ))
+        return jsonify({
+            'status': 'success',
+            'horarios_disponiveis': horarios_disponiveis
+        })
+        
+    except ValueError as e:
+        logger.info('Horários pedidos com parâmetros em formato inválido', extra=campos(erro=str(e)))
+        return jsonify({'status': 'error', 'message': f'Erro de formato: {str(e)}'}), 400
+    except Exception as e:
+        logger.exception('Erro ao calcular os horários disponíveis')
+        return jsonify({'status': 'error', 'message': f'Erro ao buscar horários disponíveis: {str(e)}'}), 500
+
+
+# API para obter horários disponíveis de vários dias numa única requisição
+@bp.route('/api/horarios-disponiveis-periodo', methods=['GET'])
+def api_horarios_disponiveis_periodo():
+    # Obter parâmetros da requisição
+    data_inicio_str = request.args.get('data_inicio')
+    data_fim_str = request.args.get('data_fim')
+    barbeiro_id = request.args.get('barbeiro_id')
+    servico_id = request.args.get('servico_id')
+    
+    # Validar parâmetros
+    if not data_inicio_str or not data_fim_str or not barbeiro_id or not servico_id:
+        return jsonify({
+            'status': 'error',
+            'message': 'Parâmetros incompletos. data_inicio, data_fim, barbeiro_id e servico_id são obrigatórios.'
+        }), 400
+    
+    try:
+        # Converter os parâmetros
+        data_inicio = datetime.strptime(data_inicio_str, '%Y-%m-%d').date()
+        data_fim = datetime.strptime(data_fim_str, '%Y-%m-%d').date()
+        barbeiro_id = int(barbeiro_id)
+        servico_id = int(servico_id)
+        
+        if data_fim < data_inicio:
+            return jsonify({'status': 'error', 'message': 'A data de fim não pode ser anterior à data de início.'}), 400
+        
+        # Limitar o período à janela de agendamento (da antecedência mínima à janela máxima)
+        regras = regras_agendamento()
+        agora = datetime.now()
+        data_inicio = max(data_inicio, primeiro_instante(agora, regras).date())
+        data_fim = min(data_fim, agora.date() + timedelta(days=regras.janela_dias))
+        
+        # Período inteiramente fora da janela: nada a consultar
+        if data_inicio > data_fim:
+            return jsonify({
+                'status': 'success',
+                'data_inicio': data_inicio.strftime('%Y-%m-%d'),
+                'data_fim': data_fim.strftime('%Y-%m-%d'),
+                'dias': []
+            })
+        
+        # Buscar o serviço e o barbeiro
+        servico = Servico.query.get(servico_id)
+        if not servico:
+            return jsonify({'status': 'error', 'message': 'Serviço não encontrado.'}), 404
+        
+        barbeiro = Barbeiro.query.get(barbeiro_id)
+        if not barbeiro:
+            return jsonify({'status': 'error', 'message': 'Barbeiro não encontrado.'}), 404
+        
+        dias = []
+        # Expedientes da semana inteira, a partir do modelo em memória
+        expedientes = obter_semana_barbeiros().get(barbeiro_id) or (None,) * 7
+        
+        # Uma única consulta para todos os agendamentos do período, agrupados por data
+        ocupados_por_data = agrupar_intervalos(
+            db.session.query(Agendamento.data, Agendamento.hora_inicio, Agendamento.hora_fim).filter(
+                Agendamento.barbeiro_id == barbeiro_id,
+                Agendamento.data >= data_inicio,
+                Agendamento.data <= data_fim,
+                Agendamento.status.in_(STATUS_OCUPADOS)
+            )
+        )
+        
+        data = data_inicio
+        while data <= data_fim:
+            expediente = expedientes[data.weekday()]
+            horarios = []
+            
+            if expediente:
+                # No primeiro dia da janela, ignorar os horários antes da antecedência mínima
+                horarios = formatar_horarios(calcular_horarios_livres(
+                    expediente[0], expediente[1], servico.duracao_minutos,
+                    ocupados_por_data.get(data, []), passo=regras.passo,
+                    minimo_inicio=minimo_inicio_na_data(data, agora, regras),
+                    preparacao=regras.preparacao, bloqueados=excecoes_barbeiro(barbeiro_id, data)
+                ))
+            
+            dias.append({
+                'data': data.strftime('%Y-%m-%d'),
+                'horarios_disponiveis': horarios
+            })
+            data += timedelta(days=1)
+        
+        return jsonify({
+            'status': 'success',
+            'data_inicio': data_inicio.strftime('%Y-%m-%d'),
+            'data_fim': data_fim.strftime('%Y-%m-%d'),
+            'dias': dias
+        })
+        
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': f'Erro de formato: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'Erro ao buscar horários disponíveis: {str(e)}'}), 500
+
+
+# API para obter horários disponíveis para reagendamento
+@bp.route('/api/horarios-disponiveis-reagendamento', methods=['GET'])
+def api_horarios_disponiveis_reagendamento():
+    # Obter parâmetros da requisição
+    data_str = request.args.get('data')
+    agendamento_id = request.args.get('agendamento_id')
+    
+    # Validar parâmetros
+    if not data_str or not agendamento_id:
+        return jsonify({
+            'status': 'error',
+            'message': 'Parâmetros incompletos. Data e agendamento_id são obrigatórios.'
+        }), 400
+    
+    try:
+        # Converter a data de string para objeto date
+        data = datetime.strptime(data_str, '%Y-%m-%d').date()
+        agendamento_id = int(agendamento_id)
+        
+        # Buscar o agendamento original
+        agendamento = Agendamento.query.get(agendamento_id)
+        if not agendamento:
+            return jsonify({'status': 'error', 'message': 'Agendamento não encontrado.'}), 404
+        
+        # Obter o serviço e barbeiro do agendamento original
+        servico = agendamento.servico
+        barbeiro = agendamento.barbeiro
+        
+        # Expediente do barbeiro neste dia, a partir do modelo semanal em memória
+        expediente = expediente_barbeiro(barbeiro.id, data)
+        if not expediente:
+            return jsonify({
+                'status': 'error',
+                'message': f'O barbeiro não trabalha neste dia.'
+            }), 400
+        
+        # Intervalos ocupados do barbeiro nesta data (exceto cancelados e o próprio agendamento)
+        ocupados = buscar_intervalos_ocupados(barbeiro.id, data, excluir_agendamento_id=agendamento_id)
+        
+        # Calcular horários disponíveis com o passo e o tempo de preparação configurados
+        regras = regras_agendamento()
+        horarios_disponiveis = formatar_horarios(calcular_horarios_livres(
+            expediente[0], expediente[1], servico.duracao_minutos, ocupados,
+            passo=regras.passo, preparacao=regras.preparacao, bloqueados=excecoes_barbeiro(barbeiro.id, data)
+        ))
+        
+        return jsonify({
+            'status': 'success',
+            'horarios_disponiveis': horarios_disponiveis
+        })
+        
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': f'Erro de formato: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'Erro ao buscar horários disponíveis: {str(e)}'}), 500
+
+
+# API para buscar clientes por nome ou telefone (admin)
+@bp.route('/api/clientes/buscar')
+@login_required
+def api_clientes_buscar():
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    termo = request.args.get('q', '').strip()
+    limite = min(max(request.args.get('limite', LIMITE_BUSCA_CLIENTES, type=int), 1), LIMITE_MAXIMO_BUSCA_CLIENTES)
+    
+    clientes = buscar_clientes(termo, limite) if termo else []
+    
+    return jsonify({
+        'status': 'success',
+        'clientes': [
+            {
+                'id': cliente.id,
+                'nome': cliente.nome,
+                'sobrenome': cliente.sobrenome,
+                'telefone': cliente.telefone
+            }
+            for cliente in clientes
+        ]
+    })
+
+
+# API para obter horários disponíveis (admin)
+@bp.route('/api/horarios_disponiveis')
+@login_required
+def api_horarios_disponiveis_admin():
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    # Obter parâmetros da requisição
+    data_str = request.args.get('data')
+    barbeiro_id = request.args.get('barbeiro_id')
+    servico_id = request.args.get('servico_id')
+    
+    # Validar parâmetros
+    if not data_str or not barbeiro_id or not servico_id:
+        return jsonify({'status': 'error', 'message': 'Parâmetros incompletos.'}), 400
+    
+    try:
+        # Converter a data
+        data = datetime.strptime(data_str, '%Y-%m-%d').date()
+        
+        # Buscar o barbeiro e o serviço
+        barbeiro = Barbeiro.query.get(barbeiro_id)
+        servico = Servico.query.get(servico_id)
+        
+        if not barbeiro or not servico:
+            return jsonify({'status': 'error', 'message': 'Barbeiro ou serviço não encontrado.'}), 404
+        
+        # Expediente do barbeiro neste dia, a partir do modelo semanal em memória
+        expediente = expediente_barbeiro(barbeiro.id, data)
+        if not expediente:
+            return jsonify({'status': 'success', 'horarios': []})
+        
+        # Calcular horários disponíveis a partir dos intervalos ocupados
+        ocupados = buscar_intervalos_ocupados(barbeiro.id, data)
+        regras = regras_agendamento()
+        horarios = calcular_horarios_livres(
+            expediente[0],
+            expediente[1],
+            servico.duracao_minutos,
+            ocupados,
+            passo=regras.passo,
+            preparacao=regras.preparacao,
+            bloqueados=excecoes_barbeiro(barbeiro.id, data)
+        )
+        horarios_disponiveis = [horario['hora_inicio'] for horario in formatar_horarios(horarios)]
+        
+        return jsonify({'status': 'success', 'horarios': horarios_disponiveis})
+    
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
+# API para consultar a eficácia dos caches (admin)
+@bp.route('/api/cache/estatisticas')
+@login_required
+def api_cache_estatisticas():
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        return jsonify({'status': 'error', 'message': 'Acesso restrito a administradores.'}), 403
+    
+    return jsonify({
+        'status': 'success',
+        'ocupacao': cache_ocupacao.estatisticas(),
+        'horarios': cache_horarios.estatisticas(),
+        'configuracao': cache_configuracao.estatisticas(),
+        'principais': cache_principais.estatisticas()
+    })
@@ -0,0 +1,177 @@
+"""Rotas públicas: página de agendamento, login e logout e gravação de agendamentos."""
+
+from datetime import datetime, time
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask_login import login_required
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import check_password_hash
+
+try:
+    from app.modelos import db, Agendamento, Barbeiro, Cliente, Servico, UsuarioAdmin
+    from app.disponibilidade import hora_para_minutos, horario_permitido
+    from app.configuracao import regras_agendamento
+    from app.reservas import (reserva_exclusiva, existe_conflito, invalidar_ocupacao, resposta_conflito,
+                              violacao_sobreposicao)
+    from app.clientes import validar_celular
+    from app.autenticacao import iniciar_sessao, terminar_sessao
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import db, Agendamento, Barbeiro, Cliente, Servico, UsuarioAdmin
+    from disponibilidade import hora_para_minutos, horario_permitido
+    from configuracao import regras_agendamento
+    from reservas import (reserva_exclusiva, existe_conflito, invalidar_ocupacao, resposta_conflito,
+                          violacao_sobreposicao)
+    from clientes import validar_celular
+    from autenticacao import iniciar_sessao, terminar_sessao
+
+
+# Blueprint das páginas e pedidos dos clientes (sem prefixo de URL)
+bp = Blueprint('publico', __name__)
+
+
+# Rota principal - Página de agendamento
+@bp.route('/')
+def index():
+    # Buscar todos os serviços ativos
+    servicos = Servico.query.filter_by(ativo=True).all()
+    
+    # Buscar todos os barbeiros ativos
+    barbeiros = Barbeiro.query.filter_by(ativo=True).all()
+    
+    # A configuração chega ao template pelo context processor
+    return render_template('index.html', servicos=servicos, barbeiros=barbeiros)
+
+
+# Rota de logout
+@bp.route('/logout')
+@login_required
+def logout():
+    terminar_sessao()
+    flash('Logout realizado com sucesso!', 'success')
+    return redirect(url_for('publico.login'))
+
+
+# Rota de login
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        
+        # Buscar usuário no banco de dados
+        usuario = UsuarioAdmin.query.filter_by(email=username).first()
+        
+        # Verificar se o usuário existe, está ativo e a senha está correta
+        if usuario and check_password_hash(usuario.password_hash, password) and iniciar_sessao(usuario):
+            flash('Login realizado com sucesso!', 'success')
+            return redirect(url_for('admin.admin_dashboard'))
+        else:
+            flash('Credenciais inválidas. Por favor, tente novamente.', 'danger')
+    
+    return render_template('login.html')
+
+
+# Rota para finalizar o agendamento
+@bp.route('/agendar', methods=['POST'])
+def agendar():
+    try:
+        # Obter dados do formulário JSON
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'status': 'error', 'message': 'Dados não fornecidos.'}), 400
+        
+        # Validar dados obrigatórios
+        required_fields = ['nome', 'telefone', 'servico_id', 'barbeiro_id', 'data', 'hora_inicio']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'status': 'error', 'message': f'Campo obrigatório não fornecido: {field}'}), 400
+        
+        # Validar o telefone
+        telefone_valido, mensagem_ou_telefone = validar_celular(data['telefone'])
+        if not telefone_valido:
+            return jsonify({'status': 'error', 'message': mensagem_ou_telefone}), 400
+        
+        # Substituir o telefone pelo número limpo
+        data['telefone'] = mensagem_ou_telefone
+        
+        # Buscar o serviço para calcular a hora de fim
+        servico = Servico.query.get(data['servico_id'])
+        if not servico:
+            return jsonify({'status': 'error', 'message': 'Serviço não encontrado.'}), 404
+        
+        # Converter a data e hora
+        data_agendamento = datetime.strptime(data['data'], '%Y-%m-%d').date()
+        hora_inicio = datetime.strptime(data['hora_inicio'], '%H:%M').time()
+        
+        # Respeitar a antecedência mínima e a janela máxima definidas na configuração
+        if not horario_permitido(data_agendamento, hora_para_minutos(hora_inicio), datetime.now(), regras_agendamento()):
+            return jsonify({'status': 'error', 'message': 'Este horário está fora do período permitido para agendamentos.'}), 400
+        
+        # Calcular hora de fim baseado na duração do serviço
+        hora_fim_minutos = hora_inicio.hour * 60 + hora_inicio.minute + servico.duracao_minutos
+        hora_fim = time(hora_fim_minutos // 60, hora_fim_minutos % 60)
+        
+        barbeiro_id = int(data['barbeiro_id'])
+        
+        # Verificar conflitos e gravar o agendamento de forma atómica
+        with reserva_exclusiva(barbeiro_id, data_agendamento):
+            conflito = existe_conflito(barbeiro_id, data_agendamento, hora_inicio, hora_fim)
+            
+            if not conflito:
+                # Verificar se já existe um cliente com este telefone
+                cliente = Cliente.query.filter_by(telefone=data['telefone']).first()
+                
+                # Se não existir, criar um novo cliente
+                if not cliente:
+                    nome_completo = data['nome'].split(' ', 1)
+                    nome = nome_completo[0]
+                    sobrenome = nome_completo[1] if len(nome_completo) > 1 else ''
+                    
+                    cliente = Cliente(
+                        nome=nome,
+                        sobrenome=sobrenome,
+                        email=data.get('email', f'{nome.lower()}{sobrenome.lower()}@exemplo.com'),  # Email padrão se não fornecido
+                        telefone=data['telefone']
+                    )
+                    db.session.add(cliente)
+                    db.session.flush()  # Para obter o ID do cliente sem fazer commit
+                
+                # Criar o agendamento
+                agendamento = Agendamento(
+                    cliente_id=cliente.id,
+                    barbeiro_id=barbeiro_id,
+                    servico_id=data['servico_id'],
+                    data=data_agendamento,
+                    hora_inicio=hora_inicio,
+                    hora_fim=hora_fim,
+                    status='pendente',
+                    observacoes=data.get('observacoes', '')
+                )
+                
+                db.session.add(agendamento)
+                db.session.commit()
+        
+        if conflito:
+            return resposta_conflito(barbeiro_id, data_agendamento, servico.duracao_minutos, hora_inicio, publico=True)
+        
+        invalidar_ocupacao((barbeiro_id, data_agendamento))
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Agendamento realizado com sucesso!',
+            'agendamento_id': agendamento.id
+        })
+        
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro de formato: {str(e)}'}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if violacao_sobreposicao(e):
+            return resposta_conflito(barbeiro_id, data_agendamento, servico.duracao_minutos, hora_inicio, publico=True)
+        return jsonify({'status': 'error', 'message': f'Erro ao realizar agendamento: {str(e)}'}), 500
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Erro ao realizar agendamento: {str(e)}'}), 500
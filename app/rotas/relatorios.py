@@ -0,0 +1,333 @@
+"""Relatórios: financeiro, exportações CSV em streaming e reconstrução da faturação diária."""
+
+from datetime import datetime, time, timedelta
+import csv
+import io
+
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, jsonify, Response,
+                   stream_with_context)
+from flask_login import login_required, current_user
+from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import joinedload
+
+try:
+    from app.modelos import db, Agendamento, Barbeiro, Cliente, FaturacaoDiaria, Servico, METODOS_PAGAMENTO
+    from app.faturacao import reconstruir_faturacao
+    from app.rotas import cursor_agendamento, ler_cursor_agendamento
+except ImportError:
+    # Execução a partir da pasta app/ (flask run), onde os módulos estão no topo
+    from modelos import db, Agendamento, Barbeiro, Cliente, FaturacaoDiaria, Servico, METODOS_PAGAMENTO
+    from faturacao import reconstruir_faturacao
+    from rotas import cursor_agendamento, ler_cursor_agendamento
+
+
+# Blueprint dos relatórios; o comando reconstruir-faturacao fica no topo do CLI (sem grupo)
+bp = Blueprint('relatorios', __name__, cli_group=None)
+
+
+# Comando para reconstruir a faturação diária (flask reconstruir-faturacao)
+@bp.cli.command('reconstruir-faturacao')
+def reconstruir_faturacao_comando():
+    """Recalcula a tabela faturacao_diaria a partir dos agendamentos concluídos."""
+    total = reconstruir_faturacao()
+    print(f"Faturação diária reconstruída: {total} linhas.")
+
+
+# Criar um filtro personalizado para formatação de moeda
+@bp.app_template_filter('format_currency')
+def format_currency(value):
+    if value is None:
+        return "-"
+    return f"{value:.2f}"
+
+# Número de vendas por página no detalhamento financeiro
+REGISTROS_POR_PAGINA_FINANCEIRO = 50
+
+
+# Rota para relatórios financeiros
+@bp.route('/admin/financeiro')
+@login_required
+def admin_financeiro():
+    # Verificar se o usuário é admin
+    if not current_user.is_authenticated or not current_user.is_admin:
+        flash('Você não tem permissão para acessar esta página.', 'danger')
+        return redirect(url_for('publico.login'))
+    
+    # Obter parâmetros de filtro de data
+    data_inicio_str = request.args.get('data_inicio')
+    data_fim_str = request.args.get('data_fim')
+    
+    # Converter strings para objetos de data
+    try:
+        if data_inicio_str:
+            data_inicio = datetime.strptime(data_inicio_str, '%Y-%m-%d').date()
+        else:
+            # Se não houver data de início, usar o primeiro dia do mês atual
+            hoje = datetime.now().date()
+            data_inicio = datetime(hoje.year, hoje.month, 1).date()
+            data_inicio_str = data_inicio.strftime('%Y-%m-%d')
+        
+        if data_fim_str:
+            data_fim = datetime.strptime(data_fim_str, '%Y-%m-%d').date()
+        else:
+            # Se não houver data de fim, usar a data atual
+            data_fim = datetime.now().date()
+            data_fim_str = data_fim.strftime('%Y-%m-%d')
+    except ValueError:
+        flash('Formato de data inválido. Use o formato YYYY-MM-DD.', 'danger')
+        return redirect(url_for('relatorios.admin_financeiro'))
+    
+    # Totais por método de pagamento numa única consulta agrupada à faturação diária
+    totais_por_metodo = {
+        metodo: (quantidade or 0, valor or 0.0)
+        for metodo, quantidade, valor in db.session.query(
+            FaturacaoDiaria.metodo_pagamento,
+            func.sum(FaturacaoDiaria.quantidade),
+            func.sum(FaturacaoDiaria.valor_total)
+        )
+        .filter(
+            FaturacaoDiaria.data >= data_inicio,
+            FaturacaoDiaria.data <= data_fim
+        )
+        .group_by(FaturacaoDiaria.metodo_pagamento)
+        .all()
+    }
+    
+    def total_metodo(metodo):
+        return totais_por_metodo.get(metodo, (0, 0.0))[1]
+    
+    total_registros = sum(quantidade for quantidade, _ in totais_por_metodo.values())
+    # Faturação concluída: apenas as vendas com método de pagamento registado
+    faturacao_total_concluida = sum(
+        valor for metodo, (_, valor) in totais_por_metodo.items() if metodo
+    )
+    
+    # Detalhamento paginado por cursor (data, hora, id) da última linha da página anterior
+    consulta = Agendamento.query.options(
+        joinedload(Agendamento.cliente),
+        joinedload(Agendamento.barbeiro),
+        joinedload(Agendamento.servico)
+    ).filter(
+        Agendamento.status == 'concluído',
+        Agendamento.data >= data_inicio,
+        Agendamento.data <= data_fim
+    )
+    
+    apos = request.args.get('apos')
+    cursor = ler_cursor_agendamento(apos) if apos else None
+    if cursor:
+        cursor_data, cursor_hora, cursor_id = cursor
+        # Mesma ordem da listagem: data decrescente, hora e id crescentes
+        consulta = consulta.filter(or_(
+            Agendamento.data < cursor_data,
+            and_(Agendamento.data == cursor_data, or_(
+                Agendamento.hora_inicio > cursor_hora,
+                and_(Agendamento.hora_inicio == cursor_hora, Agendamento.id > cursor_id)
+            ))
+        ))
+    
+    agendamentos_concluidos = consulta.order_by(
+        Agendamento.data.desc(), Agendamento.hora_inicio, Agendamento.id
+    ).limit(REGISTROS_POR_PAGINA_FINANCEIRO + 1).all()
+    
+    # O registro extra indica se existe uma próxima página
+    proximo_cursor = None
+    if len(agendamentos_concluidos) > REGISTROS_POR_PAGINA_FINANCEIRO:
+        agendamentos_concluidos = agendamentos_concluidos[:REGISTROS_POR_PAGINA_FINANCEIRO]
+        proximo_cursor = cursor_agendamento(agendamentos_concluidos[-1])
+    
+    return render_template(
+        'admin_financeiro.html',
+        agendamentos=agendamentos_concluidos,
+        total_registros=total_registros,
+        proximo_cursor=proximo_cursor,
+        primeira_pagina=cursor is None,
+        total_faturado=faturacao_total_concluida,
+        total_dinheiro=total_metodo('dinheiro'),
+        total_debito=total_metodo('debito'),
+        total_credito=total_metodo('credito'),
+        total_pix=total_metodo('pix'),
+        data_inicio=data_inicio_str,
+        data_fim=data_fim_str
+    )
+
+
+# Número de linhas lidas da base de dados de cada vez nas exportações
+LOTE_EXPORTACAO = 1000
+# Tamanho aproximado, em caracteres, de cada bloco de CSV enviado ao cliente
+BLOCO_EXPORTACAO = 64 * 1024
+
+
+# Função para gerar um CSV em blocos, sem montar o ficheiro completo em memória
+def gerar_csv(cabecalho, linhas):
+    """Gera o CSV (com BOM UTF-8, para abrir corretamente no Excel) bloco a bloco."""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    
+    buffer.write('\ufeff')
+    escritor.writerow(cabecalho)
+    for linha in linhas:
+        escritor.writerow(linha)
+        if buffer.tell() >= BLOCO_EXPORTACAO:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+
+# Função para devolver uma exportação CSV em streaming
+def resposta_csv(nome_ficheiro, cabecalho, linhas):
+    return Response(
+        stream_with_context(gerar_csv(cabecalho, linhas)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={nome_ficheiro}'}
+    )
+
+
+# Função para ler o período (data_inicio, data_fim) opcional das exportações
+def obter_periodo_exportacao():
+    """Devolve (data_inicio, data_fim); cada uma é None se não for indicada. Lança ValueError se inválida."""
+    data_inicio = request.args.get('data_inicio')
+    data_fim = request.args.get('data_fim')
+    return (
+        datetime.strptime(data_inicio, '%Y-%m-%d').date() if data_inicio else None,
+        datetime.strptime(data_fim, '%Y-%m-%d').date() if data_fim else None
+    )
+
+
+# Função para gerar as linhas da exportação de vendas (agendamentos concluídos)
+def linhas_exportacao_vendas(data_inicio=None, data_fim=None):
+    consulta = db.session.query(
+        Agendamento.id, Agendamento.data, Agendamento.hora_inicio,
+        Cliente.nome, Cliente.sobrenome, Barbeiro.nome, Servico.nome,
+        Agendamento.valor_pago, Agendamento.metodo_pagamento
+    ).join(Cliente, Agendamento.cliente_id == Cliente.id).join(
+        Barbeiro, Agendamento.barbeiro_id == Barbeiro.id
+    ).join(
+        Servico, Agendamento.servico_id == Servico.id
+    ).filter(Agendamento.status == 'concluído')
+    
+    if data_inicio:
+        consulta = consulta.filter(Agendamento.data >= data_inicio)
+    if data_fim:
+        consulta = consulta.filter(Agendamento.data <= data_fim)
+    
+    consulta = consulta.order_by(Agendamento.data, Agendamento.hora_inicio, Agendamento.id)
+    
+    for (id, data, hora_inicio, nome, sobrenome, barbeiro, servico,
+         valor_pago, metodo_pagamento) in consulta.yield_per(LOTE_EXPORTACAO):
+        yield (
+            id,
+            data.strftime('%Y-%m-%d'),
+            hora_inicio.strftime('%H:%M'),
+            f"{nome} {sobrenome}".strip(),
+            barbeiro,
+            servico,
+            f"{valor_pago:.2f}" if valor_pago is not None else '',
+            METODOS_PAGAMENTO.get(metodo_pagamento, '')
+        )
+
+
+# Função para gerar as linhas da exportação de agendamentos
+def linhas_exportacao_agendamentos(data_inicio=None, data_fim=None):
+    consulta = db.session.query(
+        Agendamento.id, Agendamento.data, Agendamento.hora_inicio, Agendamento.hora_fim,
+        Agendamento.status, Cliente.nome, Cliente.sobrenome, Cliente.telefone,
+        Barbeiro.nome, Servico.nome, Agendamento.observacoes, Agendamento.data_agendamento
+    ).join(Cliente, Agendamento.cliente_id == Cliente.id).join(
+        Barbeiro, Agendamento.barbeiro_id == Barbeiro.id
+    ).join(
+        Servico, Agendamento.servico_id == Servico.id
+    )
+    
+    if data_inicio:
+        consulta = consulta.filter(Agendamento.data >= data_inicio)
+    if data_fim:
+        consulta = consulta.filter(Agendamento.data <= data_fim)
+    
+    consulta = consulta.order_by(Agendamento.data, Agendamento.hora_inicio, Agendamento.id)
+    
+    for (id, data, hora_inicio, hora_fim, status, nome, sobrenome, telefone,
+         barbeiro, servico, observacoes, data_agendamento) in consulta.yield_per(LOTE_EXPORTACAO):
+        yield (
+            id,
+            data.strftime('%Y-%m-%d'),
+            hora_inicio.strftime('%H:%M'),
+            hora_fim.strftime('%H:%M'),
+            status,
+            f"{nome} {sobrenome}".strip(),
+            telefone or '',
+            barbeiro,
+            servico,
+            observacoes or '',
+            data_agendamento.strftime('%Y-%m-%d %H:%M') if data_agendamento else ''
+        )
+
+
+# Função para gerar as linhas da exportação de clientes (filtrados pela data de cadastro)
+def linhas_exportacao_clientes(data_inicio=None, data_fim=None):
+    consulta = db.session.query(
+        Cliente.id, Cliente.nome, Cliente.sobrenome, Cliente.email,
+        Cliente.telefone, Cliente.data_cadastro
+    )
+    
+    if data_inicio:
+        consulta = consulta.filter(Cliente.data_cadastro >= datetime.combine(data_inicio, time.min))
+    if data_fim:
+        consulta = consulta.filter(Cliente.data_cadastro < datetime.combine(data_fim + timedelta(days=1), time.min))
+    
+    consulta = consulta.order_by(Cliente.id)
+    
+    for id, nome, sobrenome, email, telefone, data_cadastro in consulta.yield_per(LOTE_EXPORTACAO):
+        yield (
+            id,
+            nome,
+            sobrenome,
+            email,
+            telefone or '',
+            data_cadastro.strftime('%Y-%m-%d %H:%M') if data_cadastro else ''
+        )
+
+
+# Exportações disponíveis: nome -> (cabeçalho, função que gera as linhas)
+EXPORTACOES = {
+    'vendas': (
+        ['ID', 'Data', 'Hora', 'Cliente', 'Barbeiro', 'Serviço', 'Valor Pago', 'Método de Pagamento'],
+        linhas_exportacao_vendas
+    ),
+    'agendamentos': (
+        ['ID', 'Data', 'Hora Início', 'Hora Fim', 'Status', 'Cliente', 'Telefone',
+         'Barbeiro', 'Serviço', 'Observações', 'Criado em'],
+        linhas_exportacao_agendamentos
+    ),
+    'clientes': (
+        ['ID', 'Nome', 'Sobrenome', 'Email', 'Telefone', 'Data de Cadastro'],
+        linhas_exportacao_clientes
+    )
+}
+
+
+# Rota para exportar vendas, agendamentos ou clientes em CSV
+@bp.route('/admin/exportar/<tipo>.csv')
+@login_required
+def admin_exportar(tipo):
+    # Verificar se o usuário é admin
+    if not current_user.is_admin:
+        flash('Você não tem permissão para acessar esta página.', 'danger')
+        return redirect(url_for('publico.login'))
+    
+    if tipo not in EXPORTACOES:
+        return jsonify({'status': 'error', 'message': 'Tipo de exportação inválido.'}), 404
+    
+    try:
+        data_inicio, data_fim = obter_periodo_exportacao()
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Formato de data inválido. Use o formato YYYY-MM-DD.'}), 400
+    
+    cabecalho, gerar_linhas = EXPORTACOES[tipo]
+    
+    # Nome do ficheiro com o período exportado (ex: vendas_2025-01-01_2025-01-31.csv)
+    partes = [tipo] + [d.strftime('%Y-%m-%d') for d in (data_inicio, data_fim) if d]
+    
+    return resposta_csv('_'.join(partes) + '.csv', cabecalho, gerar_linhas(data_inicio, data_fim))
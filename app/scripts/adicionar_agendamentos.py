@@ -1,11 +1,12 @@
-from app.app import app, db, Cliente, Barbeiro, Servico, Agendamento
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Cliente, Barbeiro, Servico, Agendamento
 from datetime import datetime, time, timedelta
 
 def adicionar_agendamentos():
     """Adiciona agendamentos de teste, incluindo alguns concluídos para testar o dashboard."""
     print("A adicionar agendamentos de teste...")
     
-    with app.app_context():
+    with create_app(CONFIG_SCRIPTS).app_context():
         # Verificar se já existem agendamentos cadastrados
         if Agendamento.query.count() > 0:
             print("Já existem agendamentos cadastrados.")
@@ -1,11 +1,12 @@
-from app.app import app, db, Barbeiro
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Barbeiro
 from datetime import date
 
 def adicionar_barbeiros():
     """Adiciona barbeiros iniciais ao banco de dados."""
     print("A adicionar barbeiros iniciais...")
     
-    with app.app_context():
+    with create_app(CONFIG_SCRIPTS).app_context():
         # Lista de barbeiros a serem adicionados
         barbeiros = [
             {
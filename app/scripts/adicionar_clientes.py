@@ -1,11 +1,12 @@
-from app.app import app, db, Cliente
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Cliente
 from datetime import datetime
 
 def adicionar_clientes():
     """Adiciona clientes iniciais ao banco de dados."""
     print("A adicionar clientes iniciais...")
     
-    with app.app_context():
+    with create_app(CONFIG_SCRIPTS).app_context():
         # Verifica se já existem clientes cadastrados
         if Cliente.query.count() > 0:
             print("Já existem clientes cadastrados.")
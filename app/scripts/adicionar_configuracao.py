@@ -1,10 +1,11 @@
-from app.app import app, db, Configuracao
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Configuracao
 
 def adicionar_configuracao():
     """Cria uma configuração inicial para a aplicação."""
     print("A adicionar configuração inicial...")
     
-    with app.app_context():
+    with create_app(CONFIG_SCRIPTS).app_context():
         # Verifica se já existe alguma configuração
         config_existente = Configuracao.query.first()
         
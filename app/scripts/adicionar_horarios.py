@@ -1,11 +1,12 @@
-from app.app import app, db, Barbeiro, HorarioFuncionamento
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Barbeiro, HorarioFuncionamento
 from datetime import time
 
 def adicionar_horarios():
     """Adiciona horários de funcionamento para os barbeiros."""
     print("A adicionar horários de funcionamento...")
     
-    with app.app_context():
+    with create_app(CONFIG_SCRIPTS).app_context():
         # Verifica se já existem horários cadastrados
         if HorarioFuncionamento.query.count() > 0:
             print("Já existem horários cadastrados no banco de dados.")
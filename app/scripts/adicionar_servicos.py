@@ -1,10 +1,11 @@
-from app.app import app, db, Servico
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Servico
 
 def adicionar_servicos():
     """Adiciona serviços iniciais ao banco de dados."""
     print("A adicionar serviços iniciais...")
     
-    with app.app_context():
+    with create_app(CONFIG_SCRIPTS).app_context():
         # Lista de serviços a serem adicionados
         servicos = [
             {
@@ -1,11 +1,12 @@
 from werkzeug.security import generate_password_hash
-from app.app import app, db, UsuarioAdmin
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, UsuarioAdmin
 
 def criar_admin():
     """Cria um usuário administrador padrão no banco de dados."""
     print("A adicionar usuário administrador...")
     
-    with app.app_context():
+    with create_app(CONFIG_SCRIPTS).app_context():
         # Verifica se já existe algum administrador
         admin_existente = UsuarioAdmin.query.filter_by(email='admin@barbearia.com').first()
         
@@ -3,6 +3,8 @@ let servicoSelecionado = null;
 let barbeiroSelecionado = null;
 let dataSelecionada = null;
 let horarioSelecionado = null;
+// Barbeiros livres por horário, usado quando o cliente escolhe "qualquer barbeiro"
+let barbeirosPorHorario = {};
 
 // Configurar as datas mínima e máxima com base nas regras de negócio
 document.addEventListener('DOMContentLoaded', function() {
@@ -288,6 +290,7 @@ function carregarHorarios() {
             }
             
             horarioSelect.innerHTML = '';
+            barbeirosPorHorario = {};
             
             if (data.status === 'success') {
                 if (data.horarios_disponiveis && data.horarios_disponiveis.length > 0) {
@@ -303,6 +306,10 @@ function carregarHorarios() {
                         option.value = horario.hora_inicio;
                         option.textContent = `${horario.hora_inicio} - ${horario.hora_fim}`;
                         horarioSelect.appendChild(option);
+                        
+                        if (horario.barbeiros) {
+                            barbeirosPorHorario[horario.hora_inicio] = horario.barbeiros;
+                        }
                     });
                     
                     horarioSelect.disabled = false;
@@ -379,13 +386,24 @@ function finalizarAgendamento() {
         return;
     }
     
+    // Com "qualquer barbeiro", usar o primeiro barbeiro livre no horário escolhido
+    let barbeiroId = barbeiroSelecionado;
+    if (barbeiroSelecionado === 'qualquer') {
+        const barbeirosLivres = barbeirosPorHorario[horarioSelecionado] || [];
+        if (barbeirosLivres.length === 0) {
+            mostrarMensagem('O horário selecionado já não está disponível. Por favor, escolha outro.', 'erro');
+            return;
+        }
+        barbeiroId = barbeirosLivres[0];
+    }
+    
     // Preparar dados para envio
     const dados = {
         nome: nome,
         telefone: telefoneNumeros, // Enviar apenas os números do telefone
         observacoes: observacoes,
         servico_id: servicoSelecionado.id,
-        barbeiro_id: barbeiroSelecionado,
+        barbeiro_id: barbeiroId,
         data: dataSelecionada,
         hora_inicio: horarioSelecionado
     };
@@ -409,7 +427,8 @@ function finalizarAgendamento() {
         body: JSON.stringify(dados)
     })
     .then(response => {
-        if (!response.ok) {
+        // Um conflito de horário (409) também devolve uma resposta JSON
+        if (!response.ok && response.status !== 409) {
             throw new Error('Erro na resposta da rede');
         }
         return response.json();
@@ -428,6 +447,16 @@ function finalizarAgendamento() {
             setTimeout(() => {
                 resetarFormulario();
             }, 3000);
+        } else if (data.horarios_alternativos) {
+            // O horário foi ocupado entretanto: sugerir os horários livres mais próximos
+            const sugestoes = data.horarios_alternativos.map(horario => horario.hora_inicio).join(', ');
+            mostrarMensagem(
+                sugestoes
+                    ? `${data.message} Horários próximos disponíveis: ${sugestoes}.`
+                    : `${data.message} Por favor, escolha outra data.`,
+                'erro'
+            );
+            carregarHorarios();
         } else {
             // Mostrar mensagem de erro
             mostrarMensagem(`Erro ao realizar agendamento: ${data.message}`, 'erro');
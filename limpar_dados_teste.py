@@ -6,7 +6,8 @@ Script para limpar dados de teste da aplicação barbearia_v2.
 Remove todos os registros das tabelas Agendamento e Cliente, preservando outras tabelas.
 """
 
-from app.app import app, db, Agendamento, Cliente
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Agendamento, Cliente, FaturacaoDiaria
 import sys
 
 
@@ -30,7 +31,7 @@ def limpar_dados_teste():
         return False
     
     try:
-        with app.app_context():
+        with create_app(CONFIG_SCRIPTS).app_context():
             # Contar registros antes da limpeza
             total_agendamentos = Agendamento.query.count()
             total_clientes = Cliente.query.count()
@@ -39,6 +40,9 @@ def limpar_dados_teste():
             print(f"\nRemovendo {total_agendamentos} agendamentos...")
             Agendamento.query.delete()
             
+            # A faturação diária é derivada dos agendamentos
+            FaturacaoDiaria.query.delete()
+            
             # Remover todos os clientes
             print(f"Removendo {total_clientes} clientes...")
             Cliente.query.delete()
@@ -45,6 +45,18 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Tabelas criadas diretamente em SQL pelas migrações (índice de busca FTS5 dos
+# clientes e as suas tabelas internas), que não existem nos modelos
+PREFIXOS_TABELAS_IGNORADAS = ('clientes_busca',)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Evitar que o autogenerate proponha remover essas tabelas
+    if type_ == 'table' and reflected and compare_to is None:
+        return not name.startswith(PREFIXOS_TABELAS_IGNORADAS)
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +77,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +106,8 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,46 @@
+"""impedir sobreposicao de agendamentos no postgresql
+
+Revision ID: b73e4361d469
+Revises: 510e9ff16aec
+Create Date: 2026-10-18 17:18:04.493843
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# Nome da restrição que impede dois agendamentos ativos do mesmo barbeiro no mesmo intervalo
+RESTRICAO = 'agendamentos_sem_sobreposicao'
+
+
+# revision identifiers, used by Alembic.
+revision = 'b73e4361d469'
+down_revision = '510e9ff16aec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Só no PostgreSQL: no SQLite as reservas já são serializadas por BEGIN IMMEDIATE
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # O barbeiro é comparado como um intervalo de um só valor (int4range), para
+    # que a restrição use apenas o GiST nativo, sem a extensão btree_gist.
+    # DEFERRABLE INITIALLY DEFERRED: a troca de horários entre dois agendamentos
+    # passa por um estado intermédio sobreposto, verificado só no commit.
+    # Falha se já existirem agendamentos ativos sobrepostos.
+    op.execute(
+        "ALTER TABLE agendamentos ADD CONSTRAINT {} EXCLUDE USING gist ("
+        "int4range(barbeiro_id, barbeiro_id, '[]') WITH &&, "
+        "tsrange(data + hora_inicio, data + hora_fim, '[)') WITH &&"
+        ") WHERE (status IN ('pendente', 'agendado', 'concluído')) "
+        "DEFERRABLE INITIALLY DEFERRED".format(RESTRICAO)
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE agendamentos DROP CONSTRAINT IF EXISTS {}".format(RESTRICAO))
@@ -19,7 +19,7 @@ depends_on = None
 def upgrade():
     # ### commands auto generated by Alembic - please adjust! ###
     with op.batch_alter_table('configuracoes', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('exibir_redes_sociais', sa.Boolean(), server_default=sa.text('0'), nullable=False))
+        batch_op.add_column(sa.Column('exibir_redes_sociais', sa.Boolean(), server_default=sa.false(), nullable=False))
 
     # ### end Alembic commands ###
 
@@ -1,4 +1,7 @@
-from app.app import app, db, UsuarioAdmin
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, UsuarioAdmin
+
+app = create_app(CONFIG_SCRIPTS)
 
 with app.app_context():
     admin = UsuarioAdmin.query.filter_by(email='admin@barbearia.com').first()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para medir o tempo de arranque da aplicação com `python -X importtime`.
+
+Cada cenário corre num processo novo (sem módulos já importados) e importa
+ou cria a aplicação de uma forma diferente: só os modelos, como os scripts
+(sem rotas nem Flask-Migrate), como um worker (rotas sem Flask-Migrate) e a
+aplicação completa. Mostra a mediana do tempo total de importação, o tempo
+até a aplicação estar pronta e os pacotes mais pesados de cada cenário.
+
+Termina com erro se um cenário importar um módulo que não lhe cabe (por
+exemplo, o Alembic num script ou as rotas ao importar só os modelos).
+
+Uso: python verificar_arranque.py [repeticoes]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Repetições padrão de cada cenário
+REPETICOES_PADRAO = 5
+
+# Pacotes mais pesados mostrados por cenário
+PACOTES_MOSTRADOS = 3
+
+# Cenários: nome, código executado e módulos que não podem ser importados
+CENARIOS = [
+    ('Modelos', 'import app.modelos',
+     ('app.rotas', 'flask_migrate', 'alembic')),
+    ('Scripts', 'from app.app import create_app, CONFIG_SCRIPTS; create_app(CONFIG_SCRIPTS)',
+     ('app.rotas.admin', 'flask_migrate', 'alembic')),
+    ('Worker', "from app.app import create_app; create_app({'MIGRACOES': False})",
+     ('flask_migrate', 'alembic')),
+    ('Completa', 'from app.app import create_app; create_app()',
+     ()),
+]
+
+# Linha do -X importtime: "import time: <próprio> | <cumulativo> | <módulo>"
+LINHA_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+# Código que envolve cada cenário para medir o tempo até a aplicação estar pronta
+MEDICAO = 'import time; _inicio = time.perf_counter(); {codigo}; print((time.perf_counter() - _inicio) * 1000)'
+
+
+def executar_cenario(codigo):
+    """
+    Executa o código num processo novo. Devolve (importacao_ms, pronto_ms,
+    cumulativos), onde cumulativos associa cada módulo de topo ao seu tempo
+    cumulativo de importação em milissegundos.
+    """
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', MEDICAO.format(codigo=codigo)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+
+    cumulativos = {}
+    for linha in resultado.stderr.splitlines():
+        correspondencia = LINHA_IMPORTTIME.match(linha)
+        # Só os módulos de topo (sem recuo): o cumulativo já inclui os submódulos
+        if correspondencia and not correspondencia.group(3):
+            cumulativos[correspondencia.group(4)] = int(correspondencia.group(2)) / 1000
+
+    return sum(cumulativos.values()), float(resultado.stdout.strip().splitlines()[-1]), cumulativos
+
+
+def modulos_importados(codigo):
+    """Devolve o conjunto de módulos importados pelo código num processo novo."""
+    resultado = subprocess.run(
+        [sys.executable, '-c', f'import sys; {codigo}; print(" ".join(sys.modules))'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    return set(resultado.stdout.split())
+
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else REPETICOES_PADRAO
+
+    print(f"Mediana de {repeticoes} execuções por cenário\n")
+    print(f"{'Cenário':<12}{'Importação':>14}{'Pronta':>12}   Pacotes mais pesados")
+
+    sucesso = True
+    proibidos_encontrados = []
+    for nome, codigo, proibidos in CENARIOS:
+        medicoes = [executar_cenario(codigo) for _ in range(repeticoes)]
+        importacao = statistics.median(medicao[0] for medicao in medicoes)
+        pronto = statistics.median(medicao[1] for medicao in medicoes)
+
+        # Os pacotes mais pesados da última execução
+        pesados = sorted(medicoes[-1][2].items(), key=lambda item: item[1], reverse=True)[:PACOTES_MOSTRADOS]
+        descricao = ', '.join(f'{modulo} {tempo:.0f}ms' for modulo, tempo in pesados)
+        print(f"{nome:<12}{importacao:>12.0f}ms{pronto:>10.0f}ms   {descricao}")
+
+        importados = modulos_importados(codigo)
+        for modulo in proibidos:
+            if modulo in importados:
+                proibidos_encontrados.append((nome, modulo))
+                sucesso = False
+
+    for nome, modulo in proibidos_encontrados:
+        print(f"\nERRO: O cenário {nome} importou {modulo}.")
+
+    if sucesso:
+        print("\nCada cenário importa apenas os módulos de que precisa.")
+
+    sys.exit(0 if sucesso else 1)
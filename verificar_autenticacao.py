@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para verificar que os pedidos autenticados não consultam usuarios_admin.
+
+Cria um administrador fictício, faz login e mede a latência de pedidos
+autenticados a uma rota leve do painel, contando as consultas à tabela
+usuarios_admin: com o principal na sessão e o carimbo em cache, e sem
+cache (TTL zero, uma consulta por pedido, como antes). Depois verifica que
+a sessão termina quando a senha ou a função mudam (pelo ORM, ou noutro
+processo após o TTL) e que um utilizador inativo não consegue entrar.
+No fim, o administrador fictício é apagado.
+
+Uso: python verificar_autenticacao.py [numero_de_pedidos]
+"""
+
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+
+from app.app import create_app
+from app.autenticacao import cache_principais
+from app.modelos import db, UsuarioAdmin
+
+# Pedidos autenticados por cenário
+PEDIDOS_PADRAO = 2000
+
+# Rota leve do painel, protegida por login
+ROTA = '/api/cache/estatisticas'
+
+SENHA = 'senha-de-teste'
+
+# Aplicação com as rotas do painel, sem o Flask-Migrate
+app = create_app({'MIGRACOES': False})
+
+
+def contar_consultas(contador):
+    """Conta as instruções SQL que leem ou alteram usuarios_admin."""
+    def antes_de_executar(conexao, cursor, instrucao, parametros, contexto, executemany):
+        if 'usuarios_admin' in instrucao:
+            contador[0] += 1
+    return antes_de_executar
+
+
+def entrar(cliente, email, senha=SENHA):
+    """Faz login pelo formulário. Devolve True se foi redirecionado para o dashboard."""
+    resposta = cliente.post('/login', data={'username': email, 'password': senha})
+    return resposta.status_code == 302 and resposta.headers['Location'].endswith('/admin/dashboard')
+
+
+def autenticado(cliente):
+    """Devolve True se a rota protegida responde sem redirecionar para o login."""
+    return cliente.get(ROTA).status_code == 200
+
+
+def medir(cliente, pedidos, contador):
+    """Mede a latência de `pedidos` pedidos autenticados. Devolve (mediana_ms, consultas por pedido)."""
+    contador[0] = 0
+    latencias = []
+    for _ in range(pedidos):
+        inicio = time.perf_counter()
+        resposta = cliente.get(ROTA)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        if resposta.status_code != 200:
+            raise RuntimeError(f'Pedido autenticado recusado: {resposta.status_code}')
+    return statistics.median(latencias), contador[0] / pedidos
+
+
+def alterar_pelo_orm(usuario_id, **valores):
+    """Altera o utilizador pelo ORM, como uma rota da aplicação."""
+    with app.app_context():
+        usuario = db.session.get(UsuarioAdmin, usuario_id)
+        for campo, valor in valores.items():
+            setattr(usuario, campo, valor)
+        db.session.commit()
+
+
+def alterar_noutro_processo(usuario_id, **valores):
+    """Altera o utilizador sem passar pelo ORM, como um script noutro processo."""
+    with app.app_context():
+        db.session.execute(UsuarioAdmin.__table__.update().where(UsuarioAdmin.id == usuario_id).values(**valores))
+        db.session.commit()
+
+
+if __name__ == "__main__":
+    pedidos = int(sys.argv[1]) if len(sys.argv) > 1 else PEDIDOS_PADRAO
+    ttl_padrao = app.config['CACHE_PRINCIPAL_TTL']
+
+    # Cada pedido do cliente de testes abre o seu próprio contexto, como num servidor
+    contador = [0]
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', contar_consultas(contador))
+
+        email = f'autenticacao.{uuid.uuid4().hex}@teste.local'
+        usuario = UsuarioAdmin(nome='Teste', email=email, username='teste', funcao='utilizador', ativo=True,
+                               password_hash=generate_password_hash(SENHA))
+        db.session.add(usuario)
+        db.session.commit()
+        usuario_id = usuario.id
+
+    verificacoes = []
+    try:
+        cliente = app.test_client()
+        verificacoes.append(('Login pelo formulário', entrar(cliente, email)))
+
+        mediana_cache, consultas_cache = medir(cliente, pedidos, contador)
+        # Sem cache: o carimbo guardado no login também tem de ser descartado
+        cache_principais.ttl_segundos = 0
+        cache_principais.limpar()
+        mediana_sem_cache, consultas_sem_cache = medir(cliente, pedidos, contador)
+        cache_principais.ttl_segundos = ttl_padrao
+
+        print(f"{pedidos} pedidos autenticados a {ROTA}\n")
+        print(f"{'Cenário':<28}{'Mediana':>10}{'Consultas/pedido':>18}")
+        print(f"{'Principal na sessão':<28}{mediana_cache:>8.3f}ms{consultas_cache:>18.2f}")
+        print(f"{'Sem cache (TTL 0)':<28}{mediana_sem_cache:>8.3f}ms{consultas_sem_cache:>18.2f}\n")
+        verificacoes.append(('Pedidos sem consultar usuarios_admin', consultas_cache == 0))
+
+        # Senha alterada pelo ORM: o cache do processo é invalidado de imediato
+        alterar_pelo_orm(usuario_id, password_hash=generate_password_hash('outra-senha'))
+        verificacoes.append(('Sessão termina ao mudar a senha', not autenticado(cliente)))
+        verificacoes.append(('Login com a senha antiga recusado', not entrar(cliente, email)))
+        verificacoes.append(('Login com a senha nova', entrar(cliente, email, 'outra-senha')))
+
+        # Função alterada noutro processo: aceite até o carimbo expirar no cache
+        alterar_noutro_processo(usuario_id, funcao='super_admin')
+        verificacoes.append(('Sessão aceite dentro do TTL', autenticado(cliente)))
+        cache_principais.invalidar(usuario_id)
+        verificacoes.append(('Sessão termina após o TTL ao mudar a função', not autenticado(cliente)))
+
+        # Utilizador desativado não consegue entrar
+        alterar_noutro_processo(usuario_id, ativo=False)
+        verificacoes.append(('Login de utilizador inativo recusado', not entrar(cliente, email, 'outra-senha')))
+    finally:
+        cache_principais.ttl_segundos = ttl_padrao
+        with app.app_context():
+            db.session.delete(db.session.get(UsuarioAdmin, usuario_id))
+            db.session.commit()
+
+    for descricao, aprovado in verificacoes:
+        print(f"[{'OK' if aprovado else 'ERRO'}] {descricao}")
+
+    sucesso = all(aprovado for _, aprovado in verificacoes)
+    if sucesso:
+        print("\nOs pedidos autenticados não consultam usuarios_admin e as alterações terminam as sessões.")
+    else:
+        print("\nERRO: A autenticação não se comportou como esperado.")
+
+    sys.exit(0 if sucesso else 1)
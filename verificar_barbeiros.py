@@ -1,4 +1,7 @@
-from app.app import app, db, Barbeiro
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Barbeiro
+
+app = create_app(CONFIG_SCRIPTS)
 
 with app.app_context():
     print('Barbeiros existentes:')
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para medir a latência da busca rápida de clientes (/api/clientes/buscar).
+
+Insere clientes fictícios numa transação que nunca é confirmada (os
+triggers mantêm o índice de busca atualizado dentro da mesma transação),
+executa buscas típicas por nome e por telefone e mostra a mediana e o
+percentil 95 de cada uma. No fim, a transação é desfeita e a base de dados
+fica como estava.
+
+Uso: python verificar_busca_clientes.py [numero_de_clientes]
+"""
+
+import random
+import sys
+import time
+
+from app.app import create_app, CONFIG_SCRIPTS
+from app.clientes import buscar_clientes, busca_fts_disponivel
+from app.modelos import db, Cliente
+
+# Latência máxima tolerada (percentil 95) por busca, em milissegundos
+LIMITE_P95_MS = 50
+
+# Repetições de cada busca
+REPETICOES = 50
+
+NOMES = ['Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Fábio', 'Gabriela', 'Hugo',
+         'Inês', 'João', 'Kátia', 'Luís', 'Mariana', 'Nuno', 'Otávio', 'Paula',
+         'Rafael', 'Sofia', 'Tiago', 'Vitória']
+SOBRENOMES = ['Almeida', 'Barbosa', 'Conceição', 'Dias', 'Esteves', 'Ferreira',
+              'Gonçalves', 'Henriques', 'Lopes', 'Martins', 'Nogueira', 'Oliveira',
+              'Pereira', 'Ribeiro', 'Santos', 'Teixeira']
+
+# Buscas típicas do formulário de agendamento
+BUSCAS = ['ma', 'mariana', 'joao', 'ana oli', 'rafael conceicao', '8799', '(87) 99812', 'x']
+
+
+def inserir_clientes_ficticios(total, lote=10000):
+    """Insere `total` clientes na transação atual, sem confirmar."""
+    aleatorio = random.Random(42)
+    inseridos = 0
+    while inseridos < total:
+        linhas = []
+        for i in range(inseridos, min(inseridos + lote, total)):
+            linhas.append({
+                'nome': aleatorio.choice(NOMES),
+                'sobrenome': aleatorio.choice(SOBRENOMES),
+                'email': f'cliente{i}@teste.invalid',
+                'telefone': f'(87) 9{aleatorio.randint(0, 99999999):08d}'
+            })
+        db.session.execute(Cliente.__table__.insert(), linhas)
+        inseridos += len(linhas)
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(int(len(ordenados) * p), len(ordenados) - 1)]
+
+
+def verificar_busca(total):
+    """Mede as buscas e devolve True se todas ficaram abaixo do limite."""
+    print(f"Índice FTS5 disponível: {'sim' if busca_fts_disponivel() else 'não (ILIKE)'}")
+    print(f"Inserindo {total} clientes fictícios (a transação será desfeita no fim)...")
+    inserir_clientes_ficticios(total)
+
+    sucesso = True
+    print(f"\n{'Busca':<20} {'Resultados':>10} {'Mediana':>10} {'P95':>10}")
+    for termo in BUSCAS:
+        tempos = []
+        for _ in range(REPETICOES):
+            inicio = time.perf_counter()
+            clientes = buscar_clientes(termo)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+            # Descartar os objetos carregados, como num novo pedido
+            db.session.expunge_all()
+
+        mediana = percentil(tempos, 0.5)
+        p95 = percentil(tempos, 0.95)
+        estado = 'ERRO' if p95 > LIMITE_P95_MS else 'OK'
+        print(f"{termo!r:<20} {len(clientes):>10} {mediana:>8.2f}ms {p95:>8.2f}ms  [{estado}]")
+        if p95 > LIMITE_P95_MS:
+            sucesso = False
+
+    return sucesso
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with create_app(CONFIG_SCRIPTS).app_context():
+        try:
+            sucesso = verificar_busca(total)
+        finally:
+            db.session.rollback()
+
+    if sucesso:
+        print(f"\nTodas as buscas ficaram abaixo de {LIMITE_P95_MS} ms (P95).")
+    else:
+        print(f"\nERRO: Existem buscas acima de {LIMITE_P95_MS} ms (P95).")
+
+    sys.exit(0 if sucesso else 1)
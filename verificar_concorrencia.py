@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para verificar o controlo de concorrência dos agendamentos (coluna versao).
+
+Cria um cliente e agendamentos fictícios (confirmados na base de dados,
+porque cada thread usa a sua própria ligação) e verifica que:
+
+- quando várias threads alteram o mesmo agendamento pelas rotas da agenda
+  (concluir, cancelar, reagendar e ações em lote) enviando a mesma versão,
+  exatamente um pedido é aceite e os outros recebem o estado atual;
+- quando várias threads leem o mesmo agendamento e só depois gravam, apenas
+  a primeira gravação passa e as outras falham com StaleDataError.
+
+No fim, os dados fictícios são apagados.
+
+Uso: python verificar_concorrencia.py [numero_de_threads]
+"""
+
+from datetime import datetime, time, timedelta
+import sys
+import threading
+import uuid
+
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.app import create_app
+from app.faturacao import registrar_faturacao
+from app.modelos import db, Agendamento, Barbeiro, Cliente, FaturacaoDiaria, Servico, UsuarioAdmin
+
+# Aplicação com as rotas da agenda, sem o Flask-Migrate
+app = create_app({'MIGRACOES': False})
+
+# Número de threads padrão em cada verificação
+THREADS_PADRAO = 8
+
+# Repetições de cada verificação, para expor corridas que só acontecem às vezes
+REPETICOES = 5
+
+
+def criar_agendamentos(total):
+    """Cria um cliente e `total` agendamentos em dias distintos. Devolve (cliente_id, ids)."""
+    barbeiro = Barbeiro.query.filter_by(ativo=True).first()
+    servico = Servico.query.filter_by(ativo=True).first()
+    if barbeiro is None or servico is None:
+        raise RuntimeError('É necessário pelo menos um barbeiro e um serviço ativos.')
+
+    cliente = Cliente(nome='Teste', sobrenome='Concorrência', email=f'concorrencia.{uuid.uuid4().hex}@teste.local')
+    db.session.add(cliente)
+    db.session.flush()
+
+    # Datas fora da janela de agendamento, para não colidir com a agenda real
+    primeira_data = datetime.now().date() + timedelta(days=400)
+    fim = 10 * 60 + servico.duracao_minutos
+    agendamentos = [
+        Agendamento(
+            cliente_id=cliente.id,
+            barbeiro_id=barbeiro.id,
+            servico_id=servico.id,
+            data=primeira_data + timedelta(days=indice),
+            hora_inicio=time(10, 0),
+            hora_fim=time(fim // 60, fim % 60),
+            status='agendado'
+        )
+        for indice in range(total)
+    ]
+    db.session.add_all(agendamentos)
+    db.session.commit()
+    return cliente.id, [agendamento.id for agendamento in agendamentos]
+
+
+def apagar_agendamentos(cliente_id, ids):
+    """Apaga os dados fictícios, retirando-os também da faturação diária."""
+    datas = set()
+    for agendamento in Agendamento.query.filter(Agendamento.id.in_(ids)):
+        registrar_faturacao(agendamento, -1)
+        datas.add(agendamento.data)
+        db.session.delete(agendamento)
+    db.session.flush()
+    FaturacaoDiaria.query.filter(
+        FaturacaoDiaria.data.in_(datas),
+        FaturacaoDiaria.quantidade == 0
+    ).delete(synchronize_session=False)
+    db.session.delete(db.session.get(Cliente, cliente_id))
+    db.session.commit()
+
+
+def cliente_autenticado(admin_id):
+    """Devolve um cliente de testes do Flask com a sessão de um administrador."""
+    cliente = app.test_client()
+    with cliente.session_transaction() as sessao:
+        sessao['_user_id'] = str(admin_id)
+        sessao['_fresh'] = True
+    return cliente
+
+
+def em_paralelo(tarefas):
+    """Executa cada tarefa (função sem argumentos) numa thread, todas ao mesmo tempo. Devolve os resultados."""
+    barreira = threading.Barrier(len(tarefas))
+    resultados = [None] * len(tarefas)
+
+    def executar(indice, tarefa):
+        barreira.wait()
+        resultados[indice] = tarefa()
+
+    threads = [threading.Thread(target=executar, args=(indice, tarefa)) for indice, tarefa in enumerate(tarefas)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resultados
+
+
+def pedidos_concorrentes(admin_id, agendamento_id, versao, total):
+    """Pedidos de rotas diferentes que alteram o mesmo agendamento a partir da mesma versão."""
+    data_futura = (datetime.now().date() + timedelta(days=399)).strftime('%Y-%m-%d')
+    modelos = [
+        ('post', f'/admin/agendamento/concluir/{agendamento_id}', {'valor_pago': '25', 'metodo_pagamento': 'pix', 'versao': versao}),
+        ('post', f'/agendamento/cancelar/{agendamento_id}', {'versao': versao}),
+        ('post', f'/agendamento/reagendar/{agendamento_id}', {'data': data_futura, 'hora_inicio': '15:00', 'versao': versao}),
+        ('post', '/admin/agendamento/lote', {'acao': 'concluir', 'ids': [agendamento_id], 'metodo_pagamento': 'pix', 'versoes': {str(agendamento_id): versao}}),
+    ]
+    pedidos = []
+    for indice in range(total):
+        metodo, url, corpo = modelos[indice % len(modelos)]
+        cliente = cliente_autenticado(admin_id)
+        pedidos.append(lambda cliente=cliente, metodo=metodo, url=url, corpo=corpo: getattr(cliente, metodo)(url, json=corpo))
+    return pedidos
+
+
+def verificar_rotas(admin_id, agendamento_id, threads):
+    """Dispara os pedidos em paralelo. Devolve True se exatamente um foi aceite."""
+    agendamento = db.session.get(Agendamento, agendamento_id)
+    versao = agendamento.versao
+    db.session.rollback()
+
+    respostas = em_paralelo(pedidos_concorrentes(admin_id, agendamento_id, versao, threads))
+    aceites = [resposta for resposta in respostas if resposta.status_code == 200 and resposta.get_json()['status'] == 'success']
+    recusadas = [resposta for resposta in respostas if resposta not in aceites]
+
+    db.session.expire_all()
+    agendamento = db.session.get(Agendamento, agendamento_id)
+    faturacao = db.session.query(db.func.coalesce(db.func.sum(FaturacaoDiaria.quantidade), 0)).filter(
+        FaturacaoDiaria.data == agendamento.data
+    ).scalar()
+
+    codigos = sorted(resposta.status_code for resposta in recusadas)
+    print(f"       aceites: {len(aceites)}, recusadas: {len(recusadas)} {codigos}, "
+          f"versão {versao} -> {agendamento.versao}, status {agendamento.status}")
+
+    return (
+        len(aceites) == 1
+        and all(resposta.status_code in (200, 409) for resposta in recusadas)
+        and agendamento.versao == versao + 1
+        and faturacao == (1 if agendamento.status == 'concluído' else 0)
+    )
+
+
+def verificar_update_com_versao(agendamento_id, threads):
+    """Todas as threads leem a mesma versão antes de gravar. Devolve True se só uma gravação passou."""
+    barreira = threading.Barrier(threads)
+
+    def alterar(indice):
+        with app.app_context():
+            agendamento = db.session.get(Agendamento, agendamento_id)
+            agendamento.observacoes = f'Alterado pela thread {indice}'
+            barreira.wait()
+            try:
+                db.session.commit()
+                return True
+            except StaleDataError:
+                db.session.rollback()
+                return False
+
+    resultados = em_paralelo([lambda indice=indice: alterar(indice) for indice in range(threads)])
+    print(f"       gravações aceites: {resultados.count(True)}, conflitos: {resultados.count(False)}")
+    return resultados.count(True) == 1
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else THREADS_PADRAO
+
+    with app.app_context():
+        admin = UsuarioAdmin.query.first()
+        if admin is None:
+            print("ERRO: É necessário um utilizador administrador.")
+            sys.exit(1)
+        admin_id = admin.id
+
+        cliente_id, ids = criar_agendamentos(2 * REPETICOES)
+        sucesso = True
+        try:
+            for repeticao in range(REPETICOES):
+                aprovado = verificar_rotas(admin_id, ids[repeticao], threads)
+                print(f"[{'OK' if aprovado else 'ERRO'}] Rotas da agenda com {threads} threads ({repeticao + 1}/{REPETICOES})")
+                sucesso = sucesso and aprovado
+
+            for repeticao in range(REPETICOES):
+                aprovado = verificar_update_com_versao(ids[REPETICOES + repeticao], threads)
+                print(f"[{'OK' if aprovado else 'ERRO'}] UPDATE com versão com {threads} threads ({repeticao + 1}/{REPETICOES})")
+                sucesso = sucesso and aprovado
+        finally:
+            db.session.rollback()
+            apagar_agendamentos(cliente_id, ids)
+
+    if sucesso:
+        print("\nCada alteração concorrente foi aceite uma única vez.")
+    else:
+        print("\nERRO: Houve alterações concorrentes aceites mais de uma vez.")
+
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para verificar o motor de disponibilidade contra uma referência ingénua.
+
+Gera, com uma semente fixa, casos aleatórios: expediente, duração do serviço,
+passo, tempo de preparação, antecedência mínima, agendamentos (sobrepostos,
+encostados ou fora do expediente) e exceções de horário da barbearia e de
+vários barbeiros ao longo de vários dias. Para cada caso compara, com uma
+referência que marca minuto a minuto os minutos ocupados:
+
+- mesclar_intervalos: os mesmos minutos, com intervalos ordenados e separados;
+- IndiceExcecoes.intervalos: os minutos bloqueados de cada barbeiro e data;
+- calcular_horarios_livres: exatamente os mesmos horários livres;
+- intervalo_livre: a mesma resposta para intervalos aleatórios.
+
+Em caso de diferença, mostra a semente e o primeiro caso que falhou.
+
+Uso: python verificar_disponibilidade.py [numero_de_casos] [semente]
+"""
+
+from datetime import date, timedelta
+import random
+import sys
+
+from app.disponibilidade import (
+    MINUTOS_POR_DIA, IndiceExcecoes, calcular_horarios_livres, intervalo_livre, mesclar_intervalos
+)
+
+# Casos gerados por padrão
+CASOS_PADRAO = 2000
+
+# Semente padrão, para que uma falha possa ser reproduzida
+SEMENTE_PADRAO = 20240601
+
+# Barbeiros dos casos gerados (None representa a barbearia inteira nas exceções)
+BARBEIROS = (1, 2, 3)
+
+# Primeiro dia e número de dias cobertos pelas exceções geradas
+DATA_BASE = date(2024, 6, 3)
+DIAS = 10
+
+# Intervalos aleatórios testados com intervalo_livre em cada caso
+INTERVALOS_POR_CASO = 30
+
+
+def minutos_de(intervalos):
+    """Referência: conjunto dos minutos cobertos pelos intervalos [inicio, fim)."""
+    return {minuto for inicio, fim in intervalos for minuto in range(inicio, fim)}
+
+
+def intervalo_aleatorio(gerador, minimo=0, maximo=MINUTOS_POR_DIA, duracao_maxima=180):
+    """Devolve um intervalo (inicio, fim) com pelo menos um minuto, alinhado a 5 minutos na maioria dos casos."""
+    if gerador.random() < 0.8:
+        inicio = gerador.randrange(minimo, maximo, 5)
+        duracao = gerador.randrange(5, duracao_maxima + 1, 5)
+    else:
+        inicio = gerador.randrange(minimo, maximo)
+        duracao = gerador.randint(1, duracao_maxima)
+    return inicio, inicio + duracao
+
+
+def gerar_excecoes(gerador):
+    """Gera exceções (barbeiro_id, data_inicio, data_fim, inicio, fim): folgas de dias inteiros e pausas."""
+    excecoes = []
+    for _ in range(gerador.randint(0, 8)):
+        ambito = gerador.choice(BARBEIROS + (None,))
+        data_inicio = DATA_BASE + timedelta(days=gerador.randrange(DIAS))
+        data_fim = data_inicio + timedelta(days=gerador.choice((0, 0, 0, 1, 3)))
+        if gerador.random() < 0.3:
+            inicio, fim = 0, MINUTOS_POR_DIA
+        else:
+            inicio, fim = intervalo_aleatorio(gerador, 6 * 60, 20 * 60, 240)
+        excecoes.append((ambito, data_inicio, data_fim, inicio, fim))
+    return excecoes
+
+
+def bloqueados_ingenuo(excecoes, barbeiro_id, data):
+    """Referência: minutos bloqueados pelas exceções do barbeiro e da barbearia na data."""
+    return minutos_de(
+        (inicio, fim) for ambito, data_inicio, data_fim, inicio, fim in excecoes
+        if ambito in (barbeiro_id, None) and data_inicio <= data <= data_fim
+    )
+
+
+def horarios_livres_ingenuo(inicio_expediente, fim_expediente, duracao, agendamentos, passo, minimo_inicio,
+                            preparacao, bloqueados):
+    """
+    Referência: percorre a grelha do expediente e aceita cada horário cujos
+    minutos não estejam ocupados por um agendamento alargado pela preparação
+    nem bloqueados por uma exceção.
+    """
+    ocupados = minutos_de((inicio - preparacao, fim + preparacao) for inicio, fim in agendamentos) | bloqueados
+    livres = []
+    for inicio in range(inicio_expediente, fim_expediente, passo):
+        fim = inicio + duracao
+        if fim > fim_expediente or (minimo_inicio is not None and inicio < minimo_inicio):
+            continue
+        if not any(minuto in ocupados for minuto in range(inicio, fim)):
+            livres.append((inicio, fim))
+    return livres
+
+
+def verificar_caso(gerador):
+    """Gera e verifica um caso. Devolve uma lista de descrições das diferenças (vazia se o caso passou)."""
+    erros = []
+
+    inicio_expediente = gerador.randrange(6 * 60, 11 * 60, 15)
+    fim_expediente = gerador.randrange(inicio_expediente + 60, 23 * 60, 15)
+    duracao = gerador.choice((15, 20, 30, 45, 60, 90))
+    passo = gerador.choice((5, 10, 15, 20, 30, 60))
+    preparacao = gerador.choice((0, 0, 5, 10, 15))
+    minimo_inicio = gerador.choice((None, None, gerador.randrange(inicio_expediente - 60, fim_expediente + 60)))
+    agendamentos = [
+        intervalo_aleatorio(gerador, inicio_expediente - 60, fim_expediente + 30, 120)
+        for _ in range(gerador.randint(0, 12))
+    ]
+    excecoes = gerar_excecoes(gerador)
+    barbeiro_id = gerador.choice(BARBEIROS)
+    data = DATA_BASE + timedelta(days=gerador.randrange(DIAS))
+
+    # Intervalos mesclados: mesmos minutos, ordenados e sem sobreposições nem encostos
+    mesclados = mesclar_intervalos(agendamentos)
+    if minutos_de(mesclados) != minutos_de(agendamentos):
+        erros.append(f'mesclar_intervalos({agendamentos}) = {mesclados} não cobre os mesmos minutos')
+    if any(fim >= seguinte for (_, fim), (seguinte, _) in zip(mesclados, mesclados[1:])):
+        erros.append(f'mesclar_intervalos({agendamentos}) = {mesclados} não está ordenado e separado')
+
+    # Exceções: o índice devolve os mesmos minutos bloqueados que a referência
+    bloqueados = IndiceExcecoes(excecoes).intervalos(barbeiro_id, data)
+    esperados = bloqueados_ingenuo(excecoes, barbeiro_id, data)
+    if minutos_de(bloqueados) != esperados:
+        erros.append(f'IndiceExcecoes({excecoes}).intervalos({barbeiro_id}, {data}) = {bloqueados}')
+
+    # Horários livres: exatamente os mesmos da referência
+    livres = calcular_horarios_livres(
+        inicio_expediente, fim_expediente, duracao, mesclados,
+        passo=passo, minimo_inicio=minimo_inicio, preparacao=preparacao, bloqueados=bloqueados
+    )
+    esperados_livres = horarios_livres_ingenuo(
+        inicio_expediente, fim_expediente, duracao, agendamentos, passo, minimo_inicio, preparacao, esperados
+    )
+    if livres != esperados_livres:
+        erros.append(
+            f'calcular_horarios_livres(expediente={inicio_expediente}-{fim_expediente}, duracao={duracao}, '
+            f'passo={passo}, minimo_inicio={minimo_inicio}, preparacao={preparacao}, '
+            f'ocupados={mesclados}, bloqueados={bloqueados}) = {livres}, esperado {esperados_livres}'
+        )
+
+    # Intervalo livre: mesma resposta que a referência, dentro e fora dos ocupados
+    ocupados = mesclar_intervalos(mesclados + bloqueados)
+    minutos_ocupados = minutos_de(ocupados)
+    for _ in range(INTERVALOS_POR_CASO):
+        inicio, fim = intervalo_aleatorio(gerador, inicio_expediente - 60, fim_expediente + 30, 120)
+        esperado = not any(minuto in minutos_ocupados for minuto in range(inicio, fim))
+        if intervalo_livre(inicio, fim, ocupados) != esperado:
+            erros.append(f'intervalo_livre({inicio}, {fim}, {ocupados}) = {not esperado}, esperado {esperado}')
+            break
+
+    return erros
+
+
+if __name__ == "__main__":
+    casos = int(sys.argv[1]) if len(sys.argv) > 1 else CASOS_PADRAO
+    semente = int(sys.argv[2]) if len(sys.argv) > 2 else SEMENTE_PADRAO
+
+    gerador = random.Random(semente)
+    falhas = 0
+    for numero in range(casos):
+        erros = verificar_caso(gerador)
+        if erros:
+            falhas += 1
+            if falhas == 1:
+                print(f"[ERRO] Caso {numero} (semente {semente}):")
+                for erro in erros:
+                    print(f"  {erro}")
+
+    print(f"{casos} casos aleatórios (semente {semente}): {casos - falhas} iguais à referência, {falhas} diferentes")
+
+    sucesso = falhas == 0
+    if sucesso:
+        print("\n[OK] O motor de disponibilidade coincide com a referência minuto a minuto.")
+    else:
+        print("\nERRO: O motor de disponibilidade difere da referência minuto a minuto.")
+
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para verificar que as exportações CSV usam memória constante.
+
+Insere agendamentos concluídos fictícios numa transação que nunca é
+confirmada, consome a exportação de vendas completa e mede a memória
+residente (RSS) do processo ao longo da exportação. No fim, a transação é
+desfeita e a base de dados fica como estava.
+
+Uso: python verificar_exportacao.py [numero_de_linhas]
+"""
+
+from datetime import date, time, timedelta
+import os
+import resource
+import sys
+
+from app.app import create_app, CONFIG_SCRIPTS
+from app.modelos import db, Agendamento, Barbeiro, Cliente, Servico
+from app.rotas.relatorios import EXPORTACOES, gerar_csv
+
+# Crescimento máximo de memória tolerado durante a exportação, em MB
+LIMITE_CRESCIMENTO_MB = 50
+
+
+def memoria_residente_mb():
+    """Devolve a memória residente atual do processo, em MB."""
+    try:
+        with open('/proc/self/statm') as statm:
+            paginas = int(statm.read().split()[1])
+        return paginas * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        # Sem /proc (ex: macOS): usar o pico de memória do processo
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def inserir_vendas_ficticias(total, lote=10000):
+    """Insere `total` agendamentos concluídos na transação atual, sem confirmar."""
+    cliente = Cliente.query.first()
+    barbeiro = Barbeiro.query.first()
+    servico = Servico.query.first()
+    if not (cliente and barbeiro and servico):
+        raise RuntimeError('É necessário ter pelo menos um cliente, um barbeiro e um serviço.')
+
+    inicio = date(2000, 1, 1)
+    metodos = ['dinheiro', 'debito', 'credito', 'pix']
+    inseridos = 0
+    while inseridos < total:
+        linhas = []
+        for i in range(inseridos, min(inseridos + lote, total)):
+            linhas.append({
+                'cliente_id': cliente.id,
+                'barbeiro_id': barbeiro.id,
+                'servico_id': servico.id,
+                'data': inicio + timedelta(days=i // 20),
+                'hora_inicio': time(8 + (i % 20) // 2, 30 * (i % 2)),
+                'hora_fim': time(9 + (i % 20) // 2, 30 * (i % 2)),
+                'status': 'concluído',
+                'valor_pago': 25.0,
+                'metodo_pagamento': metodos[i % len(metodos)]
+            })
+        db.session.execute(Agendamento.__table__.insert(), linhas)
+        inseridos += len(linhas)
+
+
+def verificar_exportacao(total):
+    """Exporta as vendas e devolve True se a memória se manteve estável."""
+    print(f"Inserindo {total} vendas fictícias (a transação será desfeita no fim)...")
+    inserir_vendas_ficticias(total)
+
+    cabecalho, gerar_linhas = EXPORTACOES['vendas']
+    intervalo = max(total // 10, 1)
+    linhas = 0
+    tamanho = 0
+    medicoes = []
+
+    def contar(linhas_geradas):
+        nonlocal linhas
+        for linha in linhas_geradas:
+            linhas += 1
+            if linhas % intervalo == 0:
+                medicoes.append((linhas, memoria_residente_mb()))
+            yield linha
+
+    memoria_inicial = memoria_residente_mb()
+    for bloco in gerar_csv(cabecalho, contar(gerar_linhas())):
+        tamanho += len(bloco)
+
+    print(f"\n{linhas} linhas exportadas ({tamanho / (1024 * 1024):.1f} MB de CSV)")
+    print(f"RSS inicial: {memoria_inicial:.1f} MB")
+    for numero, memoria in medicoes:
+        print(f"  {numero:>9} linhas: RSS {memoria:.1f} MB")
+
+    crescimento = max((memoria for _, memoria in medicoes), default=memoria_inicial) - memoria_inicial
+    print(f"Crescimento máximo: {crescimento:.1f} MB (limite: {LIMITE_CRESCIMENTO_MB} MB)")
+    return crescimento <= LIMITE_CRESCIMENTO_MB
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    with create_app(CONFIG_SCRIPTS).app_context():
+        try:
+            sucesso = verificar_exportacao(total)
+        finally:
+            db.session.rollback()
+
+    if sucesso:
+        print("\nA exportação usou memória constante.")
+    else:
+        print("\nERRO: A memória cresceu com o número de linhas exportadas.")
+
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para verificar se as consultas mais frequentes usam índices.
+
+Cria o esquema dos modelos numa base SQLite em memória, executa
+EXPLAIN QUERY PLAN sobre cada consulta e termina com erro se alguma delas
+fizer uma leitura completa (SCAN) de uma tabela.
+"""
+
+from datetime import date, time
+import sys
+
+from sqlalchemy import create_engine, func, select
+
+from app.app import create_app, CONFIG_SCRIPTS
+from app.disponibilidade import STATUS_OCUPADOS
+from app.modelos import db, Agendamento, Cliente, FaturacaoDiaria
+
+
+def consultas_frequentes():
+    """Devolve as consultas a verificar, como pares (descrição, instrução)."""
+    hoje = date(2025, 1, 1)
+    return [
+        ('Ocupação de um barbeiro numa data', select(Agendamento.id, Agendamento.hora_inicio, Agendamento.hora_fim).where(
+            Agendamento.barbeiro_id == 1,
+            Agendamento.data == hoje,
+            Agendamento.status.in_(STATUS_OCUPADOS)
+        )),
+        ('Conflito de horário', select(Agendamento.id).where(
+            Agendamento.barbeiro_id == 1,
+            Agendamento.data == hoje,
+            Agendamento.status.in_(STATUS_OCUPADOS),
+            Agendamento.hora_inicio < time(10, 30),
+            Agendamento.hora_fim > time(10, 0)
+        ).exists().select()),
+        ('Ocupação de um barbeiro num período', select(Agendamento.data, Agendamento.hora_inicio, Agendamento.hora_fim).where(
+            Agendamento.barbeiro_id == 1,
+            Agendamento.data >= hoje,
+            Agendamento.data <= date(2025, 1, 31),
+            Agendamento.status.in_(STATUS_OCUPADOS)
+        )),
+        ('Ocupação da equipe numa data', select(Agendamento.barbeiro_id, Agendamento.hora_inicio, Agendamento.hora_fim).where(
+            Agendamento.barbeiro_id.in_([1, 2, 3]),
+            Agendamento.data == hoje,
+            Agendamento.status.in_(STATUS_OCUPADOS)
+        )),
+        ('Agendamentos concluídos num período', select(Agendamento).where(
+            Agendamento.status == 'concluído',
+            Agendamento.data >= hoje,
+            Agendamento.data <= date(2025, 1, 31)
+        ).order_by(Agendamento.data.desc(), Agendamento.hora_inicio)),
+        ('Agendamentos de hoje', select(func.count()).select_from(Agendamento).where(
+            Agendamento.data == hoje
+        )),
+        ('Agendamentos de um cliente', select(Agendamento).where(
+            Agendamento.cliente_id == 1
+        ).order_by(Agendamento.data.desc(), Agendamento.hora_inicio)),
+        ('Agendamentos de um serviço', select(func.count()).select_from(Agendamento).where(
+            Agendamento.servico_id == 1
+        )),
+        ('Faturação diária num período', select(FaturacaoDiaria.data, func.sum(FaturacaoDiaria.valor_total)).where(
+            FaturacaoDiaria.data >= hoje,
+            FaturacaoDiaria.data <= date(2025, 1, 31)
+        ).group_by(FaturacaoDiaria.data)),
+        ('Página da lista de clientes', select(Cliente).where(
+            (Cliente.nome > 'Maria') | ((Cliente.nome == 'Maria') & (Cliente.id > 10))
+        ).order_by(Cliente.nome, Cliente.id).limit(51)),
+        ('Cliente por telefone', select(Cliente).where(
+            Cliente.telefone == '11999999999'
+        )),
+    ]
+
+
+def plano_de_execucao(conexao, instrucao):
+    """Devolve as linhas de EXPLAIN QUERY PLAN para uma instrução."""
+    compilada = instrucao.compile(dialect=conexao.dialect, compile_kwargs={'render_postcompile': True})
+    parametros = compilada.construct_params()
+    valores = tuple(
+        str(parametros[nome]) if isinstance(parametros[nome], (date, time)) else parametros[nome]
+        for nome in compilada.positiontup
+    )
+    return [linha[-1] for linha in conexao.exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compilada), valores)]
+
+
+def verificar_indices():
+    """Verifica o plano de cada consulta frequente. Devolve True se todas usam índices."""
+    engine = create_engine('sqlite://')
+    db.metadata.create_all(engine)
+
+    sucesso = True
+    with engine.connect() as conexao:
+        for descricao, instrucao in consultas_frequentes():
+            plano = plano_de_execucao(conexao, instrucao)
+            leituras_completas = [
+                passo for passo in plano
+                if passo.startswith('SCAN') and 'USING' not in passo and 'CONSTANT ROW' not in passo
+            ]
+
+            estado = 'ERRO' if leituras_completas else 'OK'
+            print(f"[{estado}] {descricao}")
+            for passo in plano:
+                print(f"       {passo}")
+
+            if leituras_completas:
+                sucesso = False
+
+    return sucesso
+
+
+if __name__ == "__main__":
+    with create_app(CONFIG_SCRIPTS).app_context():
+        sucesso = verificar_indices()
+
+    if sucesso:
+        print("\nTodas as consultas usam índices.")
+    else:
+        print("\nERRO: Existem consultas que leem tabelas completas.")
+
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para verificar que as ações em lote da agenda não fazem uma consulta por agendamento.
+
+Cria agendamentos fictícios e, para lotes de tamanhos crescentes, conta as
+instruções SQL executadas por um único pedido POST /admin/agendamento/lote
+com as ações confirmar, concluir e cancelar. O número de instruções de cada
+ação tem de ser o mesmo para todos os tamanhos de lote: a consulta do estado
+atual, o UPDATE e a faturação diária são feitos de uma vez para todos os IDs.
+
+No fim, os dados fictícios são apagados.
+
+Uso: python verificar_lote.py
+"""
+
+from datetime import datetime, time, timedelta
+import sys
+import uuid
+
+from sqlalchemy import event
+
+from app.app import create_app
+from app.faturacao import registrar_faturacao
+from app.modelos import db, Agendamento, Barbeiro, Cliente, FaturacaoDiaria, Servico, UsuarioAdmin
+
+# Aplicação com as rotas da agenda, sem o Flask-Migrate; a versão da configuração só é
+# verificada no primeiro pedido, para que essa consulta não entre na contagem
+app = create_app({'MIGRACOES': False, 'CONFIGURACAO_VERIFICAR_SEGUNDOS': 3600})
+
+# Tamanhos dos lotes, até LIMITE_LOTE_AGENDAMENTOS
+TAMANHOS = (1, 10, 50, 200)
+
+# Ações verificadas: (ação, status inicial dos agendamentos, dados adicionais do pedido)
+ACOES = (
+    ('confirmar', 'pendente', {}),
+    ('concluir', 'agendado', {'metodo_pagamento': 'pix', 'valor_pago': 30}),
+    ('cancelar', 'agendado', {}),
+)
+
+# Primeiro dia dos agendamentos fictícios, fora da janela de agendamento para não colidir com a agenda real
+DIAS_ATE_PRIMEIRA_DATA = 400
+
+
+def contar_instrucoes(contador):
+    """Conta todas as instruções SQL executadas."""
+    def antes_de_executar(conexao, cursor, instrucao, parametros, contexto, executemany):
+        contador[0] += 1
+    return antes_de_executar
+
+
+def criar_agendamentos(cliente_id, status, primeiro_dia, total):
+    """Cria `total` agendamentos com o status indicado, um por dia a partir de `primeiro_dia`. Devolve os IDs."""
+    barbeiro = Barbeiro.query.filter_by(ativo=True).first()
+    servico = Servico.query.filter_by(ativo=True).first()
+    primeira_data = datetime.now().date() + timedelta(days=primeiro_dia)
+    fim = 10 * 60 + servico.duracao_minutos
+    agendamentos = [
+        Agendamento(
+            cliente_id=cliente_id,
+            barbeiro_id=barbeiro.id,
+            servico_id=servico.id,
+            data=primeira_data + timedelta(days=indice),
+            hora_inicio=time(10, 0),
+            hora_fim=time(fim // 60, fim % 60),
+            status=status
+        )
+        for indice in range(total)
+    ]
+    db.session.add_all(agendamentos)
+    db.session.commit()
+    return [agendamento.id for agendamento in agendamentos]
+
+
+def apagar_dados(cliente_id):
+    """Apaga os agendamentos e o cliente fictícios, retirando-os também da faturação diária."""
+    datas = set()
+    for agendamento in Agendamento.query.filter_by(cliente_id=cliente_id):
+        registrar_faturacao(agendamento, -1)
+        datas.add(agendamento.data)
+        db.session.delete(agendamento)
+    db.session.flush()
+    FaturacaoDiaria.query.filter(
+        FaturacaoDiaria.data.in_(datas),
+        FaturacaoDiaria.quantidade == 0
+    ).delete(synchronize_session=False)
+    db.session.delete(db.session.get(Cliente, cliente_id))
+    db.session.commit()
+
+
+def cliente_autenticado(admin_id):
+    """Devolve um cliente de testes do Flask com a sessão de um administrador."""
+    cliente = app.test_client()
+    with cliente.session_transaction() as sessao:
+        sessao['_user_id'] = str(admin_id)
+        sessao['_fresh'] = True
+    return cliente
+
+
+def medir_lote(cliente, contador, acao, ids, dados):
+    """Envia um pedido em lote e devolve (instruções SQL executadas, todos os IDs atualizados)."""
+    contador[0] = 0
+    resposta = cliente.post('/admin/agendamento/lote', json={'acao': acao, 'ids': ids, **dados})
+    instrucoes = contador[0]
+    resultados = (resposta.get_json() or {}).get('resultados') or []
+    atualizados = (
+        resposta.status_code == 200
+        and len(resultados) == len(ids)
+        and all(resultado['status'] == 'success' for resultado in resultados)
+    )
+    return instrucoes, atualizados
+
+
+if __name__ == "__main__":
+    contador = [0]
+    with app.app_context():
+        admin = UsuarioAdmin.query.first()
+        if admin is None:
+            print("ERRO: É necessário um utilizador administrador.")
+            sys.exit(1)
+        admin_id = admin.id
+
+        event.listen(db.engine, 'before_cursor_execute', contar_instrucoes(contador))
+
+        cliente = Cliente(nome='Teste', sobrenome='Lote', email=f'lote.{uuid.uuid4().hex}@teste.local')
+        db.session.add(cliente)
+        db.session.commit()
+        cliente_id = cliente.id
+
+    # Cada pedido do cliente de testes abre o seu próprio contexto, como num servidor
+    verificacoes = []
+    try:
+        navegador = cliente_autenticado(admin_id)
+        # Primeiro pedido: carrega o principal e a configuração em cache
+        navegador.get('/api/cache/estatisticas')
+
+        primeiro_dia = DIAS_ATE_PRIMEIRA_DATA
+        print(f"{'Ação':<12}" + ''.join(f"{f'{tamanho} IDs':>10}" for tamanho in TAMANHOS))
+        for acao, status, dados in ACOES:
+            contagens = []
+            todos_atualizados = True
+            for tamanho in TAMANHOS:
+                with app.app_context():
+                    ids = criar_agendamentos(cliente_id, status, primeiro_dia, tamanho)
+                primeiro_dia += tamanho
+                instrucoes, atualizados = medir_lote(navegador, contador, acao, ids, dados)
+                contagens.append(instrucoes)
+                todos_atualizados = todos_atualizados and atualizados
+
+            print(f"{acao:<12}" + ''.join(f"{instrucoes:>10}" for instrucoes in contagens))
+            verificacoes.append((f'{acao}: todos os agendamentos atualizados', todos_atualizados))
+            verificacoes.append((
+                f'{acao}: {contagens[0]} instruções SQL, qualquer que seja o tamanho do lote',
+                len(set(contagens)) == 1
+            ))
+    finally:
+        with app.app_context():
+            apagar_dados(cliente_id)
+
+    print()
+    for descricao, aprovado in verificacoes:
+        print(f"[{'OK' if aprovado else 'ERRO'}] {descricao}")
+
+    sucesso = all(aprovado for _, aprovado in verificacoes)
+    if sucesso:
+        print("\nAs ações em lote executam o mesmo número de instruções SQL para qualquer número de agendamentos.")
+    else:
+        print("\nERRO: O número de instruções SQL das ações em lote cresce com o número de agendamentos.")
+
+    sys.exit(0 if sucesso else 1)
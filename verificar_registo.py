@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para medir o custo do registo (logging) em /api/horarios-disponiveis.
+
+Faz os mesmos pedidos à rota de horários disponíveis com várias
+configurações do registo e mostra a mediana e o percentil 95 da latência e
+o número de linhas escritas. A saída é um ficheiro temporário cuja escrita
+demora SAIDA_LENTA_MS por linha, como um terminal ou um pipe de logs
+ocupado: com a escrita síncrona essa espera soma-se a cada pedido, com a
+fila (QueueHandler/QueueListener) fica na thread do listener.
+
+Termina com erro se a fila não for mais rápida do que a escrita síncrona
+ou se a amostragem não reduzir as linhas escritas.
+
+Uso: python verificar_registo.py [numero_de_pedidos]
+"""
+
+from datetime import datetime, timedelta
+import statistics
+import sys
+import tempfile
+import time
+
+from app.app import create_app
+from app.modelos import Barbeiro, Servico
+from app.registo import configurar_registo, parar_registo
+
+# Pedidos por cenário
+PEDIDOS_PADRAO = 500
+
+# Tempo de escrita de cada linha na saída, em milissegundos
+SAIDA_LENTA_MS = 1
+
+# Cenários: nome e opções de configurar_registo
+CENARIOS = [
+    ('INFO (produção)', {'nivel': 'INFO'}),
+    ('DEBUG síncrono', {'nivel': 'DEBUG', 'amostragem': 1, 'fila': False}),
+    ('DEBUG na fila', {'nivel': 'DEBUG', 'amostragem': 1}),
+    ('DEBUG na fila, 1/100', {'nivel': 'DEBUG', 'amostragem': 100}),
+]
+
+# Aplicação com as rotas da API, sem o Flask-Migrate
+app = create_app({'MIGRACOES': False})
+
+
+class SaidaLenta:
+    """Ficheiro em que cada escrita demora SAIDA_LENTA_MS e que conta as linhas escritas."""
+
+    def __init__(self, ficheiro):
+        self.ficheiro = ficheiro
+        self.linhas = 0
+
+    def write(self, texto):
+        time.sleep(SAIDA_LENTA_MS / 1000)
+        self.linhas += texto.count('\n')
+        return self.ficheiro.write(texto)
+
+    def flush(self):
+        self.ficheiro.flush()
+
+
+def url_com_horarios():
+    """Devolve o URL de um pedido de horários que tenha horários disponíveis."""
+    with app.app_context():
+        barbeiro = Barbeiro.query.filter_by(ativo=True).first()
+        servico = Servico.query.filter_by(ativo=True).first()
+        if barbeiro is None or servico is None:
+            raise RuntimeError('É necessário pelo menos um barbeiro e um serviço ativos.')
+        barbeiro_id, servico_id = barbeiro.id, servico.id
+
+    cliente = app.test_client()
+    for dias in range(1, 15):
+        data = (datetime.now().date() + timedelta(days=dias)).strftime('%Y-%m-%d')
+        url = f'/api/horarios-disponiveis?data={data}&barbeiro_id={barbeiro_id}&servico_id={servico_id}'
+        if cliente.get(url).get_json().get('horarios_disponiveis'):
+            return url
+    raise RuntimeError('Nenhum dia com horários disponíveis nas próximas duas semanas.')
+
+
+def percentil(valores, fracao):
+    """Devolve o percentil `fracao` (0 a 1) de uma lista de valores."""
+    ordenados = sorted(valores)
+    return ordenados[min(int(len(ordenados) * fracao), len(ordenados) - 1)]
+
+
+def medir(url, pedidos, opcoes):
+    """Mede a latência dos pedidos com o registo configurado. Devolve (p50_ms, p95_ms, linhas)."""
+    with tempfile.TemporaryFile('w+') as ficheiro:
+        saida = SaidaLenta(ficheiro)
+        configurar_registo(saida=saida, **opcoes)
+        cliente = app.test_client()
+
+        latencias = []
+        for _ in range(pedidos):
+            inicio = time.perf_counter()
+            resposta = cliente.get(url)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if resposta.status_code != 200:
+                raise RuntimeError(f'Pedido recusado: {resposta.status_code}')
+
+        # Esperar que o listener escreva o que ficou na fila
+        parar_registo()
+        return statistics.median(latencias), percentil(latencias, 0.95), saida.linhas
+
+
+if __name__ == "__main__":
+    pedidos = int(sys.argv[1]) if len(sys.argv) > 1 else PEDIDOS_PADRAO
+    url = url_com_horarios()
+
+    resultados = {}
+    for nome, opcoes in CENARIOS:
+        resultados[nome] = medir(url, pedidos, opcoes)
+
+    print(f"{pedidos} pedidos a {url.split('?')[0]}, escrita de {SAIDA_LENTA_MS} ms por linha\n")
+    print(f"{'Cenário':<24}{'p50':>10}{'p95':>10}{'Linhas':>9}")
+    for nome, (p50, p95, linhas) in resultados.items():
+        print(f"{nome:<24}{p50:>8.3f}ms{p95:>8.3f}ms{linhas:>9}")
+
+    sucesso = (
+        resultados['DEBUG na fila'][0] < resultados['DEBUG síncrono'][0]
+        and resultados['DEBUG na fila, 1/100'][2] < resultados['DEBUG na fila'][2]
+    )
+    if sucesso:
+        print("\nA fila retira a escrita dos pedidos e a amostragem reduz as linhas escritas.")
+    else:
+        print("\nERRO: O registo na fila ou a amostragem não se comportaram como esperado.")
+
+    sys.exit(0 if sucesso else 1)
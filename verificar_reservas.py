@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para verificar que um horário nunca é reservado duas vezes.
+
+Escolhe o primeiro horário livre de um barbeiro nos próximos dias e envia
+ao mesmo tempo várias centenas de pedidos POST /agendar para esse horário,
+repartidos por vários processos (cada um com a sua aplicação, as suas
+ligações à base de dados e várias threads). Verifica que:
+
+- exatamente um pedido é aceite (200);
+- todos os outros recebem 409 com horarios_alternativos;
+- fica exatamente um agendamento nesse horário em agendamentos.
+
+No fim, o agendamento e o cliente criados são apagados.
+
+Uso: python verificar_reservas.py [numero_de_pedidos] [numero_de_processos]
+"""
+
+from datetime import datetime, timedelta
+import multiprocessing
+import sys
+import threading
+
+from app.app import create_app
+from app.disponibilidade import STATUS_OCUPADOS
+from app.modelos import db, Agendamento, Barbeiro, Cliente, Servico
+
+# Aplicação com as rotas públicas, sem o Flask-Migrate (criada de novo em cada processo filho)
+app = create_app({'MIGRACOES': False})
+
+# Pedidos e processos padrão
+PEDIDOS_PADRAO = 300
+PROCESSOS_PADRAO = 4
+
+# Prefixo dos telefones fictícios (celular com 11 dígitos); cada pedido usa um número diferente
+PREFIXO_TELEFONE = '1199'
+
+
+def escolher_horario():
+    """Devolve (barbeiro_id, servico_id, data, hora_inicio) do primeiro horário livre nos próximos dias."""
+    with app.app_context():
+        barbeiro = Barbeiro.query.filter_by(ativo=True).first()
+        servico = Servico.query.filter_by(ativo=True).first()
+        if barbeiro is None or servico is None:
+            raise RuntimeError('É necessário pelo menos um barbeiro e um serviço ativos.')
+        barbeiro_id, servico_id = barbeiro.id, servico.id
+
+    cliente = app.test_client()
+    for dias in range(1, 30):
+        data = (datetime.now().date() + timedelta(days=dias)).strftime('%Y-%m-%d')
+        resposta = cliente.get(f'/api/horarios-disponiveis?data={data}&barbeiro_id={barbeiro_id}&servico_id={servico_id}')
+        horarios = resposta.get_json().get('horarios_disponiveis')
+        if horarios:
+            return barbeiro_id, servico_id, data, horarios[0]['hora_inicio']
+    raise RuntimeError('Nenhum horário livre nos próximos 30 dias.')
+
+
+def telefone(indice):
+    """Telefone fictício do pedido `indice`."""
+    return f'{PREFIXO_TELEFONE}{indice:07d}'
+
+
+def enviar_pedidos(indices, horario, inicio, resultados):
+    """
+    Processo filho: prepara um cliente de testes por pedido
+    e, quando `inicio` é sinalizado, envia todos os pedidos em threads.
+    Coloca em `resultados` um par (status, corpo) por pedido.
+    """
+    barbeiro_id, servico_id, data, hora_inicio = horario
+    respostas = []
+    lock = threading.Lock()
+
+    def enviar(indice, cliente):
+        resposta = cliente.post('/agendar', json={
+            'nome': f'Teste Reserva{indice}',
+            'telefone': telefone(indice),
+            'email': f'reserva.{indice}@teste.local',
+            'servico_id': servico_id,
+            'barbeiro_id': barbeiro_id,
+            'data': data,
+            'hora_inicio': hora_inicio
+        })
+        with lock:
+            respostas.append((resposta.status_code, resposta.get_json()))
+
+    threads = [threading.Thread(target=enviar, args=(indice, app.test_client())) for indice in indices]
+    inicio.wait()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    resultados.put(respostas)
+
+
+def agendamentos_no_horario(horario):
+    """Devolve os ids dos agendamentos que ocupam o horário (os cancelados não contam)."""
+    barbeiro_id, _, data, hora_inicio = horario
+    with app.app_context():
+        return [agendamento.id for agendamento in Agendamento.query.filter(
+            Agendamento.barbeiro_id == barbeiro_id,
+            Agendamento.data == datetime.strptime(data, '%Y-%m-%d').date(),
+            Agendamento.hora_inicio == datetime.strptime(hora_inicio, '%H:%M').time(),
+            Agendamento.status.in_(STATUS_OCUPADOS)
+        )]
+
+
+def apagar_dados(agendamento_ids, total):
+    """Apaga os agendamentos e os clientes criados pelos pedidos."""
+    with app.app_context():
+        Agendamento.query.filter(Agendamento.id.in_(agendamento_ids)).delete(synchronize_session=False)
+        Cliente.query.filter(Cliente.telefone.in_([telefone(indice) for indice in range(total)])).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else PEDIDOS_PADRAO
+    processos = int(sys.argv[2]) if len(sys.argv) > 2 else PROCESSOS_PADRAO
+
+    horario = escolher_horario()
+    print(f"{total} pedidos em {processos} processos para o barbeiro {horario[0]} "
+          f"em {horario[2]} às {horario[3]}")
+
+    # Processos novos (spawn): cada um cria a sua aplicação e abre as suas próprias ligações à base de dados
+    contexto = multiprocessing.get_context('spawn')
+    inicio = contexto.Event()
+    resultados = contexto.Queue()
+    filhos = [
+        contexto.Process(target=enviar_pedidos, args=(range(indice, total, processos), horario, inicio, resultados))
+        for indice in range(processos)
+    ]
+    for filho in filhos:
+        filho.start()
+    # Os filhos só enviam depois de todos terem criado a aplicação e os clientes
+    inicio.set()
+    respostas = [resposta for _ in filhos for resposta in resultados.get()]
+    for filho in filhos:
+        filho.join()
+
+    novos = agendamentos_no_horario(horario)
+    try:
+        aceites = [corpo for status, corpo in respostas if status == 200]
+        conflitos = [corpo for status, corpo in respostas if status == 409 and 'horarios_alternativos' in corpo]
+        outros = sorted({status for status, corpo in respostas if status not in (200, 409)})
+
+        print(f"\nAceites: {len(aceites)}, conflitos 409: {len(conflitos)}, outros: {len(respostas) - len(aceites) - len(conflitos)} {outros}")
+        print(f"Agendamentos gravados no horário: {len(novos)}")
+
+        verificacoes = [
+            ('Todos os pedidos responderam', len(respostas) == total),
+            ('Exatamente um pedido aceite', len(aceites) == 1),
+            ('Todos os outros recusados com 409 e horários alternativos', len(conflitos) == total - 1),
+            ('Exatamente um agendamento no horário', len(novos) == 1),
+        ]
+    finally:
+        apagar_dados(novos, total)
+
+    print()
+    for descricao, aprovado in verificacoes:
+        print(f"[{'OK' if aprovado else 'ERRO'}] {descricao}")
+
+    sucesso = all(aprovado for _, aprovado in verificacoes)
+    if sucesso:
+        print("\nO horário foi reservado uma única vez.")
+    else:
+        print("\nERRO: O horário foi reservado mais de uma vez ou houve respostas inesperadas.")
+
+    sys.exit(0 if sucesso else 1)
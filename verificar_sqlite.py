@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script para comparar o SQLite com e sem os pragmas da aplicação sob carga mista.
+
+Cria, numa pasta temporária, uma base de dados para cada cenário com o
+esquema dos modelos e alguns milhares de agendamentos. Cada base é sujeita
+à mesma carga durante alguns segundos: várias threads leem a ocupação de um
+barbeiro num período (a consulta do motor de disponibilidade) enquanto
+outras gravam agendamentos, um por commit, como os pedidos de /agendar.
+
+Mostra as leituras e escritas por segundo, a latência das leituras e o
+número de erros "database is locked" na configuração padrão do SQLite
+(rollback journal, synchronous=FULL) e com PRAGMAS_PADRAO. Termina com erro
+se houver bloqueios com os pragmas da aplicação.
+
+Uso: python verificar_sqlite.py [segundos_por_cenario]
+"""
+
+from datetime import date, time as hora, timedelta
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.disponibilidade import STATUS_OCUPADOS
+from app.modelos import Agendamento, db
+from app.banco_dados import PRAGMAS_PADRAO, configurar_sqlite, ler_pragmas
+
+# Duração padrão de cada cenário, em segundos
+SEGUNDOS_PADRAO = 10
+
+# Threads de leitura e de escrita em simultâneo
+LEITORES = 8
+ESCRITORES = 2
+
+# Agendamentos criados antes da carga, espalhados por BARBEIROS e DIAS
+AGENDAMENTOS_INICIAIS = 20000
+BARBEIROS = 10
+DIAS = 90
+
+# Cenários comparados: nome e pragmas aplicados a cada ligação
+CENARIOS = [
+    ('Padrão do SQLite', {}),
+    ('Pragmas da aplicação', PRAGMAS_PADRAO),
+]
+
+INICIO = date(2025, 1, 1)
+
+
+def linha_agendamento(aleatorio):
+    """Devolve um agendamento fictício de 30 minutos entre as 9h e as 18h."""
+    minutos = 9 * 60 + 30 * aleatorio.randrange(18)
+    return {
+        'cliente_id': 1,
+        'barbeiro_id': aleatorio.randint(1, BARBEIROS),
+        'servico_id': 1,
+        'data': INICIO + timedelta(days=aleatorio.randrange(DIAS)),
+        'hora_inicio': hora(minutos // 60, minutos % 60),
+        'hora_fim': hora((minutos + 30) // 60, (minutos + 30) % 60),
+        'status': aleatorio.choice(STATUS_OCUPADOS),
+        'versao': 1
+    }
+
+
+def criar_base(caminho, pragmas):
+    """Cria a base de dados do cenário com o esquema e os agendamentos iniciais."""
+    engine = create_engine(f'sqlite:///{caminho}')
+    configurar_sqlite(engine, pragmas)
+    db.metadata.create_all(engine)
+
+    aleatorio = random.Random(42)
+    with engine.begin() as conexao:
+        conexao.execute(
+            insert(Agendamento.__table__),
+            [linha_agendamento(aleatorio) for _ in range(AGENDAMENTOS_INICIAIS)]
+        )
+    return engine
+
+
+def consulta_ocupacao(aleatorio):
+    """Ocupação de um barbeiro num período de uma semana."""
+    data_inicio = INICIO + timedelta(days=aleatorio.randrange(DIAS - 7))
+    return select(Agendamento.data, Agendamento.hora_inicio, Agendamento.hora_fim).where(
+        Agendamento.barbeiro_id == aleatorio.randint(1, BARBEIROS),
+        Agendamento.data >= data_inicio,
+        Agendamento.data <= data_inicio + timedelta(days=6),
+        Agendamento.status.in_(STATUS_OCUPADOS)
+    )
+
+
+def carga_mista(engine, segundos):
+    """Executa leitores e escritores em paralelo. Devolve os contadores da carga."""
+    contadores = {'leituras': 0, 'escritas': 0, 'bloqueios': 0, 'latencias': []}
+    lock = threading.Lock()
+    barreira = threading.Barrier(LEITORES + ESCRITORES)
+    fim = []
+
+    def somar(chave, quantidade=1):
+        with lock:
+            contadores[chave] += quantidade
+
+    def ler(semente):
+        aleatorio = random.Random(semente)
+        latencias = []
+        with engine.connect() as conexao:
+            barreira.wait()
+            while not fim:
+                inicio = time.perf_counter()
+                try:
+                    conexao.execute(consulta_ocupacao(aleatorio)).all()
+                    conexao.rollback()
+                    latencias.append(time.perf_counter() - inicio)
+                    somar('leituras')
+                except OperationalError as erro:
+                    conexao.rollback()
+                    if 'locked' not in str(erro):
+                        raise
+                    somar('bloqueios')
+        with lock:
+            contadores['latencias'].extend(latencias)
+
+    def escrever(semente):
+        aleatorio = random.Random(semente)
+        with engine.connect() as conexao:
+            barreira.wait()
+            while not fim:
+                try:
+                    conexao.execute(insert(Agendamento.__table__), linha_agendamento(aleatorio))
+                    conexao.commit()
+                    somar('escritas')
+                except OperationalError as erro:
+                    conexao.rollback()
+                    if 'locked' not in str(erro):
+                        raise
+                    somar('bloqueios')
+
+    threads = (
+        [threading.Thread(target=ler, args=(indice,)) for indice in range(LEITORES)]
+        + [threading.Thread(target=escrever, args=(1000 + indice,)) for indice in range(ESCRITORES)]
+    )
+    for thread in threads:
+        thread.start()
+    time.sleep(segundos)
+    fim.append(True)
+    for thread in threads:
+        thread.join()
+    return contadores
+
+
+def percentil(valores, fracao):
+    """Devolve o percentil `fracao` (0 a 1) de uma lista de valores."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(int(len(ordenados) * fracao), len(ordenados) - 1)]
+
+
+if __name__ == "__main__":
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else SEGUNDOS_PADRAO
+    pasta = tempfile.mkdtemp(prefix='verificar_sqlite_')
+
+    resultados = []
+    try:
+        for indice, (nome, pragmas) in enumerate(CENARIOS):
+            engine = criar_base(os.path.join(pasta, f'cenario_{indice}.db'), pragmas)
+            with engine.connect() as conexao:
+                valores = ler_pragmas(conexao)
+            print(f"{nome}: journal_mode={valores['journal_mode']}, synchronous={valores['synchronous']}, "
+                  f"busy_timeout={valores['busy_timeout']}")
+
+            contadores = carga_mista(engine, segundos)
+            engine.dispose()
+            resultados.append((nome, contadores))
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print(f"\n{LEITORES} leitores e {ESCRITORES} escritores durante {segundos:g} s por cenário\n")
+    print(f"{'Cenário':<24}{'Leituras/s':>12}{'Escritas/s':>12}{'p50 leitura':>14}{'p95 leitura':>14}{'Bloqueios':>11}")
+    for nome, contadores in resultados:
+        print(f"{nome:<24}"
+              f"{contadores['leituras'] / segundos:>12.0f}"
+              f"{contadores['escritas'] / segundos:>12.0f}"
+              f"{percentil(contadores['latencias'], 0.5) * 1000:>12.2f}ms"
+              f"{percentil(contadores['latencias'], 0.95) * 1000:>12.2f}ms"
+              f"{contadores['bloqueios']:>11}")
+
+    sucesso = resultados[-1][1]['bloqueios'] == 0
+    if sucesso:
+        print("\nSem erros \"database is locked\" com os pragmas da aplicação.")
+    else:
+        print("\nERRO: Houve erros \"database is locked\" com os pragmas da aplicação.")
+
+    sys.exit(0 if sucesso else 1)